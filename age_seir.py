@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+"""
+Modèle SEIR métapopulationnel structuré par âge
+
+Extension de MetapopulationSEIR (seir_engine.py): chaque zone est découpée
+en A tranches d'âge, avec une matrice de contacts entre tranches (une
+matrice nationale, ou une par type de zone: urbain, périurbain, rural).
+Les compartiments sont des tableaux (N, A) et chaque jour coûte:
+
+- un produit matriciel groupé pour la force d'infection de toutes les
+  zones et tranches: λ[n, a] = β × s_a × Σ_b C[t_n, a, b] × I[n, b] / N[n, b]
+  ((N, A) @ (T, A, A) -> (T, N, A), puis sélection du type de chaque zone);
+- un produit Mᵀ · prévalence (N, A) pour les cas importés, réparti entre
+  tranches selon la part de chaque âge dans les déplacements.
+
+Mémoire et temps restent linéaires en zones × tranches (T × N × A pour la
+force d'infection, T étant le nombre de types de zones): 5 000 zones × 16
+tranches restent interactives sur CPU.
+
+Chaque matrice de contacts est normalisée à un rayon spectral de 1: β garde
+son sens (R0 = β / γ, comme le modèle homogène). Avec des contacts
+proportionnels à la population (proportional_contacts: C[a, b] = part_b)
+et des déplacements égaux entre tranches (travel_weights=1), le modèle
+redonne exactement MetapopulationSEIR une fois sommé sur les âges.
+
+La pyramide des âges, les contacts synthétiques (assortatifs + échanges
+parents-enfants) et les taux d'hospitalisation sont définis par tranches de
+5 ans, puis agrégés en 16, 8, 4... tranches. Une matrice de contacts
+observée (enquête POLYMOD / Prem et al.) peut être fournie en .npy ou .csv.
+
+Usage:
+    python age_seir.py                                  # 30 villes, 8 tranches
+    python age_seir.py --bands 16 --zones 5000 --days 365
+    python age_seir.py --contacts contacts_ci.csv
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+
+from cities import load_cities, synthetic_cities, zone_column
+from history import HistoryStore
+from mobility import build_mobility_matrix
+from seir_engine import (
+    COMPARTMENTS,
+    DEFAULT_PARAMS,
+    N_OUTBREAK_CITIES,
+    OUTBREAK_PREVALENCE,
+    REFERENCE_DATE,
+    START_DATE,
+    load_params,
+    transpose_mobility,
+)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+BAND_YEARS = 5              # Résolution des tables de base (0-4, 5-9... 75+)
+
+# Pyramide des âges approchée de la Côte d'Ivoire (parts de la population)
+AGE_PYRAMID = (
+    0.155, 0.140, 0.125, 0.110, 0.095, 0.082, 0.070, 0.058,
+    0.047, 0.038, 0.029, 0.021, 0.014, 0.008, 0.005, 0.003,
+)
+
+# Part des infections hospitalisées par tranche (ordre de grandeur COVID-19)
+HOSPITALISATION_RATE = (
+    0.001, 0.001, 0.001, 0.002, 0.005, 0.007, 0.010, 0.013,
+    0.017, 0.022, 0.030, 0.040, 0.055, 0.075, 0.100, 0.150,
+)
+
+# Déplacements relatifs par tranche (actifs plus mobiles que enfants et aînés)
+TRAVEL_WEIGHT = (
+    0.3, 0.4, 0.6, 0.9, 1.3, 1.4, 1.4, 1.3,
+    1.2, 1.1, 1.0, 0.8, 0.6, 0.4, 0.3, 0.2,
+)
+
+# Contacts synthétiques: proximité d'âge et écart d'une génération
+ASSORTATIVITY = 3.0
+GENERATION_MIXING = 0.8
+GENERATION_GAP = 28         # Années entre parents et enfants
+CONTACT_SPREAD = 7.0        # Largeur des pics (années)
+
+# Types de zones (urbanType du registre), dans l'ordre des matrices de
+# contacts (T, A, A)
+ZONE_TYPES = ("urban", "peri-urban", "rural")
+
+DEFAULT_BANDS = 8
+AGE_FILENAME = "age_structure.json"
+
+# =============================================================================
+# TRANCHES ET CONTACTS
+# =============================================================================
+
+def band_groups(n_bands):
+    """Indices des tranches de 5 ans regroupées dans chacune des `n_bands` tranches"""
+    n_base = len(AGE_PYRAMID)
+    if n_base % n_bands:
+        raise ValueError(f"Nombre de tranches invalide: {n_bands} (diviseur de {n_base})")
+    return np.arange(n_base).reshape(n_bands, n_base // n_bands)
+
+
+def band_labels(n_bands):
+    """Libellés des tranches ("0-9", "10-19"... "70+")"""
+    labels = []
+    for group in band_groups(n_bands):
+        start, stop = group[0] * BAND_YEARS, (group[-1] + 1) * BAND_YEARS - 1
+        labels.append(f"{start}+" if group[-1] == len(AGE_PYRAMID) - 1 else f"{start}-{stop}")
+    return labels
+
+
+def aggregate(values, n_bands, weights=AGE_PYRAMID):
+    """Moyenne d'une table par tranches de 5 ans sur `n_bands` tranches, pondérée"""
+    values, weights = np.asarray(values, dtype=float), np.asarray(weights, dtype=float)
+    groups = band_groups(n_bands)
+    return (values[groups] * weights[groups]).sum(axis=1) / weights[groups].sum(axis=1)
+
+
+def age_distribution(n_bands):
+    """Parts de la population par tranche (A,)"""
+    return np.asarray(AGE_PYRAMID)[band_groups(n_bands)].sum(axis=1)
+
+
+def synthetic_contacts(n_bands):
+    """
+    Matrice de contacts (A, A) synthétique
+
+    Contacts ∝ taille de la tranche contactée × (1 + pic assortatif + pic à
+    une génération d'écart), construits sur les tranches de 5 ans puis
+    agrégés (moyenne pondérée sur la tranche qui contacte, somme sur la
+    tranche contactée).
+    """
+    age = (np.arange(len(AGE_PYRAMID)) + 0.5) * BAND_YEARS
+    gap = np.abs(age[:, None] - age[None, :])
+    affinity = (1 + ASSORTATIVITY * np.exp(-gap ** 2 / (2 * CONTACT_SPREAD ** 2))
+                + GENERATION_MIXING * np.exp(-(gap - GENERATION_GAP) ** 2
+                                             / (2 * CONTACT_SPREAD ** 2)))
+    base = affinity * np.asarray(AGE_PYRAMID)[None, :]
+
+    groups = band_groups(n_bands)
+    weights = np.asarray(AGE_PYRAMID)[groups]
+    summed = base[:, groups].sum(axis=2)                       # (16, A) contactés
+    return ((summed[groups] * weights[:, :, None]).sum(axis=1)
+            / weights.sum(axis=1)[:, None])
+
+
+def proportional_contacts(n_bands):
+    """Contacts proportionnels à la population (mélange homogène)"""
+    return np.tile(age_distribution(n_bands), (n_bands, 1))
+
+
+def load_contacts(path):
+    """Matrice de contacts observée (A, A) ou (T, A, A): .npy ou .csv"""
+    if path.endswith(".npy"):
+        return np.load(path)
+    return np.loadtxt(path, delimiter=",")
+
+
+def normalize_contacts(contacts):
+    """Matrices de contacts (T, A, A) de rayon spectral 1 (β garde son sens)"""
+    contacts = np.asarray(contacts, dtype=float)
+    if contacts.ndim == 2:
+        contacts = contacts[None]
+    radius = np.abs(np.linalg.eigvals(contacts)).max(axis=1)
+    return contacts / radius[:, None, None]
+
+
+# =============================================================================
+# MODÈLE
+# =============================================================================
+
+def _by_zone(value):
+    """Paramètre scalaire ou par zone (N,), diffusable sur (N, A)"""
+    return value[:, None] if np.ndim(value) else value
+
+
+class AgeStructuredSEIR:
+    """
+    Modèle SEIR métapopulationnel structuré par âge
+
+    Attributs principaux:
+        S, E, I, R: np.ndarray (N, A) par zone et tranche d'âge
+        population: np.ndarray (N, A)
+        contacts: np.ndarray (T, A, A), normalisées
+        zone_type: np.ndarray (N,) indice de la matrice de contacts de chaque zone
+        travel_share: np.ndarray (A,) ou (N, A) part de chaque tranche dans les
+            déplacements
+    """
+
+    def __init__(self, cities, mobility, params=None, contacts=None, n_bands=DEFAULT_BANDS,
+                 age_shares=None, zone_type=None, susceptibility=None, travel_weights=None,
+                 seed=None):
+        """
+        Args:
+            contacts: matrice (A, A) ou (T, A, A); synthétique par défaut
+            age_shares: parts par tranche (A,) ou (N, A); pyramide nationale
+                par défaut
+            zone_type: indice de la matrice de contacts de chaque zone (N,);
+                par défaut, pour T > 1 matrices, l'urbanType du registre
+                dans l'ordre de ZONE_TYPES
+            susceptibility: susceptibilité relative par tranche (A,)
+            travel_weights: déplacements relatifs par tranche (A,);
+                TRAVEL_WEIGHT agrégé par défaut, 1 pour des déplacements
+                proportionnels à la population
+        Raises:
+            ValueError: type de zone inconnu ou sans matrice de contacts,
+                susceptibilité ou poids de déplacement de mauvaise taille
+        """
+        self.cities = cities
+        self.params = {**DEFAULT_PARAMS, **(params or {})}
+        self.n_bands = n_bands
+        self.labels = band_labels(n_bands)
+
+        age_shares = age_distribution(n_bands) if age_shares is None else np.asarray(age_shares)
+        self.total_population = zone_column(cities, "population", float)
+        self.population = self.total_population[:, None] * age_shares
+        self.contacts = normalize_contacts(
+            synthetic_contacts(n_bands) if contacts is None else contacts
+        )
+        self.zone_type = self._zone_types(cities, zone_type)
+        self.susceptibility = self._per_band(
+            "susceptibility", np.ones(n_bands) if susceptibility is None else susceptibility
+        )
+
+        # Part de chaque tranche dans les déplacements (par zone si age_shares l'est)
+        travel_weights = self._per_band(
+            "travel_weights",
+            aggregate(TRAVEL_WEIGHT, n_bands) if travel_weights is None else travel_weights,
+        )
+        travel = travel_weights * age_shares
+        self.travel_share = travel / travel.sum(axis=-1, keepdims=True)
+        self.hospitalisation_rate = aggregate(HOSPITALISATION_RATE, n_bands)
+
+        self.mobility_t = transpose_mobility(mobility)
+        # Contacts transposés: force = prévalence (N, A) @ Cᵀ (T, A, A)
+        self._contacts_t = np.ascontiguousarray(self.contacts.transpose(0, 2, 1))
+        self._zones = np.arange(len(cities))
+
+        self.rng = np.random.default_rng(seed)
+        self.outbreak_mask = np.zeros(len(cities), dtype=bool)
+        order = np.argsort(-self.total_population, kind="stable")
+        self.outbreak_mask[order[:N_OUTBREAK_CITIES]] = True
+        self.reset()
+
+    def _zone_types(self, cities, zone_type):
+        """Indice (N,) de la matrice de contacts de chaque zone, vérifié"""
+        n_types = len(self.contacts)
+        if zone_type is None:
+            if n_types == 1:
+                return np.zeros(len(cities), dtype=int)
+            types = zone_column(cities, "urbanType")
+            unknown = sorted(set(types) - set(ZONE_TYPES))
+            if unknown:
+                raise ValueError(f"Types de zones inconnus: {unknown} (attendus: {ZONE_TYPES})")
+            zone_type = np.array([ZONE_TYPES.index(t) for t in types])
+        zone_type = np.asarray(zone_type, dtype=int)
+        if zone_type.shape != (len(cities),):
+            raise ValueError(f"zone_type: {zone_type.shape} au lieu de ({len(cities)},)")
+        if zone_type.min() < 0 or zone_type.max() >= n_types:
+            raise ValueError(f"zone_type hors des {n_types} matrices de contacts fournies")
+        return zone_type
+
+    def _per_band(self, name, values):
+        """Tableau (A,) de flottants, vérifié"""
+        values = np.asarray(values, dtype=float)
+        if values.shape != (self.n_bands,):
+            raise ValueError(f"{name}: {values.shape} au lieu de ({self.n_bands},)")
+        return values
+
+    def reset(self):
+        """Réinitialise les compartiments (foyers: 0.8-1.2% d'infectés, tous âges)"""
+        random_factor = 0.8 + self.rng.random(len(self.total_population)) * 0.4
+        prevalence = np.where(self.outbreak_mask, OUTBREAK_PREVALENCE * random_factor, 0.0)
+        self.I = self.population * prevalence[:, None]
+        self.S = self.population - self.I
+        self.E = np.zeros_like(self.population)
+        self.R = np.zeros_like(self.population)
+        self.new_infections = np.zeros_like(self.population)
+        self.current_day = 0
+
+    @property
+    def state(self):
+        """État courant (4, N, A) dans l'ordre S, E, I, R"""
+        return np.stack([self.S, self.E, self.I, self.R])
+
+    @state.setter
+    def state(self, value):
+        self.S, self.E, self.I, self.R = (np.array(row, dtype=float) for row in value)
+
+    def prevalence(self, infected=None):
+        """Prévalence (N, A) par zone et tranche"""
+        infected = self.I if infected is None else infected
+        return np.divide(infected, self.population, out=np.zeros_like(infected),
+                         where=self.population > 0)
+
+    def force_of_infection(self, prevalence):
+        """λ (N, A) pour toutes les zones et tranches en un produit groupé"""
+        forces = prevalence @ self._contacts_t                 # (T, N, A)
+        force = forces[self.zone_type, self._zones]
+        return _by_zone(self.params["beta"]) * self.susceptibility * force
+
+    def imported_cases(self, prevalence):
+        """Cas importés (N, A): μ × Mᵀ · prévalence, répartis selon les déplacements"""
+        return _by_zone(self.params["mu"]) * self.travel_share * (self.mobility_t @ prevalence)
+
+    def step(self):
+        """Simule un pas de temps (1 jour) pour toutes les zones et tranches"""
+        sigma, gamma = _by_zone(self.params["sigma"]), _by_zone(self.params["gamma"])
+        prevalence = self.prevalence()
+
+        new_exposed = self.force_of_infection(prevalence) * self.S
+        new_infected = sigma * self.E
+        new_recovered = gamma * self.I
+        imported = self.imported_cases(prevalence)
+
+        self.S = np.maximum(0, self.S - new_exposed)
+        self.E = np.maximum(0, self.E + new_exposed - new_infected)
+        self.I = np.maximum(0, self.I + new_infected - new_recovered + imported)
+        self.R = np.maximum(0, self.R + new_recovered)
+        self.new_infections = new_infected + imported
+        self.current_day += 1
+
+    def run(self, days, store=None):
+        """
+        Simule `days` jours
+
+        Args:
+            store: HistoryStore de N × A zones (voir seir_engine.run); par
+                défaut un tableau en mémoire
+        Returns:
+            tuple: historique (days + 1, 4, N, A) et nouvelles infections
+            cumulées (N, A) sur la période
+        """
+        n_zones, n_bands = self.population.shape
+        if store is None:
+            store = HistoryStore(n_zones * n_bands, COMPARTMENTS,
+                                 capacity=days + 1, dtype=float)
+        store.append(self.state.reshape(len(COMPARTMENTS), -1))
+        infections = np.zeros_like(self.population)
+        for _ in range(days):
+            self.step()
+            infections += self.new_infections
+            store.append(self.state.reshape(len(COMPARTMENTS), -1))
+        store.flush()
+        history = store.last()
+        return history.reshape(len(history), len(COMPARTMENTS), n_zones, n_bands), infections
+
+
+# =============================================================================
+# SYNTHÈSE
+# =============================================================================
+
+def age_summary(model, infections, zones=None):
+    """
+    Infections et hospitalisations par tranche d'âge
+
+    Args:
+        infections: nouvelles infections cumulées (N, A) (voir run)
+        zones: masque (N,) des zones à agréger (toutes par défaut)
+    Returns:
+        dict: bands (une ligne par tranche), totaux
+    """
+    zones = np.ones(len(model.population), dtype=bool) if zones is None else zones
+    population = model.population[zones].sum(axis=0)
+    infected = infections[zones].sum(axis=0)
+    hospitalised = infected * model.hospitalisation_rate
+    return {
+        "n_zones": int(zones.sum()),
+        "bands": [
+            {
+                "band": label,
+                "population": int(round(population[a])),
+                "infections": int(round(infected[a])),
+                "attack_rate_pct": round(float(100 * infected[a] / population[a]), 2),
+                "hospitalisations": int(round(hospitalised[a])),
+                "hospitalisation_share_pct": round(
+                    float(100 * hospitalised[a] / max(hospitalised.sum(), 1e-12)), 1),
+            }
+            for a, label in enumerate(model.labels)
+        ],
+        "infections": int(round(infected.sum())),
+        "hospitalisations": int(round(hospitalised.sum())),
+    }
+
+
+def save_summary(summary, path=AGE_FILENAME):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    return path
+
+
+# =============================================================================
+# POINT D'ENTRÉE
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="SEIR métapopulationnel structuré par âge")
+    parser.add_argument("--bands", type=int, default=DEFAULT_BANDS, choices=(1, 2, 4, 8, 16),
+                        help="tranches d'âge")
+    parser.add_argument("--zones", type=int, default=None,
+                        help="zones synthétiques (défaut: les 30 villes)")
+    parser.add_argument("--contacts", help="matrice de contacts observée (.npy ou .csv)")
+    parser.add_argument("--params", default=None, help="paramètres calibrés (calibration.json)")
+    parser.add_argument("--days", type=int, default=None,
+                        help="horizon de simulation (défaut: jusqu'à la date de référence)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=AGE_FILENAME)
+    args = parser.parse_args()
+
+    cities = synthetic_cities(args.zones, seed=args.seed) if args.zones else load_cities()
+    params = load_params(args.params, cities) if args.params else None
+    contacts = load_contacts(args.contacts) if args.contacts else None
+    days = args.days if args.days is not None else (REFERENCE_DATE - START_DATE).days
+
+    mobility = build_mobility_matrix(cities, START_DATE)
+    model = AgeStructuredSEIR(cities, mobility, params, contacts, args.bands, seed=args.seed)
+    print(f"👪 {len(cities)} zones × {args.bands} tranches d'âge, {days} jours...")
+    start = time.perf_counter()
+    _, infections = model.run(days)
+    seconds = time.perf_counter() - start
+
+    summary = age_summary(model, infections)
+    summary["days"] = days
+    save_summary(summary, args.out)
+
+    print(f"\n{'Tranche':>8} {'Population':>12} {'Infections':>12} {'Attaque':>8} "
+          f"{'Hospit.':>9} {'Part':>6}")
+    for row in summary["bands"]:
+        print(f"{row['band']:>8} {row['population']:>12,} {row['infections']:>12,} "
+              f"{row['attack_rate_pct']:>7.1f}% {row['hospitalisations']:>9,} "
+              f"{row['hospitalisation_share_pct']:>5.1f}%")
+    print(f"\n✅ {summary['infections']:,} infections, {summary['hospitalisations']:,} "
+          f"hospitalisations en {seconds:.2f} s ({1000 * seconds / max(days, 1):.1f} ms/jour) "
+          f"-> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
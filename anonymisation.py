@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Agrégation k-anonyme (k ≥ 50) des flux origine-destination
+
+Étape placée entre la détection des déplacements (cdr_ingest.py) et le
+modèle: les abonnés, déjà hachés avec sel à la lecture, ne servent qu'à
+compter des personnes distinctes par (tranche horaire, origine, destination).
+Les empreintes sont effacées dès qu'une tranche est close; seules des
+matrices de comptes en sortent.
+
+Toute cellule comptant moins de k personnes est retirée de la matrice par
+zone. Si des groupes de zones sont fournis (districts), ces cellules sont
+regroupées au niveau district et publiées à ce niveau lorsqu'elles y
+atteignent k; le reste est supprimé. Un rapport de suppression alimente la
+slide anonymisation.
+"""
+
+import datetime
+import json
+import os
+
+import numpy as np
+
+from cdr_ingest import NS_PER_DAY, ODAccumulator
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+K_MIN = 50                  # Personnes minimum par groupe publié
+BUCKET_HOURS = 6            # Tranche temporelle d'agrégation
+COMPACT_EVERY = 8           # Blocs accumulés avant dédoublonnage intermédiaire
+
+REPORT_FILENAME = "anonymisation_report.json"
+
+PAIR_DTYPE = np.dtype([("subscriber", np.uint64), ("cell", np.int64)])
+
+# =============================================================================
+# ACCUMULATEUR K-ANONYME
+# =============================================================================
+
+class KAnonymousAccumulator(ODAccumulator):
+    """
+    Matrices OD quotidiennes k-anonymes
+
+    Même interface que ODAccumulator (add_trips, finalize, matrix, save).
+    Mémoire bornée: seules les paires (abonné, cellule) des tranches encore
+    ouvertes sont conservées; les données sont supposées ordonnées dans le
+    temps à une tranche près.
+    """
+
+    def __init__(self, n_zones, k=K_MIN, bucket_hours=BUCKET_HOURS, zone_groups=None):
+        super().__init__(n_zones)
+        self.k = k
+        self.bucket_hours = bucket_hours
+        self.bucket_ns = bucket_hours * 3600 * 10**9
+
+        self.zone_groups = None if zone_groups is None else np.asarray(zone_groups)
+        self.n_groups = 0 if zone_groups is None else int(self.zone_groups.max()) + 1
+        self.coarse = {}  # jour -> np.ndarray (G, G) des flux regroupés
+
+        self._open = {}  # tranche -> liste de tableaux PAIR_DTYPE
+        self.report = {
+            "k": k,
+            "bucket_hours": bucket_hours,
+            "buckets": 0,
+            "cells_published": 0,
+            "cells_coarsened": 0,
+            "cells_suppressed": 0,
+            # Personnes distinctes par (tranche, cellule), sommées sur les
+            # cellules: ce sont ces effectifs que le seuil k compare
+            "persons_total": 0,
+            "persons_published": 0,
+            "persons_coarsened": 0,
+            "persons_suppressed": 0,
+        }
+
+    def add_trips(self, subscriber, time_ns, origin, dest):
+        """Ajoute des déplacements; clôt les tranches qui ne recevront plus rien"""
+        if len(subscriber) == 0:
+            return
+
+        pairs = np.empty(len(subscriber), dtype=PAIR_DTYPE)
+        pairs["subscriber"] = subscriber
+        pairs["cell"] = origin.astype(np.int64) * self.n_zones + dest
+
+        bucket = time_ns // self.bucket_ns
+        for b in np.unique(bucket):
+            chunks = self._open.setdefault(int(b), [])
+            chunks.append(pairs[bucket == b])
+            if len(chunks) >= COMPACT_EVERY:
+                self._open[int(b)] = [np.unique(np.concatenate(chunks))]
+
+        # Une tranche de retard est tolérée avant la clôture
+        oldest_open = int(bucket.min()) - 1
+        for b in sorted(self._open):
+            if b < oldest_open:
+                self._flush(b)
+
+    def finalize(self):
+        """Clôt toutes les tranches encore ouvertes"""
+        for b in sorted(self._open):
+            self._flush(b)
+
+    def _flush(self, bucket):
+        """Compte les personnes distinctes par cellule, supprime celles < k"""
+        pairs = np.unique(np.concatenate(self._open.pop(bucket)))
+        counts = np.bincount(pairs["cell"], minlength=self.n_zones ** 2)
+        small = (counts > 0) & (counts < self.k)
+        day = int(bucket * self.bucket_ns // NS_PER_DAY)
+
+        published = np.where(small, 0, counts)
+        if day not in self.counts:
+            self.counts[day] = np.zeros((self.n_zones, self.n_zones), dtype=np.int64)
+        self.counts[day] += published.reshape(self.n_zones, self.n_zones)
+
+        report = self.report
+        report["buckets"] += 1
+        report["persons_total"] += int(counts.sum())
+        report["persons_published"] += int(published.sum())
+        report["cells_published"] += int((published > 0).sum())
+
+        suppressed_pairs = pairs[small[pairs["cell"]]]
+        if self.zone_groups is not None and len(suppressed_pairs):
+            self._coarsen(day, suppressed_pairs)
+        else:
+            report["cells_suppressed"] += int(small.sum())
+            report["persons_suppressed"] += int(counts[small].sum())
+
+    def _coarsen(self, day, pairs):
+        """Regroupe des cellules < k au niveau des groupes de zones (districts)"""
+        origin = self.zone_groups[pairs["cell"] // self.n_zones]
+        dest = self.zone_groups[pairs["cell"] % self.n_zones]
+
+        grouped = np.empty(len(pairs), dtype=PAIR_DTYPE)
+        grouped["subscriber"] = pairs["subscriber"]
+        grouped["cell"] = origin.astype(np.int64) * self.n_groups + dest
+        grouped = np.unique(grouped)
+
+        counts = np.bincount(grouped["cell"], minlength=self.n_groups ** 2)
+        released = counts >= self.k
+        if day not in self.coarse:
+            self.coarse[day] = np.zeros((self.n_groups, self.n_groups), dtype=np.int64)
+        self.coarse[day] += np.where(released, counts, 0).reshape(self.n_groups, self.n_groups)
+
+        # Bilan exprimé en cellules de zones, pour un rapport cohérent
+        cells, zone_counts = np.unique(pairs["cell"], return_counts=True)
+        group_cell = (self.zone_groups[cells // self.n_zones] * self.n_groups
+                      + self.zone_groups[cells % self.n_zones])
+        coarsened = released[group_cell]
+
+        report = self.report
+        report["cells_coarsened"] += int(coarsened.sum())
+        report["cells_suppressed"] += int((~coarsened).sum())
+        report["persons_coarsened"] += int(zone_counts[coarsened].sum())
+        report["persons_suppressed"] += int(zone_counts[~coarsened].sum())
+
+    def suppression_report(self):
+        """Rapport de suppression (dict sérialisable en JSON)"""
+        report = dict(self.report)
+        total = report["persons_total"]
+        report["suppressed_pct"] = (
+            round(100 * report["persons_suppressed"] / total, 2) if total else 0.0
+        )
+        published = [m[m > 0].min() for m in self.counts.values() if (m > 0).any()]
+        report["min_published_count"] = int(min(published)) if published else 0
+        return report
+
+    def save_report(self, path):
+        """Écrit le rapport de suppression en JSON"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.suppression_report(), f, ensure_ascii=False, indent=2)
+        return path
+
+    def save(self, output_dir):
+        """Écrit les matrices par zone, par groupe de zones et le rapport"""
+        paths = super().save(output_dir)
+        epoch = datetime.date(1970, 1, 1)
+        for day in sorted(self.coarse):
+            date = epoch + datetime.timedelta(days=day)
+            path = os.path.join(output_dir, f"od_groups_{date.isoformat()}.npy")
+            np.save(path, self.coarse[day].astype(float))
+            paths.append(path)
+        paths.append(self.save_report(os.path.join(output_dir, REPORT_FILENAME)))
+        return paths
@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Backtest à origine glissante des prévisions J+7 / J+14
+
+Rejoue une série historique de cas actifs par zone: chaque jour, l'état du
+modèle est recalé sur les cas observés (insertion directe de I, S ajusté
+pour conserver la population). Depuis chaque jour d'origine, un ensemble
+binomial (ensemble.simulate_batch) prévoit J+7 et J+14: la prévision est
+sa médiane, l'intervalle à 90% ses quantiles 5%-95%. Au niveau national,
+chaque réalisation est d'abord sommée sur les zones observées, et les
+quantiles sont pris sur ces totaux. La prévision est ensuite comparée à ce
+qui a réellement été observé.
+
+Scores par zone et nationaux: MAE, MAPE, couverture de l'intervalle. La
+précision nationale (100 - MAPE) alimente la slide méthodologie.
+
+Les états recalés et les résultats de chaque fenêtre sont mis en cache sur
+disque, indexés par un hash chaîné des observations: ajouter un jour à la
+série ne calcule qu'un nouvel état et les fenêtres nouvelles.
+
+Usage:
+    python backtest.py observations.csv
+    python backtest.py observations.csv --params calibration.json --runs 500
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from cities import load_cities, zone_column
+from ensemble import simulate_batch
+from mobility import build_mobility_matrix, city_table_hash
+from seir_engine import (
+    CALIBRATION_FILE,
+    DEFAULT_PARAMS,
+    START_DATE,
+    MetapopulationSEIR,
+    load_params,
+    transpose_mobility,
+)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+HORIZONS = (7, 14)
+MIN_HISTORY = 14                # Jours observés avant la première origine
+INTERVAL_RUNS = 200             # Réalisations stochastiques par fenêtre
+INTERVAL_QUANTILES = (0.05, 0.95)
+WINDOW_QUANTILES = (0.5,) + INTERVAL_QUANTILES  # Prévision (médiane), bornes
+
+BACKTEST_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), ".cache", "backtest"
+)
+SUMMARY_FILENAME = "backtest_summary.json"
+
+# État d'un worker de backtest (initialisé une fois par processus)
+_worker = {}
+
+# =============================================================================
+# OBSERVATIONS
+# =============================================================================
+
+def load_case_matrix(path, cities, start_date=START_DATE):
+    """
+    Charge une série quotidienne de cas actifs par zone
+
+    Format CSV: date, zone, cases (zone = id ou nom de ville).
+
+    Returns:
+        np.ndarray (T, N): cas du jour `start_date` + t, NaN si non observé
+    """
+    frame = pd.read_csv(path, parse_dates=["date"])
+    name_to_id = {city["name"]: city["id"] for city in cities}
+    frame["zone"] = frame["zone"].map(lambda z: name_to_id.get(z, z))
+
+    table = frame.pivot_table(index="date", columns="zone", values="cases", aggfunc="sum")
+    dates = pd.date_range(pd.Timestamp(start_date), table.index.max(), freq="D")
+    table = table.reindex(index=dates, columns=[city["id"] for city in cities])
+    return table.to_numpy(dtype=float)
+
+
+# =============================================================================
+# ÉTATS RECALÉS (MIS EN CACHE)
+# =============================================================================
+
+def _run_key(cities, params, seed, start_date=START_DATE):
+    """Hash de départ de la chaîne: table de villes, paramètres, graine et date de départ"""
+    payload = json.dumps(
+        {
+            "cities": city_table_hash(cities),
+            "params": {k: np.asarray(v).tolist() for k, v in sorted(params.items())},
+            "seed": seed,
+            "start_date": start_date.isoformat(),
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _chain(key, observed):
+    """Clé du jour suivant: hash de la clé précédente et des cas observés"""
+    return hashlib.sha256(key.encode("ascii") + observed.tobytes()).hexdigest()
+
+
+def assimilate(model, observed):
+    """Recale l'état du modèle sur les cas actifs observés (zones connues)"""
+    infected = np.where(np.isnan(observed), model.I, observed)
+    susceptible = np.maximum(0, model.population - model.E - infected - model.R)
+    model.state = (susceptible, model.E, infected, model.R)
+
+
+def assimilated_states(model, cases, run_key, cache_dir=BACKTEST_CACHE_DIR):
+    """
+    États (T, 4, N) du modèle recalé jour après jour sur les observations
+
+    Returns:
+        (states, keys): états et clé de cache de chaque jour
+    """
+    states = np.empty((len(cases),) + model.state.shape)
+    keys = []
+    key = run_key
+    for t, observed in enumerate(cases):
+        key = _chain(key, observed)
+        keys.append(key)
+        path = cache_dir and os.path.join(cache_dir, f"state_{key[:24]}.npy")
+
+        if path and os.path.exists(path):
+            model.state = np.load(path)
+        else:
+            if t > 0:
+                model.step()
+            assimilate(model, observed)
+            if path:
+                os.makedirs(cache_dir, exist_ok=True)
+                np.save(path, model.state)
+        states[t] = model.state
+    return states, keys
+
+
+# =============================================================================
+# FENÊTRES DE PRÉVISION
+# =============================================================================
+
+def _init_worker(cities, mobility, params, seed, n_runs):
+    """Initialise un worker: entrées de l'ensemble (matrice, population, paramètres)"""
+    _worker.update(
+        mobility_t=transpose_mobility(mobility),
+        population=zone_column(cities, "population", float),
+        params=params,
+        n_runs=n_runs,
+        seed=seed,
+    )
+
+
+def forecast_window(task):
+    """
+    Tâche worker: prévision et intervalle depuis un état d'origine
+
+    Prévision et bornes viennent du même ensemble. Les totaux nationaux
+    sont sommés réalisation par réalisation sur les zones de `observed`
+    (zones observées au jour cible de chaque horizon), avant les quantiles.
+
+    Returns:
+        dict: "zones" np.ndarray (3, H, N) et "national" np.ndarray (3, H):
+        prévision (médiane), borne basse, borne haute
+    """
+    origin, state, observed = task
+    rng = np.random.default_rng([_worker["seed"], origin])
+    runs = simulate_batch(
+        rng, _worker["mobility_t"], _worker["population"], _worker["params"],
+        _worker["n_runs"], max(HORIZONS), HORIZONS, initial=state,
+    )
+    totals = np.where(observed[:, None, :], runs, 0).sum(axis=2)
+    return {
+        "zones": np.quantile(runs, WINDOW_QUANTILES, axis=1),
+        "national": np.quantile(totals, WINDOW_QUANTILES, axis=1),
+    }
+
+
+def _observed_masks(cases, origin):
+    """Zones observées (H, N) au jour cible de chaque horizon (toutes au-delà)"""
+    return np.stack([
+        ~np.isnan(cases[origin + h]) if origin + h < len(cases)
+        else np.ones(cases.shape[1], dtype=bool)
+        for h in HORIZONS
+    ])
+
+
+def run_windows(cities, mobility, params, cases, states, keys, seed=0,
+                n_runs=INTERVAL_RUNS, n_workers=None, cache_dir=BACKTEST_CACHE_DIR):
+    """
+    Prévisions de toutes les origines (en parallèle, résultats mis en cache)
+
+    Returns:
+        dict {origine: {"zones": (3, H, N), "national": (3, H)}}
+    """
+    windows = {}
+    tasks = []
+    paths = {}
+    for origin in range(MIN_HISTORY, len(states) - min(HORIZONS)):
+        observed = _observed_masks(cases, origin)
+        if cache_dir:
+            mask_key = hashlib.sha256(np.packbits(observed).tobytes()).hexdigest()
+            paths[origin] = os.path.join(
+                cache_dir, f"window_{keys[origin][:24]}_{mask_key[:8]}_{n_runs}.npz"
+            )
+        if origin in paths and os.path.exists(paths[origin]):
+            with np.load(paths[origin]) as cached:
+                windows[origin] = {name: cached[name] for name in cached.files}
+        else:
+            tasks.append((origin, states[origin], observed))
+
+    if tasks:
+        with ProcessPoolExecutor(
+            max_workers=n_workers or os.cpu_count(),
+            initializer=_init_worker,
+            initargs=(cities, mobility, params, seed, n_runs),
+        ) as pool:
+            for (origin, _, _), window in zip(tasks, pool.map(forecast_window, tasks)):
+                windows[origin] = window
+                if cache_dir:
+                    os.makedirs(cache_dir, exist_ok=True)
+                    np.savez(paths[origin], **window)
+    return windows
+
+
+# =============================================================================
+# SCORES
+# =============================================================================
+
+def score(point, lower, upper, observed):
+    """
+    MAE, MAPE (%) et couverture (%) sur l'axe des fenêtres
+
+    Les observations manquantes sont ignorées; le MAPE ignore les zéros.
+    """
+    known = ~np.isnan(observed)
+    error = np.abs(point - observed)
+    positive = known & (observed > 0)
+    ape = np.divide(error, observed, out=np.zeros_like(error), where=positive)
+    covered = (lower <= observed) & (observed <= upper)
+
+    def mean(values, mask):
+        total = np.where(mask, values, 0).sum(axis=0)
+        count = mask.sum(axis=0)
+        return np.divide(total, count, out=np.full(total.shape, np.nan), where=count > 0)
+
+    return {
+        "mae": mean(error, known),
+        "mape": 100 * mean(ape, positive),
+        "coverage": 100 * mean(covered, known),
+    }
+
+
+def summarize_backtest(cities, cases, windows):
+    """
+    Tableau de synthèse national et par zone, pour chaque horizon
+
+    Returns:
+        dict: horizons, n_windows, national {h: scores}, zones [...]
+    """
+    national = {}
+    zones = [{"id": city["id"], "name": city["name"]} for city in cities]
+
+    for k, horizon in enumerate(HORIZONS):
+        origins = [t for t in sorted(windows) if t + horizon < len(cases)]
+        if not origins:
+            continue
+        point, lower, upper = (
+            np.stack([windows[t]["zones"][j, k] for t in origins]) for j in range(3)
+        )
+        observed = cases[[t + horizon for t in origins]]
+
+        per_zone = score(point, lower, upper, observed)
+        for zone, mae, mape, coverage in zip(zones, *per_zone.values()):
+            zone[str(horizon)] = {
+                "mae": _rounded(mae), "mape": _rounded(mape), "coverage": _rounded(coverage),
+            }
+
+        # National: quantiles des totaux par réalisation (zones observées
+        # chaque jour), comparés au total observé
+        known = ~np.isnan(observed)
+        totals = [np.array([windows[t]["national"][j, k] for t in origins])[:, None]
+                  for j in range(3)]
+        observed_total = np.where(known, observed, 0).sum(axis=1)[:, None]
+        scores = {key: float(value[0]) for key, value in score(*totals, observed_total).items()}
+        national[str(horizon)] = {
+            "n_windows": len(origins),
+            "mae": _rounded(scores["mae"]),
+            "mape": _rounded(scores["mape"]),
+            "coverage": _rounded(scores["coverage"]),
+            "accuracy": _rounded(max(0.0, 100 - scores["mape"])),
+        }
+
+    return {
+        "horizons": list(HORIZONS),
+        "n_windows": len(windows),
+        "national": national,
+        "zones": zones,
+    }
+
+
+def _rounded(value, digits=1):
+    """Arrondi JSON (None si non défini)"""
+    return None if np.isnan(value) else round(float(value), digits)
+
+
+# =============================================================================
+# BACKTEST
+# =============================================================================
+
+def backtest(cities, cases, params=None, start_date=START_DATE, seed=0,
+             n_runs=INTERVAL_RUNS, n_workers=None, cache_dir=BACKTEST_CACHE_DIR):
+    """
+    Backtest complet: recalage, fenêtres de prévision, scores
+
+    Args:
+        cases: np.ndarray (T, N) de cas actifs observés (voir load_case_matrix)
+        params: paramètres du modèle (défaut: DEFAULT_PARAMS)
+        cache_dir: cache disque des états et fenêtres (None pour le désactiver)
+    Returns:
+        dict: voir summarize_backtest(), plus `seconds`
+    """
+    start = time.perf_counter()
+    params = {**DEFAULT_PARAMS, **(params or {})}
+    mobility = build_mobility_matrix(cities, start_date)
+
+    model = MetapopulationSEIR(cities, mobility, params=params, seed=seed)
+    run_key = _run_key(cities, params, seed, start_date)
+    states, keys = assimilated_states(model, cases, run_key, cache_dir)
+    windows = run_windows(cities, mobility, params, cases, states, keys, seed, n_runs,
+                          n_workers, cache_dir)
+
+    summary = summarize_backtest(cities, cases, windows)
+    summary["seconds"] = time.perf_counter() - start
+    return summary
+
+
+def save_summary(summary, path=SUMMARY_FILENAME):
+    """Écrit le tableau de synthèse en JSON (lu par generate_presentation.py)"""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    return path
+
+
+# =============================================================================
+# POINT D'ENTRÉE
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest des prévisions J+7 / J+14")
+    parser.add_argument("observations", help="CSV date, zone, cases")
+    parser.add_argument("--params", default=CALIBRATION_FILE,
+                        help="paramètres calibrés (si présent)")
+    parser.add_argument("--runs", type=int, default=INTERVAL_RUNS,
+                        help="réalisations par fenêtre pour les intervalles")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--no-cache", action="store_true", help="désactive le cache disque")
+    parser.add_argument("--out", default=SUMMARY_FILENAME)
+    args = parser.parse_args()
+
+    cities = load_cities()
+    params = load_params(args.params, cities) if os.path.exists(args.params) else None
+    cases = load_case_matrix(args.observations, cities)
+
+    print(f"📈 Backtest sur {len(cases)} jours, {len(cities)} zones...")
+    summary = backtest(cities, cases, params, n_runs=args.runs, n_workers=args.workers,
+                       cache_dir=None if args.no_cache else BACKTEST_CACHE_DIR)
+    save_summary(summary, args.out)
+
+    print(f"\n{'Horizon':<8} {'Fenêtres':>9} {'MAE':>10} {'MAPE':>8} {'Couv. 90%':>10} {'Précision':>10}")
+    for horizon, scores in summary["national"].items():
+        print(f"J+{horizon:<6} {scores['n_windows']:>9} {scores['mae']:>10,.0f} "
+              f"{scores['mape']:>7.1f}% {scores['coverage']:>9.1f}% {scores['accuracy']:>9.1f}%")
+    print(f"\n✅ {summary['n_windows']} fenêtres en {summary['seconds']:.1f} s -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Génération en lot des présentations (une par district sanitaire)
+
+Lit un manifeste JSON de decks à produire et les construit dans un pool de
+processus, par le même chemin que generate_presentation.py (rapports JSON
+ajoutés par attach_artifacts, puis build_presentation). Chaque worker charge
+une seule fois le modèle python-pptx et les images (architecture.png,
+anonymisation.png) rééchantillonnées à leur cadre d'affichage, puis
+réutilise leurs blobs pour tous les decks qu'il écrit.
+
+Usage:
+    python batch_decks.py manifest.json
+    python batch_decks.py --districts decks/     # un deck par district
+"""
+
+import argparse
+import json
+import os
+import re
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+
+from cities import load_cities, zone_column
+from ensemble import DEFAULT_RUNS, run_ensemble, summarize_ensemble
+from generate_presentation import (
+    REQUIRED_FIGURES,
+    attach_artifacts,
+    build_presentation,
+    media_savings,
+    preload_media,
+)
+from mobility import build_mobility_matrix, mobility_model
+from risk import TREND_DAYS, zone_risk
+from seir_engine import (
+    CALIBRATION_FILE,
+    COMPARTMENTS,
+    REFERENCE_DATE,
+    START_DATE,
+    chart_data,
+    load_params,
+    simulate_to_date,
+    summarize,
+)
+
+# =============================================================================
+# MANIFESTE
+# =============================================================================
+
+def load_manifest(path):
+    """
+    Charge un manifeste de decks
+
+    Format: liste (ou {"decks": [...]}) d'objets
+        {"output": "decks/savanes.pptx", "figures": {...}}
+
+    Raises:
+        ValueError: deck sans `output`, ou dont les `figures` n'ont pas tous
+            les chiffres de REQUIRED_FIGURES (vérifié ici plutôt que dans un
+            worker, où l'erreur interromprait tout le lot)
+    """
+    with open(path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    decks = manifest["decks"] if isinstance(manifest, dict) else manifest
+    for k, spec in enumerate(decks):
+        if "output" not in spec:
+            raise ValueError(f"Spécification de deck sans 'output': {spec}")
+        figures = spec.get("figures")
+        if not isinstance(figures, dict):
+            raise ValueError(f"Deck {k} ({spec['output']}): 'figures' manquant")
+        missing = [key for key in REQUIRED_FIGURES if key not in figures]
+        if missing:
+            raise ValueError(f"Deck {k} ({spec['output']}): chiffres manquants "
+                             f"{', '.join(missing)}")
+    return decks
+
+
+def _slug(text):
+    """Nom de fichier ASCII à partir d'un nom de district"""
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+    return re.sub(r"[^A-Za-z0-9]+", "_", text).strip("_")
+
+
+def district_manifest(output_dir, cities=None, start_date=START_DATE,
+                      today=REFERENCE_DATE, n_runs=DEFAULT_RUNS, params=None, seed=0):
+    """
+    Construit le manifeste "un deck par district"
+
+    Une seule simulation et un seul ensemble Monte Carlo nationaux sont
+    lancés; les chiffres de chaque district en sont des agrégations.
+    """
+    cities = cities if cities is not None else load_cities()
+    mobility = build_mobility_matrix(cities, start_date)
+    history, predictions = simulate_to_date(cities, start_date, today, params, seed,
+                                            mobility=mobility)
+    results = run_ensemble(
+        cities, mobility, (today - start_date).days, n_runs=n_runs, params=params, seed=seed,
+    )
+    risk = zone_risk(cities, history[-TREND_DAYS:, COMPARTMENTS.index("I")], mobility,
+                     mobility_model(cities).inflow(start_date))
+
+    districts = zone_column(cities, "district")
+    decks = []
+    for district in sorted(set(districts)):
+        zones = districts == district
+        figures = summarize(cities, history, predictions, zones, risk)
+        figures.update(summarize_ensemble(results, n_runs, zones))
+        figures["charts"] = chart_data(cities, history, predictions, zones, today, risk=risk)
+        figures["scope"] = f"District {district}"
+        decks.append({
+            "output": os.path.join(output_dir, f"{_slug(district)}.pptx"),
+            "figures": figures,
+        })
+    return decks
+
+
+# =============================================================================
+# GÉNÉRATION EN LOT
+# =============================================================================
+
+def _build_deck(spec, root="."):
+    """
+    Tâche worker: construit et écrit un deck (rapports JSON de `root` inclus)
+
+    Returns:
+        (chemin du deck, octets d'images: voir media_savings)
+    """
+    output = spec["output"]
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    figures = attach_artifacts(dict(spec["figures"]), root)
+    prs = build_presentation(figures)
+    prs.save(output)
+    return output, media_savings(prs)
+
+
+def generate_batch(decks, n_workers=None, root="."):
+    """
+    Génère tous les decks du manifeste en parallèle
+
+    Args:
+        root: dossier des rapports JSON (anonymisation, scénarios, backtest)
+            ajoutés à chaque deck, comme pour create_presentation
+    Returns:
+        dict: outputs, media (media_savings de chaque deck), n_decks,
+        seconds, decks_per_second
+    """
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=n_workers, initializer=preload_media) as pool:
+        results = list(pool.map(_build_deck, decks, [root] * len(decks)))
+    seconds = time.perf_counter() - start
+    outputs = [output for output, _ in results]
+
+    return {
+        "outputs": outputs,
+        "media": [savings for _, savings in results],
+        "n_decks": len(outputs),
+        "seconds": seconds,
+        "decks_per_second": len(outputs) / seconds if seconds > 0 else float("inf"),
+    }
+
+
+# =============================================================================
+# POINT D'ENTRÉE
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Génération de decks en lot")
+    parser.add_argument("manifest", nargs="?", help="manifeste JSON des decks")
+    parser.add_argument("--districts", metavar="DOSSIER",
+                        help="génère un deck par district dans DOSSIER")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS,
+                        help="réalisations Monte Carlo (mode --districts)")
+    parser.add_argument("--params", default=CALIBRATION_FILE,
+                        help="paramètres calibrés (mode --districts, si présent)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="nombre de processus (défaut: nombre de CPU)")
+    args = parser.parse_args()
+
+    if args.districts:
+        print("🦠 Simulation nationale et agrégation par district...")
+        cities = load_cities()
+        params = load_params(args.params, cities) if os.path.exists(args.params) else None
+        decks = district_manifest(args.districts, cities, n_runs=args.runs, params=params)
+    elif args.manifest:
+        decks = load_manifest(args.manifest)
+    else:
+        parser.error("indiquer un manifeste ou --districts DOSSIER")
+
+    print(f"🚀 Génération de {len(decks)} présentations...")
+    report = generate_batch(decks, n_workers=args.workers)
+
+    for output, savings in zip(report["outputs"], report["media"]):
+        print(f"   {output}: {savings['embedded_bytes'] / 1024:.0f} Ko d'images "
+              f"({savings['saved_bytes'] / 1024:.0f} Ko économisés)")
+
+    print(f"\n✅ {report['n_decks']} présentations en {report['seconds']:.2f} s "
+          f"({report['decks_per_second']:.1f} decks/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Suite de benchmarks reproductibles: modèle, mobilité, risque, présentation
+
+Chaque cas est mesuré aux échelles qui nous intéressent (30 villes, 393
+sous-préfectures, 5 000 zones) sur des tables synthétiques fixes
+(synthetic_cities, graine BENCH_SEED) au schéma de ivoryCoastCities.js:
+
+    seir.step       pas journaliers (EpidemicSimulation.step), STEP_CALLS par mesure
+    seir.run365     365 jours depuis l'état initial
+    mobility.build  matrice de flux sans cache (generateMobilityMatrix)
+    risk.scores     métriques de risque de toutes les zones (getMetrics)
+    deck.single     une présentation (build_presentation + save)
+    deck.batch      un deck par district (generate_batch)
+
+Chaque cas tourne dans un processus neuf: le pic de RSS est le sien, pas
+celui des cas précédents. Les workers des cas multi-processus (deck.batch)
+ne comptent pas dans ce pic: le pic du plus gros processus enfant terminé
+(RUSAGE_CHILDREN) est relevé à part, préparation du cas comprise (ensemble
+Monte Carlo des chiffres des decks).
+Temps (médiane et minimum de --repeat mesures), débit (unités par seconde),
+pics RSS et allocations (pic tracemalloc du processus de mesure, passe
+séparée non chronométrée) sont ajoutés à un historique JSON avec le commit
+courant. --compare signale les cas plus lents au-delà d'une tolérance entre
+deux commits de l'historique.
+
+À lancer depuis la racine du dépôt (images des slides):
+    python benchmarks.py
+    python benchmarks.py --scales 30 393 --only seir.step seir.run365
+    python benchmarks.py --compare               # deux dernières entrées
+    python benchmarks.py --compare <commit_base> <commit_tête> --tolerance 0.1
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+SCALES = (30, 393, 5000)
+BENCH_SEED = 2025
+BENCH_DATE = datetime.date(2025, 10, 15)   # Récolte: facteurs saisonniers actifs
+BENCH_RUNS = 20                            # Runs Monte Carlo des chiffres des decks
+RUN_DAYS = 365
+STEP_CALLS = 100                           # Pas par mesure de seir.step (< 1 ms chacun)
+
+DEFAULT_REPEAT = 5
+HISTORY_FILE = "benchmarks.json"
+REGRESSION_TOLERANCE = 0.15     # +15% de temps médian
+
+# =============================================================================
+# CAS DE BENCHMARK
+# =============================================================================
+# Chaque préparation reçoit l'échelle et renvoie (fonction chronométrée,
+# unités traitées par appel, nom de l'unité). Les imports sont faits dans
+# les fonctions: seul le processus du cas paie les siens.
+
+def _cities(scale):
+    from cities import synthetic_cities
+    return synthetic_cities(scale, seed=BENCH_SEED)
+
+
+def _model(scale):
+    from mobility import build_mobility_matrix
+    from seir_engine import MetapopulationSEIR
+
+    cities = _cities(scale)
+    mobility = build_mobility_matrix(cities, BENCH_DATE, cache_dir=None)
+    return cities, mobility, MetapopulationSEIR(cities, mobility, seed=BENCH_SEED)
+
+
+def setup_seir_step(scale):
+    model = _model(scale)[2]
+
+    def steps():
+        for _ in range(STEP_CALLS):
+            model.step()
+    return steps, scale * STEP_CALLS, "zone-jours"
+
+
+def setup_seir_run(scale):
+    model = _model(scale)[2]
+
+    def run():
+        model.reset()
+        model.run(RUN_DAYS)
+    return run, scale * RUN_DAYS, "zone-jours"
+
+
+def setup_mobility_build(scale):
+    from mobility import build_mobility_matrix
+
+    cities = _cities(scale)
+    return (lambda: build_mobility_matrix(cities, BENCH_DATE, cache_dir=None)), scale, "zones"
+
+
+def setup_risk_scores(scale):
+    from risk import TREND_DAYS, zone_risk
+    from seir_engine import COMPARTMENTS
+
+    cities, mobility, model = _model(scale)
+    infected = model.run(30)[-TREND_DAYS:, COMPARTMENTS.index("I")]
+    return (lambda: zone_risk(cities, infected, mobility)), scale, "zones"
+
+
+def _district_decks(output_dir):
+    from batch_decks import district_manifest
+    return district_manifest(output_dir, n_runs=BENCH_RUNS, seed=BENCH_SEED)
+
+
+def setup_deck_single(scale):
+    from generate_presentation import build_presentation
+
+    output_dir = tempfile.mkdtemp(prefix="bench_decks_")
+    figures = _district_decks(output_dir)[0]["figures"]
+    output = os.path.join(output_dir, "single.pptx")
+    return (lambda: build_presentation(figures).save(output)), 1, "decks"
+
+
+def setup_deck_batch(scale):
+    from batch_decks import generate_batch
+
+    decks = _district_decks(tempfile.mkdtemp(prefix="bench_decks_"))
+    return (lambda: generate_batch(decks)), len(decks), "decks"
+
+
+# Nom -> (préparation, échelles (None: indépendant de l'échelle), répétitions max)
+BENCHMARKS = {
+    "seir.step": (setup_seir_step, SCALES, None),
+    "seir.run365": (setup_seir_run, SCALES, 3),
+    "mobility.build": (setup_mobility_build, SCALES, 3),
+    "risk.scores": (setup_risk_scores, SCALES, None),
+    "deck.single": (setup_deck_single, None, None),
+    "deck.batch": (setup_deck_batch, None, 3),
+}
+
+# =============================================================================
+# MESURE
+# =============================================================================
+
+def _run_case(name, scale, repeat):
+    """
+    Tâche du processus de mesure: prépare et chronomètre un cas
+
+    Un appel de chauffe, `repeat` appels chronométrés, puis un appel sous
+    tracemalloc pour le pic d'allocations (ralenti, donc non chronométré).
+    """
+    setup, _, max_repeat = BENCHMARKS[name]
+    repeat = min(repeat, max_repeat or repeat)
+    function, units, unit = setup(scale)
+
+    function()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    function()
+    alloc_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    median = statistics.median(times)
+    return {
+        "benchmark": name,
+        "scale": scale,
+        "repeat": repeat,
+        "median_s": median,
+        "min_s": min(times),
+        "throughput": units / median if median > 0 else float("inf"),
+        "unit": f"{unit}/s",
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        # Plus gros processus enfant terminé (préparation comprise)
+        "children_peak_rss_mb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024,
+        "alloc_peak_mb": alloc_peak / 2**20,
+    }
+
+
+def case_key(name, scale):
+    return name if scale is None else f"{name}@{scale}"
+
+
+def run_suite(names=None, scales=SCALES, repeat=DEFAULT_REPEAT):
+    """
+    Lance les cas demandés, chacun dans un processus neuf
+
+    Returns:
+        dict {clé "nom@échelle": résultat de _run_case}
+    """
+    results = {}
+    context = get_context("spawn")
+    for name in names or BENCHMARKS:
+        case_scales = BENCHMARKS[name][1]
+        for scale in ([None] if case_scales is None else
+                      [s for s in case_scales if s in scales]):
+            key = case_key(name, scale)
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                result = pool.submit(_run_case, name, scale, repeat).result()
+            results[key] = result
+            children = result["children_peak_rss_mb"]
+            print(f"  {key:<22} {result['median_s'] * 1000:>10.2f} ms "
+                  f"{result['throughput']:>14,.0f} {result['unit']:<14} "
+                  f"RSS {result['peak_rss_mb']:>7.1f} Mo  alloc {result['alloc_peak_mb']:>7.1f} Mo"
+                  + (f"  enfants {children:>7.1f} Mo" if children else ""))
+    return results
+
+
+# =============================================================================
+# HISTORIQUE ET COMPARAISON
+# =============================================================================
+
+def git_revision():
+    """(commit courant, arbre modifié) ou (None, None) hors dépôt git"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True,
+                                text=True, check=True).stdout.strip()
+        status = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                                capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return commit, bool(status.strip())
+
+
+def load_history(path=HISTORY_FILE):
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def append_history(results, path=HISTORY_FILE):
+    """Ajoute une entrée (commit, machine, résultats) à l'historique JSON"""
+    commit, dirty = git_revision()
+    entry = {
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "dirty": dirty,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "results": results,
+    }
+    history = load_history(path)
+    history.append(entry)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(history, f, ensure_ascii=False, indent=2)
+    return entry
+
+
+def find_entry(history, revision):
+    """Dernière entrée dont le commit commence par `revision`"""
+    for entry in reversed(history):
+        if entry["commit"] and entry["commit"].startswith(revision):
+            return entry
+    raise ValueError(f"Aucune mesure pour le commit {revision} dans l'historique")
+
+
+def compare_entries(base, head, tolerance=REGRESSION_TOLERANCE):
+    """
+    Compare deux entrées d'historique cas par cas
+
+    Returns:
+        list de dict: benchmark, base_s, head_s, change_pct, regression
+    """
+    rows = []
+    for key, result in head["results"].items():
+        if key not in base["results"]:
+            continue
+        before, after = base["results"][key]["median_s"], result["median_s"]
+        rows.append({
+            "benchmark": key,
+            "base_s": before,
+            "head_s": after,
+            "change_pct": 100 * (after / before - 1),
+            "regression": after > before * (1 + tolerance),
+        })
+    return rows
+
+
+# =============================================================================
+# POINT D'ENTRÉE
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks modèle, mobilité et présentation")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="cas à lancer")
+    parser.add_argument("--scales", nargs="+", type=int, default=list(SCALES))
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--history", default=HISTORY_FILE)
+    parser.add_argument("--compare", nargs="*", metavar="COMMIT",
+                        help="compare deux commits de l'historique (défaut: deux dernières entrées)")
+    parser.add_argument("--tolerance", type=float, default=REGRESSION_TOLERANCE)
+    args = parser.parse_args()
+
+    if args.compare is not None:
+        history = load_history(args.history)
+        if len(args.compare) == 2:
+            try:
+                base, head = (find_entry(history, revision) for revision in args.compare)
+            except ValueError as error:
+                parser.error(str(error))
+        elif not args.compare and len(history) >= 2:
+            base, head = history[-2], history[-1]
+        else:
+            parser.error("--compare attend deux commits, ou rien avec au moins deux entrées")
+
+        print(f"📊 {(base['commit'] or '?')[:10]} -> {(head['commit'] or '?')[:10]} "
+              f"(tolérance {args.tolerance:.0%})")
+        rows = compare_entries(base, head, args.tolerance)
+        for row in rows:
+            flag = "⚠️ " if row["regression"] else "  "
+            print(f"{flag}{row['benchmark']:<22} {row['base_s'] * 1000:>10.2f} -> "
+                  f"{row['head_s'] * 1000:>10.2f} ms ({row['change_pct']:+.1f}%)")
+        regressions = [row for row in rows if row["regression"]]
+        if regressions:
+            print(f"\n❌ {len(regressions)} régression(s)")
+            sys.exit(1)
+        print("\n✅ Aucune régression")
+        return
+
+    print(f"⏱️  Benchmarks (échelles {', '.join(map(str, args.scales))}, "
+          f"{args.repeat} mesures):")
+    results = run_suite(args.only, args.scales, args.repeat)
+    entry = append_history(results, args.history)
+    print(f"\n📝 {len(results)} cas ajoutés à {args.history} "
+          f"(commit {(entry['commit'] or '?')[:10]}{', modifié' if entry['dirty'] else ''})")
+
+
+if __name__ == "__main__":
+    main()
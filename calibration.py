@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+Calibration des paramètres SEIR (beta, sigma, gamma, mu) sur des épidémies passées
+
+Ajuste les paramètres de MetapopulationSEIR à une série de cas actifs
+observés, nationale ou restreinte à un groupe de zones (district, ville).
+
+- Modèle direct vectorisé: P jeux de paramètres sont simulés ensemble,
+  compartiments en tableaux (P, N), un seul produit matriciel par jour.
+- Recherche par entropie croisée (lots de BATCH_SIZE candidats en espace
+  log), affinée par Nelder-Mead si scipy est installé.
+- Redémarrages indépendants répartis sur les cœurs (graines dérivées de
+  `seed`: un même appel donne toujours le même résultat).
+- Évaluations de la fonction objectif mises en cache par jeu de paramètres.
+
+Le résultat est écrit dans un fichier JSON lu par seir_engine.load_params
+(moteur, ensemble et générateur de présentation).
+
+Format des observations (CSV):
+    date, cases            série nationale
+    date, zone, cases      série par zone (id ou nom de ville)
+
+Usage:
+    python calibration.py observations.csv
+    python calibration.py observations.csv --district Savanes --restarts 16
+"""
+
+import argparse
+import datetime
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from cities import load_cities
+from mobility import build_mobility_matrix
+from seir_engine import (
+    CALIBRATION_FILE,
+    DEFAULT_PARAMS,
+    START_DATE,
+    MetapopulationSEIR,
+    load_params,
+)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+PARAM_NAMES = ("beta", "sigma", "gamma", "mu")
+
+# Bornes plausibles (COVID-19, Dengue)
+PARAM_BOUNDS = {
+    "beta": (0.05, 1.5),
+    "sigma": (1 / 14, 1 / 2),     # Latence de 2 à 14 jours
+    "gamma": (1 / 30, 1 / 3),     # Infectiosité de 3 à 30 jours
+    "mu": (1e-6, 1e-2),
+}
+LOG_LOW = np.log([PARAM_BOUNDS[name][0] for name in PARAM_NAMES])
+LOG_HIGH = np.log([PARAM_BOUNDS[name][1] for name in PARAM_NAMES])
+
+BATCH_SIZE = 128            # Candidats simulés ensemble par itération
+ELITE_FRACTION = 0.125      # Part des meilleurs candidats conservés
+CEM_ITERATIONS = 25         # Itérations de l'entropie croisée par redémarrage
+POLISH_EVALUATIONS = 300    # Évaluations maximum de Nelder-Mead
+DEFAULT_RESTARTS = 8
+CACHE_DECIMALS = 6          # Arrondi (espace log) des clés du cache
+
+# État d'un worker de calibration (initialisé une fois par processus)
+_worker = {}
+
+# =============================================================================
+# OBSERVATIONS
+# =============================================================================
+
+def load_observations(path, cities, zone_ids=None, start_date=START_DATE):
+    """
+    Charge une série de cas actifs observés
+
+    Args:
+        zone_ids: identifiants de zones à retenir (colonne `zone` requise)
+    Returns:
+        (days, cases, zones): jours depuis `start_date` (D,), cas agrégés
+        (D,) et masque (N,) des zones observées
+    """
+    frame = pd.read_csv(path, parse_dates=["date"])
+    zones = np.ones(len(cities), dtype=bool)
+
+    if "zone" in frame:
+        name_to_id = {city["name"]: city["id"] for city in cities}
+        frame["zone"] = frame["zone"].map(lambda z: name_to_id.get(z, z))
+        if zone_ids is not None:
+            frame = frame[frame["zone"].isin(zone_ids)]
+        observed = set(frame["zone"])
+        zones = np.array([city["id"] in observed for city in cities])
+    elif zone_ids is not None:
+        raise ValueError(f"{path}: colonne 'zone' requise pour un ajustement par zone")
+
+    series = frame.groupby("date")["cases"].sum()
+    days = (series.index - pd.Timestamp(start_date)).days.to_numpy()
+    keep = days >= 0
+    if not keep.any():
+        raise ValueError(f"{path}: aucune observation après le {start_date}")
+    return days[keep], series.to_numpy(dtype=float)[keep], zones
+
+
+# =============================================================================
+# FONCTION OBJECTIF
+# =============================================================================
+
+class CalibrationObjective:
+    """
+    Erreur quadratique moyenne en log(1 + cas) entre modèle et observations
+
+    Les paramètres candidats s'appliquent aux zones `fit_zones`; les autres
+    gardent `base_params`. Les candidats sont évalués par lots en espace log.
+    """
+
+    def __init__(self, cities, mobility, days, cases, observed_zones=None,
+                 fit_zones=None, base_params=None, seed=0):
+        model = MetapopulationSEIR(cities, mobility, seed=seed)
+        n_zones = len(cities)
+
+        self.initial = model.state
+        self.population = model.population
+        self.mobility_t = model.mobility_t
+        self.days = np.asarray(days)
+        self.log_cases = np.log1p(np.asarray(cases, dtype=float))
+
+        all_zones = np.ones(n_zones, dtype=bool)
+        self.observed_zones = all_zones if observed_zones is None else observed_zones
+        self.fit_zones = all_zones if fit_zones is None else fit_zones
+        base = {**DEFAULT_PARAMS, **(base_params or {})}
+        self.base = np.stack([np.broadcast_to(base[name], n_zones) for name in PARAM_NAMES])
+
+        self._cache = {}
+        self.evaluations = 0
+        self.cache_hits = 0
+
+    def simulate(self, params):
+        """
+        Cas actifs des zones observées aux jours observés
+
+        Args:
+            params: np.ndarray (P, 4) dans l'ordre PARAM_NAMES
+        Returns:
+            np.ndarray (P, D)
+        """
+        n_sets = len(params)
+        beta, sigma, gamma, mu = (
+            np.where(self.fit_zones, params[:, [k]], self.base[k])
+            for k in range(len(PARAM_NAMES))
+        )
+        S, E, I = (np.repeat(row[None, :], n_sets, axis=0) for row in self.initial[:3])
+
+        slots = {day: k for k, day in enumerate(self.days)}
+        active = np.empty((n_sets, len(self.days)))
+        if 0 in slots:
+            active[:, slots[0]] = I[:, self.observed_zones].sum(axis=1)
+
+        for day in range(1, int(self.days.max()) + 1):
+            new_exposed = beta * S * I / self.population
+            new_infected = sigma * E
+            new_recovered = gamma * I
+            imported = mu * (self.mobility_t @ (I / self.population).T).T
+
+            S = np.maximum(0, S - new_exposed)
+            E = np.maximum(0, E + new_exposed - new_infected)
+            I = np.maximum(0, I + new_infected - new_recovered + imported)
+            if day in slots:
+                active[:, slots[day]] = I[:, self.observed_zones].sum(axis=1)
+        return active
+
+    def __call__(self, theta):
+        """Pertes (P,) pour des candidats (P, 4) en log-paramètres (mis en cache)"""
+        theta = np.atleast_2d(theta)
+        keys = [tuple(np.round(row, CACHE_DECIMALS)) for row in theta]
+        missing = sorted({key for key in keys if key not in self._cache})
+        self.cache_hits += len(keys) - len(missing)
+
+        if missing:
+            active = self.simulate(np.exp(np.array(missing)))
+            errors = (np.log1p(active) - self.log_cases) ** 2
+            losses = np.nan_to_num(errors.mean(axis=1), nan=np.inf)
+            self._cache.update(zip(missing, losses))
+            self.evaluations += len(missing)
+        return np.array([self._cache[key] for key in keys])
+
+
+# =============================================================================
+# OPTIMISATION
+# =============================================================================
+
+def cross_entropy_search(objective, rng, iterations=CEM_ITERATIONS, batch_size=BATCH_SIZE):
+    """Recherche par entropie croisée dans les bornes (espace log)"""
+    n_elite = max(2, int(batch_size * ELITE_FRACTION))
+    mean = rng.uniform(LOG_LOW, LOG_HIGH)
+    std = (LOG_HIGH - LOG_LOW) / 2
+    best_theta, best_loss = mean, np.inf
+
+    for _ in range(iterations):
+        theta = np.clip(rng.normal(mean, std, (batch_size, len(PARAM_NAMES))),
+                        LOG_LOW, LOG_HIGH)
+        losses = objective(theta)
+        order = np.argsort(losses)
+        if losses[order[0]] < best_loss:
+            best_theta, best_loss = theta[order[0]], losses[order[0]]
+        elite = theta[order[:n_elite]]
+        mean, std = elite.mean(axis=0), elite.std(axis=0) + 1e-3
+    return best_theta, best_loss
+
+
+def polish(objective, theta):
+    """Affine un optimum par Nelder-Mead (ignoré si scipy est absent)"""
+    try:
+        from scipy.optimize import minimize
+    except ImportError:
+        return theta, objective(theta)[0]
+
+    result = minimize(
+        lambda t: objective(np.clip(t, LOG_LOW, LOG_HIGH))[0], theta,
+        method="Nelder-Mead",
+        options={"maxfev": POLISH_EVALUATIONS, "xatol": 1e-4, "fatol": 1e-8},
+    )
+    theta = np.clip(result.x, LOG_LOW, LOG_HIGH)
+    return theta, objective(theta)[0]
+
+
+def _init_worker(cities, mobility, days, cases, observed_zones, fit_zones, base_params, seed):
+    """Initialise un worker: une fonction objectif (et son cache) par processus"""
+    _worker["objective"] = CalibrationObjective(
+        cities, mobility, days, cases, observed_zones, fit_zones, base_params, seed,
+    )
+
+
+def _run_restart(seed_seq):
+    """Tâche worker: un redémarrage complet (entropie croisée + affinage)"""
+    objective = _worker["objective"]
+    evaluations, cache_hits = objective.evaluations, objective.cache_hits
+    theta, _ = cross_entropy_search(objective, np.random.default_rng(seed_seq))
+    theta, loss = polish(objective, theta)
+    return (theta, loss, objective.evaluations - evaluations,
+            objective.cache_hits - cache_hits)
+
+
+def calibrate(cities, days, cases, observed_zones=None, fit_zones=None,
+              base_params=None, start_date=START_DATE, restarts=DEFAULT_RESTARTS,
+              seed=0, n_workers=None):
+    """
+    Ajuste beta, sigma, gamma et mu à une série de cas actifs
+
+    Args:
+        days, cases: observations (voir load_observations)
+        observed_zones: masque (N,) des zones dont les cas sont observés
+        fit_zones: masque (N,) des zones auxquelles s'appliquent les
+            paramètres ajustés (toutes par défaut)
+        base_params: paramètres des autres zones (défaut: DEFAULT_PARAMS)
+    Returns:
+        dict: params, loss, restarts, evaluations, cache_hits, seconds
+    """
+    start = time.perf_counter()
+    mobility = build_mobility_matrix(cities, start_date)
+    seeds = np.random.SeedSequence(seed).spawn(restarts)
+
+    with ProcessPoolExecutor(
+        max_workers=n_workers or os.cpu_count(),
+        initializer=_init_worker,
+        initargs=(cities, mobility, days, cases, observed_zones, fit_zones, base_params, seed),
+    ) as pool:
+        outcomes = list(pool.map(_run_restart, seeds))
+
+    theta, loss, _, _ = min(outcomes, key=lambda outcome: outcome[1])
+    return {
+        "params": {name: float(value) for name, value in zip(PARAM_NAMES, np.exp(theta))},
+        "loss": float(loss),
+        "restarts": restarts,
+        "evaluations": sum(outcome[2] for outcome in outcomes),
+        "cache_hits": sum(outcome[3] for outcome in outcomes),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+# =============================================================================
+# FICHIER DE PARAMÈTRES
+# =============================================================================
+
+def save_calibration(result, path=CALIBRATION_FILE, label=None, zone_ids=None,
+                     start_date=START_DATE):
+    """
+    Enregistre un ajustement dans le fichier de paramètres
+
+    Sans `label`, l'ajustement devient les paramètres nationaux; sinon il
+    est ajouté (ou remplacé) sous "zones" pour les zones `zone_ids`.
+    """
+    calibration = {"national": {}, "zones": {}}
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            calibration = json.load(f)
+
+    entry = {
+        "params": result["params"],
+        "loss": result["loss"],
+        "start_date": start_date.isoformat(),
+        "fitted_at": datetime.datetime.now().isoformat(timespec="seconds"),
+    }
+    if label is None:
+        calibration["national"] = entry
+    else:
+        calibration.setdefault("zones", {})[label] = {**entry, "zone_ids": list(zone_ids)}
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(calibration, f, ensure_ascii=False, indent=2)
+    return path
+
+
+# =============================================================================
+# POINT D'ENTRÉE
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibration des paramètres SEIR")
+    parser.add_argument("observations", help="CSV date, [zone,] cases")
+    parser.add_argument("--zone", nargs="+", metavar="ID",
+                        help="ajuste les paramètres de ces zones seulement")
+    parser.add_argument("--district", help="ajuste les paramètres d'un district")
+    parser.add_argument("--restarts", type=int, default=DEFAULT_RESTARTS)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=CALIBRATION_FILE, help="fichier de paramètres")
+    args = parser.parse_args()
+
+    cities = load_cities()
+    label, zone_ids = None, None
+    if args.district:
+        label = args.district
+        zone_ids = [c["id"] for c in cities if c["district"] == args.district]
+    elif args.zone:
+        label = ",".join(args.zone)
+        zone_ids = args.zone
+
+    days, cases, observed = load_observations(args.observations, cities, zone_ids)
+    fit_zones = None
+    base_params = None
+    if label is not None:
+        fit_zones = observed
+        if os.path.exists(args.out):
+            base_params = load_params(args.out)
+        # Seules les zones présentes dans le CSV sont ajustées: les autres
+        # zones demandées gardent les paramètres nationaux
+        fitted_ids = [city["id"] for city, fitted in zip(cities, observed) if fitted]
+        if not fitted_ids:
+            parser.error(f"{args.observations}: aucune observation pour les zones demandées")
+        missing = [zone_id for zone_id in zone_ids if zone_id not in fitted_ids]
+        if missing:
+            print(f"⚠️  {len(missing)} zone(s) sans observation, non ajustée(s): "
+                  f"{', '.join(missing)}")
+        zone_ids = fitted_ids
+
+    print(f"🎯 Calibration sur {len(days)} jours observés, "
+          f"{int(observed.sum())} zone(s), {args.restarts} redémarrages...")
+    result = calibrate(cities, days, cases, observed, fit_zones, base_params,
+                       restarts=args.restarts, seed=args.seed, n_workers=args.workers)
+    save_calibration(result, args.out, label, zone_ids)
+
+    params = ", ".join(f"{name}={value:.4g}" for name, value in result["params"].items())
+    print(f"✅ {params} (erreur {result['loss']:.4f})")
+    print(f"   {result['evaluations']:,} évaluations ({result['cache_hits']:,} en cache) "
+          f"en {result['seconds']:.1f} s -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
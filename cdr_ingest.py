@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Ingestion en flux des CDR (Call Detail Records) -> matrices origine-destination
+
+Pipeline de générateurs: lecture par blocs (CSV ou Parquet), rattachement
+des antennes aux zones (30 villes ou 393 sous-préfectures), détection des
+déplacements (deux enregistrements consécutifs d'un abonné dans deux zones
+différentes) et accumulation des comptes OD quotidiens.
+
+La mémoire est bornée: seuls un bloc de CDR, la dernière zone connue de
+chaque abonné (tableaux triés de taille fixe par abonné) et une matrice
+N × N par jour sont conservés. Les fichiers peuvent donc dépasser la RAM.
+
+Format attendu:
+    CDR:      subscriber_id, timestamp, cell_id
+    antennes: cell_id, lat, lon
+
+Usage:
+    python cdr_ingest.py --towers antennes.csv cdr_*.csv --out od/
+    python cdr_ingest.py --towers antennes.csv cdr_*.csv --out od/ --k 50
+"""
+
+import argparse
+import datetime
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from cities import load_cities, zone_column
+from geo import ZoneIndex
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+CHUNK_SIZE = 1_000_000          # Enregistrements par bloc
+CDR_COLUMNS = ("subscriber_id", "timestamp", "cell_id")
+NS_PER_DAY = 86_400 * 10**9
+
+# =============================================================================
+# LECTURE PAR BLOCS
+# =============================================================================
+
+def read_cdr_chunks(path, chunk_size=CHUNK_SIZE):
+    """Générateur de blocs (DataFrame) d'un fichier CDR CSV ou Parquet"""
+    if path.endswith(".parquet"):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError(
+                f"pyarrow est requis pour lire {path} (pip install pyarrow)"
+            )
+        parquet = pq.ParquetFile(path)
+        for batch in parquet.iter_batches(batch_size=chunk_size, columns=list(CDR_COLUMNS)):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(
+            path, usecols=list(CDR_COLUMNS), chunksize=chunk_size,
+            dtype={"subscriber_id": str, "cell_id": str},
+        )
+
+
+# =============================================================================
+# ANTENNES -> ZONES
+# =============================================================================
+
+def nearest_zone(lat, lon, cities):
+    """Indice de la zone la plus proche (Haversine) pour chaque point"""
+    return ZoneIndex.load(cities).nearest(lat, lon)[0]
+
+
+class TowerMap:
+    """Table antenne -> indice de zone, interrogée par blocs entiers"""
+
+    def __init__(self, cell_ids, zone_idx):
+        self.index = pd.Index(np.asarray(cell_ids).astype(str))
+        self.zone_idx = np.asarray(zone_idx, dtype=np.int32)
+
+    @classmethod
+    def from_csv(cls, path, cities):
+        """Charge les antennes (cell_id, lat, lon) et les rattache aux zones"""
+        towers = pd.read_csv(path, dtype={"cell_id": str})
+        return cls(towers["cell_id"], nearest_zone(towers["lat"], towers["lon"], cities))
+
+    def lookup(self, cell_ids):
+        """Indices de zone des antennes (-1 si antenne inconnue)"""
+        position = self.index.get_indexer(np.asarray(cell_ids).astype(str))
+        return np.where(position >= 0, self.zone_idx[position], -1)
+
+
+def new_salt():
+    """Sel aléatoire de 16 caractères pour le hachage des abonnés"""
+    return os.urandom(8).hex()
+
+
+def hash_identifiers(identifiers, salt):
+    """
+    Hache (avec sel) des identifiants d'abonnés en entiers 64 bits
+
+    Sans le sel, qui n'est jamais écrit sur disque, les empreintes ne
+    peuvent pas être rapprochées des numéros d'origine par dictionnaire.
+    """
+    return pd.util.hash_array(np.asarray(identifiers, dtype=object), hash_key=salt)
+
+
+def map_to_zones(chunks, tower_map, stats, salt):
+    """
+    Étape du pipeline: bloc CDR -> (abonné haché, instant en ns, zone)
+
+    Les identifiants d'abonnés sont hachés immédiatement et ne sont pas
+    conservés; les enregistrements d'antennes inconnues sont écartés.
+    """
+    for chunk in chunks:
+        zone = tower_map.lookup(chunk["cell_id"].to_numpy())
+        known = zone >= 0
+        stats["records"] += len(chunk)
+        stats["dropped"] += int((~known).sum())
+
+        subscriber = hash_identifiers(chunk["subscriber_id"].to_numpy(), salt)[known]
+        timestamp = pd.to_datetime(chunk["timestamp"]).to_numpy("datetime64[ns]")
+        yield subscriber, timestamp.astype(np.int64)[known], zone[known]
+
+
+# =============================================================================
+# ACCUMULATION OD
+# =============================================================================
+
+class TripDetector:
+    """
+    Détection des déplacements entre blocs successifs
+
+    Garde la dernière zone connue de chaque abonné pour relier les blocs
+    successifs. Les fichiers sont supposés (grossièrement) ordonnés dans le
+    temps.
+
+    L'état est une liste de séries triées (clés hachées, zones), chacune au
+    moins deux fois plus grande que la suivante: les abonnés nouveaux d'un
+    bloc forment une série, fusionnée avec les dernières tant que celles-ci
+    ne font pas le double de sa taille (méthode logarithmique). Un bloc ne
+    recopie donc pas tout l'état: chaque clé est fusionnée O(log abonnés)
+    fois sur tout le flux, et la recherche se fait dans O(log abonnés) séries.
+    """
+
+    def __init__(self):
+        self._runs = []  # [(clés triées np.uint64, zones np.int32)], plus grande en tête
+
+    def _add_run(self, keys, zone):
+        """Ajoute des abonnés nouveaux (clés triées), fusionne les petites séries"""
+        while self._runs and len(self._runs[-1][0]) < 2 * len(keys):
+            run_keys, run_zone = self._runs.pop()
+            keys = np.concatenate([run_keys, keys])
+            zone = np.concatenate([run_zone, zone])
+            order = np.argsort(keys, kind="stable")
+            keys, zone = keys[order], zone[order]
+        if len(keys):
+            self._runs.append((keys, zone))
+
+    def detect(self, subscriber, time_ns, zone):
+        """
+        Déplacements d'un bloc d'enregistrements
+
+        Returns:
+            (subscriber, time_ns, origin, dest): tableaux alignés, un élément
+            par déplacement (zone d'arrivée différente de la zone de départ)
+        """
+        if len(subscriber) == 0:
+            empty = np.empty(0, dtype=np.int32)
+            return np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.int64), empty, empty
+
+        order = np.lexsort((time_ns, subscriber))
+        subscriber, time_ns, zone = subscriber[order], time_ns[order], zone[order]
+
+        # Transitions à l'intérieur du bloc
+        same = subscriber[1:] == subscriber[:-1]
+
+        # Premier / dernier enregistrement de chaque abonné du bloc
+        first = np.r_[True, ~same]
+        last = np.r_[~same, True]
+        keys = subscriber[first]
+        last_zone = zone[last]
+
+        # Raccord avec la dernière position connue (blocs précédents); chaque
+        # clé est dans une seule série, mise à jour en place
+        found = np.zeros(len(keys), dtype=bool)
+        previous = np.empty(len(keys), dtype=np.int32)
+        for run_keys, run_zone in self._runs:
+            pos = np.searchsorted(run_keys, keys)
+            hit = pos < len(run_keys)
+            hit[hit] = run_keys[pos[hit]] == keys[hit]
+            previous[hit] = run_zone[pos[hit]]
+            run_zone[pos[hit]] = last_zone[hit]
+            found |= hit
+
+        trips = (
+            np.r_[subscriber[1:][same], keys[found]],
+            np.r_[time_ns[1:][same], time_ns[first][found]],
+            np.r_[zone[:-1][same], previous[found]],
+            np.r_[zone[1:][same], zone[first][found]],
+        )
+        self._add_run(keys[~found], last_zone[~found])
+
+        moved = trips[2] != trips[3]
+        return tuple(column[moved] for column in trips)
+
+
+class ODAccumulator:
+    """Comptes de déplacements origine -> destination par jour"""
+
+    def __init__(self, n_zones):
+        self.n_zones = n_zones
+        self.counts = {}  # jour (entier depuis l'epoch) -> np.ndarray (N, N)
+
+    def _add_counts(self, key, flat_cells):
+        """Ajoute des cellules (origine × N + destination) à la matrice `key`"""
+        counts = np.bincount(flat_cells, minlength=self.n_zones ** 2)
+        if key not in self.counts:
+            self.counts[key] = np.zeros((self.n_zones, self.n_zones), dtype=np.int64)
+        self.counts[key] += counts.reshape(self.n_zones, self.n_zones)
+
+    def add_trips(self, subscriber, time_ns, origin, dest):
+        """Ajoute des déplacements (tableaux alignés) aux matrices quotidiennes"""
+        day = time_ns // NS_PER_DAY
+        flat = origin.astype(np.int64) * self.n_zones + dest
+        for d in np.unique(day):
+            self._add_counts(int(d), flat[day == d])
+
+    def finalize(self):
+        """Fin de flux (rien à vider pour les comptes bruts)"""
+
+    @property
+    def days(self):
+        """Jours couverts, sous forme de datetime.date"""
+        epoch = datetime.date(1970, 1, 1)
+        return [epoch + datetime.timedelta(days=d) for d in sorted(self.counts)]
+
+    def matrix(self, day):
+        """Matrice OD (N, N) float d'un jour, consommable par le moteur SEIR"""
+        key = (day - datetime.date(1970, 1, 1)).days
+        counts = self.counts.get(key)
+        if counts is None:
+            return np.zeros((self.n_zones, self.n_zones))
+        return counts.astype(float)
+
+    def mean_matrix(self):
+        """Matrice OD quotidienne moyenne sur tous les jours ingérés"""
+        if not self.counts:
+            return np.zeros((self.n_zones, self.n_zones))
+        return sum(self.counts.values()) / len(self.counts)
+
+    def save(self, output_dir):
+        """Écrit une matrice od_AAAA-MM-JJ.npy par jour"""
+        os.makedirs(output_dir, exist_ok=True)
+        paths = []
+        for day in self.days:
+            path = os.path.join(output_dir, f"od_{day.isoformat()}.npy")
+            np.save(path, self.matrix(day))
+            paths.append(path)
+        return paths
+
+
+# =============================================================================
+# PIPELINE
+# =============================================================================
+
+def ingest_cdr(paths, tower_map, n_zones, chunk_size=CHUNK_SIZE,
+               accumulator=None, salt=None):
+    """
+    Ingère une liste de fichiers CDR
+
+    Args:
+        accumulator: étape d'accumulation des déplacements (défaut:
+            ODAccumulator brut; voir anonymisation.KAnonymousAccumulator)
+        salt: sel du hachage des abonnés (défaut: aléatoire à chaque appel)
+    Returns:
+        (accumulator, stats): stats contient records, dropped, trips,
+        seconds et records_per_second
+    """
+    stats = {"records": 0, "dropped": 0, "trips": 0}
+    accumulator = accumulator if accumulator is not None else ODAccumulator(n_zones)
+    detector = TripDetector()
+    salt = salt or new_salt()
+
+    start = time.perf_counter()
+    for path in paths:
+        for subscriber, time_ns, zone in map_to_zones(
+            read_cdr_chunks(path, chunk_size), tower_map, stats, salt
+        ):
+            trips = detector.detect(subscriber, time_ns, zone)
+            stats["trips"] += len(trips[0])
+            accumulator.add_trips(*trips)
+    accumulator.finalize()
+    stats["seconds"] = time.perf_counter() - start
+    stats["records_per_second"] = (
+        stats["records"] / stats["seconds"] if stats["seconds"] > 0 else 0.0
+    )
+    return accumulator, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingestion CDR -> matrices OD")
+    parser.add_argument("cdr", nargs="+", help="fichiers CDR (.csv ou .parquet)")
+    parser.add_argument("--towers", required=True, help="antennes: cell_id, lat, lon")
+    parser.add_argument("--out", default="od", help="dossier des matrices .npy")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--k", type=int, default=None,
+                        help="k-anonymat: supprime les flux de moins de k personnes")
+    args = parser.parse_args()
+
+    cities = load_cities()
+    tower_map = TowerMap.from_csv(args.towers, cities)
+
+    accumulator = None
+    if args.k:
+        from anonymisation import KAnonymousAccumulator
+        zone_groups = np.unique(zone_column(cities, "district"), return_inverse=True)[1]
+        accumulator = KAnonymousAccumulator(len(cities), k=args.k, zone_groups=zone_groups)
+
+    accumulator, stats = ingest_cdr(
+        args.cdr, tower_map, len(cities), args.chunk_size, accumulator
+    )
+    paths = accumulator.save(args.out)
+
+    print(f"✅ {stats['records']:,} enregistrements en {stats['seconds']:.1f} s "
+          f"({stats['records_per_second']:,.0f} enr./s)")
+    print(f"   {stats['trips']:,} déplacements, {stats['dropped']:,} écartés "
+          f"(antenne inconnue), {len(paths)} fichier(s) dans {args.out}/")
+    if args.k:
+        report = accumulator.suppression_report()
+        print(f"🔒 k={args.k}: {report['cells_published']:,} flux publiés, "
+              f"{report['cells_coarsened']:,} regroupés par district, "
+              f"{report['cells_suppressed']:,} supprimés "
+              f"({report['suppressed_pct']}% des personnes)")
+
+
+if __name__ == "__main__":
+    main()
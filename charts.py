@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Graphiques PowerPoint natifs construits depuis les tableaux NumPy
+
+Remplace les captures d'écran du dashboard (MultiCityEvolutionChart,
+RiskHeatmap) par de vrais graphiques DrawingML: courbes d'évolution et
+histogrammes.
+
+Les graphiques passent par l'API publique de python-pptx
+(`slide.shapes.add_chart` + CategoryChartData): le classeur Excel des
+données est embarqué, "Modifier les données" fonctionne dans PowerPoint,
+et rien ne dépend des parties internes de python-pptx. La mise en forme
+(couleurs de la charte, épaisseur des courbes, axes) est appliquée ensuite
+sur les objets du graphique.
+"""
+
+import numpy as np
+from pptx.chart.data import CategoryChartData
+from pptx.dml.color import RGBColor
+from pptx.enum.chart import XL_CHART_TYPE, XL_LEGEND_POSITION, XL_MARKER_STYLE
+from pptx.util import Pt
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# Palette des séries (orange CI en premier, puis couleurs contrastées)
+SERIES_COLORS = (
+    "FA7E19", "000000", "1F77B4", "2CA02C", "D62728",
+    "9467BD", "8C564B", "E377C2", "7F7F7F", "17BECF",
+)
+FONT_SIZE = Pt(10)          # Taille des libellés
+TITLE_SIZE = Pt(12)
+LINE_WIDTH = Pt(1.5)        # Épaisseur des courbes
+MARKER_SIZE = 3
+GRIDLINE_COLOR = "D9D9D9"
+
+CHART_TYPES = {
+    "line": XL_CHART_TYPE.LINE_MARKERS,
+    "bar": XL_CHART_TYPE.COLUMN_CLUSTERED,
+}
+LEGEND_POSITIONS = {
+    "r": XL_LEGEND_POSITION.RIGHT,
+    "b": XL_LEGEND_POSITION.BOTTOM,
+    "t": XL_LEGEND_POSITION.TOP,
+    "l": XL_LEGEND_POSITION.LEFT,
+}
+
+# =============================================================================
+# DONNÉES
+# =============================================================================
+
+def category_data(categories, series):
+    """
+    Données d'un graphique (classeur embarqué compris)
+
+    Args:
+        categories: libellés de l'axe des abscisses (T,)
+        series: dict nom -> valeurs (T,)
+    Returns:
+        CategoryChartData
+    """
+    data = CategoryChartData(number_format="#,##0")
+    data.categories = [str(category) for category in categories]
+    for name, values in series.items():
+        data.add_series(str(name), np.asarray(values, dtype=float).tolist())
+    return data
+
+
+# =============================================================================
+# INSERTION DANS UNE SLIDE
+# =============================================================================
+
+def _style_series(chart, kind):
+    """Couleurs de la charte, courbes fines et marqueurs discrets"""
+    for k, series in enumerate(chart.plots[0].series):
+        color = RGBColor.from_string(SERIES_COLORS[k % len(SERIES_COLORS)])
+        if kind == "line":
+            series.smooth = False
+            series.format.line.color.rgb = color
+            series.format.line.width = LINE_WIDTH
+            series.marker.style = XL_MARKER_STYLE.CIRCLE
+            series.marker.size = MARKER_SIZE
+            series.marker.format.fill.solid()
+            series.marker.format.fill.fore_color.rgb = color
+            series.marker.format.line.color.rgb = color
+        else:
+            series.invert_if_negative = False
+            series.format.fill.solid()
+            series.format.fill.fore_color.rgb = color
+
+
+def add_chart(slide, kind, categories, series, left, top, width, height,
+              title=None, legend="r"):
+    """
+    Ajoute un graphique natif à une slide
+
+    Args:
+        kind: "line" (courbes) ou "bar" (histogramme vertical)
+        categories: libellés de l'axe des abscisses (T,)
+        series: dict nom -> valeurs (T,)
+        title: titre du graphique (optionnel)
+        legend: position de la légende ("r", "b", "t", "l") ou None
+    Returns:
+        GraphicFrame python-pptx
+    """
+    if kind not in CHART_TYPES:
+        raise ValueError(f"Type de graphique inconnu: {kind}")
+
+    graphic_frame = slide.shapes.add_chart(
+        CHART_TYPES[kind], left, top, width, height, category_data(categories, series)
+    )
+    chart = graphic_frame.chart
+    chart.font.size = FONT_SIZE
+
+    chart.has_title = bool(title)
+    if title:
+        chart.chart_title.text_frame.text = title
+        run_font = chart.chart_title.text_frame.paragraphs[0].runs[0].font
+        run_font.size = TITLE_SIZE
+        run_font.bold = True
+
+    chart.has_legend = legend is not None
+    if legend is not None:
+        chart.legend.position = LEGEND_POSITIONS[legend]
+        chart.legend.include_in_layout = False
+
+    if kind == "bar":
+        chart.plots[0].gap_width = 50
+    _style_series(chart, kind)
+
+    value_axis = chart.value_axis
+    value_axis.has_major_gridlines = True
+    value_axis.major_gridlines.format.line.color.rgb = RGBColor.from_string(GRIDLINE_COLOR)
+    value_axis.tick_labels.number_format = "#,##0"
+    value_axis.tick_labels.number_format_is_linked = False
+    return graphic_frame
@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+Table des zones (villes / sous-préfectures) pour les moteurs Python
+
+Source unique: src/data/ivoryCoastCities.js, relu tel quel pour que le
+dashboard React et les scripts Python partagent les mêmes 30 zones.
+Un générateur synthétique permet de monter à l'échelle des 393
+sous-préfectures (voir info2.md) avec le même schéma.
+
+La table est compilée en un registre binaire colonnaire (ZoneRegistry):
+un tableau structuré NumPy (.npy, ouvert en np.memmap, sans copie) avec
+des indices de zone entiers et des codes entiers pour région, district et
+type urbain; les chaînes (identifiants, noms, tables de régions et de
+districts) sont dans un fichier JSON voisin (`<path>.json`). Le registre
+du fichier JS est mis en cache sous .cache/zones, indexé par le hash du
+source et du format des colonnes (ZONE_DTYPE): les chargements suivants
+prennent quelques millisecondes.
+
+Un registre se parcourt comme l'ancienne liste de dicts (mêmes clés que
+le JS); les moteurs lisent directement ses colonnes (zone_column).
+"""
+
+import hashlib
+import json
+import os
+import re
+
+import numpy as np
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+CITIES_JS = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "src", "data", "ivoryCoastCities.js"
+)
+
+# Cache disque des registres compilés depuis le JS
+ZONES_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), ".cache", "zones"
+)
+
+# Emprise approximative de la Côte d'Ivoire [lat_min, lat_max, lon_min, lon_max]
+IVORY_COAST_BBOX = (4.4, 10.7, -8.6, -2.5)
+
+# Colonnes numériques du registre (une ligne par zone, index = indice de zone)
+ZONE_DTYPE = np.dtype([
+    ("population", "<i8"),
+    ("centrality", "<i2"),
+    ("lat", "<f8"),
+    ("lon", "<f8"),
+    ("region", "<i2"),          # Indice dans ZoneRegistry.regions
+    ("district", "<i2"),        # Indice dans ZoneRegistry.districts
+    ("urban_type", "<i1"),      # Indice dans ZoneRegistry.urban_types
+    ("is_capital", "?"),
+])
+
+_STRING = r"'((?:[^'\\]|\\.)*)'"
+_NUMBER = r"(-?\d+(?:\.\d+)?)"
+
+# =============================================================================
+# REGISTRE
+# =============================================================================
+
+def _intern(values):
+    """(codes entiers, table des valeurs distinctes dans l'ordre d'apparition)"""
+    table = list(dict.fromkeys(values))
+    index = {value: k for k, value in enumerate(table)}
+    return np.array([index[value] for value in values]), table
+
+
+class ZoneRegistry:
+    """
+    Registre colonnaire des zones
+
+    Attributs principaux:
+        table: tableau structuré (N,) de dtype ZONE_DTYPE (np.memmap si ouvert
+            depuis un fichier)
+        ids, names: identifiants ('CI-AB-PLT'...) et noms, par indice de zone
+        regions, districts, urban_types: tables des chaînes internées
+        descriptions: descriptions par zone (None si absentes)
+
+    Se comporte comme une liste de dicts au schéma de ivoryCoastCities.js
+    (len, indexation, itération), pour le code qui lit zone par zone.
+    """
+
+    def __init__(self, table, ids, names, regions, districts, urban_types, descriptions=None):
+        self.table = table
+        self.ids = list(ids)
+        self.names = list(names)
+        self.regions = list(regions)
+        self.districts = list(districts)
+        self.urban_types = list(urban_types)
+        self.descriptions = None if descriptions is None else list(descriptions)
+        self._index = None
+
+    @classmethod
+    def from_cities(cls, cities):
+        """Compile une liste de dicts (schéma ivoryCoastCities.js)"""
+        table = np.zeros(len(cities), dtype=ZONE_DTYPE)
+        table["population"] = [c["population"] for c in cities]
+        table["centrality"] = [c["centrality"] for c in cities]
+        table["lat"] = [c["coordinates"][0] for c in cities]
+        table["lon"] = [c["coordinates"][1] for c in cities]
+        table["is_capital"] = [c.get("isCapital", False) for c in cities]
+        table["region"], regions = _intern([c["region"] for c in cities])
+        table["district"], districts = _intern([c["district"] for c in cities])
+        table["urban_type"], urban_types = _intern([c.get("urbanType", "") for c in cities])
+        descriptions = None
+        if all("description" in c for c in cities):
+            descriptions = [c["description"] for c in cities]
+        return cls(table, [c["id"] for c in cities], [c["name"] for c in cities],
+                   regions, districts, urban_types, descriptions)
+
+    @classmethod
+    def open(cls, path):
+        """Ouvre un registre écrit par save(), colonnes en np.memmap (lecture seule)"""
+        with open(f"{path}.json", encoding="utf-8") as f:
+            strings = json.load(f)
+        return cls(np.load(path, mmap_mode="r"), strings["ids"], strings["names"],
+                   strings["regions"], strings["districts"], strings["urban_types"],
+                   strings.get("descriptions"))
+
+    def save(self, path):
+        """Écrit le registre (`path` .npy + `path`.json), atomiquement"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        strings = {
+            "ids": self.ids,
+            "names": self.names,
+            "regions": self.regions,
+            "districts": self.districts,
+            "urban_types": self.urban_types,
+            "descriptions": self.descriptions,
+        }
+        for target, write in ((f"{path}.json", lambda f: f.write(
+                                  json.dumps(strings, ensure_ascii=False).encode("utf-8"))),
+                              (path, lambda f: np.save(f, np.asarray(self.table)))):
+            tmp_path = f"{target}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                write(f)
+            os.replace(tmp_path, target)
+        return path
+
+    def __len__(self):
+        return len(self.table)
+
+    def __getitem__(self, key):
+        """Zone `key` en dict (schéma JS); une tranche ou un masque donne un registre"""
+        if isinstance(key, (int, np.integer)):
+            row = self.table[key]
+            k = int(key) % len(self)
+            city = {
+                "id": self.ids[k],
+                "name": self.names[k],
+                "region": self.regions[row["region"]],
+                "district": self.districts[row["district"]],
+                "urbanType": self.urban_types[row["urban_type"]],
+                "population": int(row["population"]),
+                "centrality": int(row["centrality"]),
+                "coordinates": [float(row["lat"]), float(row["lon"])],
+                "isCapital": bool(row["is_capital"]),
+            }
+            if self.descriptions is not None:
+                city["description"] = self.descriptions[k]
+            return city
+
+        rows = np.arange(len(self))[key]
+        return ZoneRegistry(
+            self.table[rows], [self.ids[k] for k in rows], [self.names[k] for k in rows],
+            self.regions, self.districts, self.urban_types,
+            None if self.descriptions is None else [self.descriptions[k] for k in rows],
+        )
+
+    def __iter__(self):
+        return (self[k] for k in range(len(self)))
+
+    def index(self, zone_id):
+        """Indice entier de la zone d'identifiant `zone_id`"""
+        if self._index is None:
+            self._index = {zone_id: k for k, zone_id in enumerate(self.ids)}
+        return self._index[zone_id]
+
+    def column(self, field, dtype=None):
+        """
+        Colonne (N,) d'un champ du schéma JS, sans passer par les dicts
+
+        Numériques: vues du tableau structuré converties en `dtype`;
+        "coordinates" donne (N, 2); région, district... des chaînes.
+        """
+        if field == "coordinates":
+            return np.column_stack([self.table["lat"], self.table["lon"]]).astype(dtype or float)
+        if field in ("region", "district"):
+            return np.array(getattr(self, f"{field}s"))[self.table[field]]
+        if field == "urbanType":
+            return np.array(self.urban_types)[self.table["urban_type"]]
+        if field in ("id", "name", "description"):
+            return np.array(getattr(self, f"{field}s"))
+        column = self.table["is_capital" if field == "isCapital" else field]
+        return column if dtype is None else column.astype(dtype)
+
+    def count(self, field, value):
+        """Nombre de zones dont `field` (région, district...) vaut `value`"""
+        return int(np.count_nonzero(self.column(field) == value))
+
+
+def zone_column(cities, field, dtype=None):
+    """
+    Colonne (N,) d'un champ pour toutes les zones ((N, 2) pour "coordinates")
+
+    Lecture directe des colonnes d'un ZoneRegistry; une liste de dicts est
+    parcourue comme avant.
+    """
+    if isinstance(cities, ZoneRegistry):
+        return cities.column(field, dtype)
+    return np.array([c[field] for c in cities], dtype=dtype)
+
+
+# =============================================================================
+# CHARGEMENT
+# =============================================================================
+
+def _unescape(value):
+    """Retire les échappements JS (\\' ...) d'une chaîne"""
+    return re.sub(r"\\(.)", r"\1", value)
+
+
+def _parse_city(block):
+    """Convertit un objet littéral JS en dict Python (mêmes clés que le JS)"""
+    city = {}
+    for key in ("id", "name", "region", "district", "urbanType", "description"):
+        match = re.search(rf"\b{key}:\s*{_STRING}", block)
+        if match:
+            city[key] = _unescape(match.group(1))
+    for key in ("population", "centrality"):
+        match = re.search(rf"\b{key}:\s*{_NUMBER}", block)
+        if match:
+            city[key] = int(float(match.group(1)))
+    match = re.search(rf"\bcoordinates:\s*\[\s*{_NUMBER}\s*,\s*{_NUMBER}\s*\]", block)
+    if match:
+        city["coordinates"] = [float(match.group(1)), float(match.group(2))]
+    match = re.search(r"\bisCapital:\s*(true|false)", block)
+    city["isCapital"] = bool(match and match.group(1) == "true")
+    return city
+
+
+def parse_cities_js(path=CITIES_JS):
+    """
+    Lit le tableau `ivoryCoastCities` du fichier JS
+
+    Returns:
+        list[dict]: villes avec les clés id, name, region, district,
+        coordinates [lat, lon], population, centrality...
+    """
+    with open(path, encoding="utf-8") as f:
+        source = f.read()
+
+    start = source.index("ivoryCoastCities = [")
+    end = source.index("\n];", start)
+    body = source[start:end]
+
+    blocks = re.findall(r"\{(.*?)\n\s*\}", body, flags=re.S)
+    return [_parse_city(block) for block in blocks if "id:" in block]
+
+
+def load_cities(path=CITIES_JS, cache_dir=ZONES_CACHE_DIR):
+    """
+    Registre des zones du fichier JS (compilé une fois, puis projeté en mémoire)
+
+    Args:
+        path: fichier ivoryCoastCities.js
+        cache_dir: dossier du registre compilé (None pour relire le JS)
+    Returns:
+        ZoneRegistry
+    """
+    if cache_dir is None:
+        return ZoneRegistry.from_cities(parse_cities_js(path))
+
+    # Source JS et format des colonnes: un changement de ZONE_DTYPE ne relit
+    # jamais un registre compilé avec l'ancien format
+    with open(path, "rb") as f:
+        digest = hashlib.sha256(f.read() + str(ZONE_DTYPE.descr).encode("utf-8"))
+    digest = digest.hexdigest()[:16]
+    registry_path = os.path.join(cache_dir, f"zones_{digest}.npy")
+    if os.path.exists(registry_path) and os.path.exists(f"{registry_path}.json"):
+        return ZoneRegistry.open(registry_path)
+    registry = ZoneRegistry.from_cities(parse_cities_js(path))
+    registry.save(registry_path)
+    return registry
+
+
+def synthetic_cities(n_zones, seed=0, anchors=None):
+    """
+    Génère un registre de `n_zones` zones au schéma de ivoryCoastCities.js
+
+    Chaque zone est rattachée à une ville réelle (région, district) et placée
+    autour d'elle, ce qui garde les facteurs saisonniers et de corridor
+    pertinents. Utile pour l'échelle sous-préfecture (393) ou antenne.
+    """
+    anchors = anchors if anchors is not None else load_cities()
+    if not isinstance(anchors, ZoneRegistry):
+        anchors = ZoneRegistry.from_cities(anchors)
+    rng = np.random.default_rng(seed)
+
+    lat_min, lat_max, lon_min, lon_max = IVORY_COAST_BBOX
+    anchor_idx = rng.integers(0, len(anchors), size=n_zones)
+    anchor_rows = anchors.table[anchor_idx]
+    lat = np.clip(anchor_rows["lat"] + rng.normal(0, 0.6, n_zones), lat_min, lat_max)
+    lon = np.clip(anchor_rows["lon"] + rng.normal(0, 0.6, n_zones), lon_min, lon_max)
+
+    # ~22 millions d'habitants répartis selon une loi log-normale
+    weights = rng.lognormal(mean=0.0, sigma=1.0, size=n_zones)
+    population = np.maximum(2000, weights / weights.sum() * 22_000_000).astype(int)
+    centrality = rng.integers(35, 95, size=n_zones)
+
+    table = np.zeros(n_zones, dtype=ZONE_DTYPE)
+    table["population"] = population
+    table["centrality"] = centrality
+    table["lat"] = lat
+    table["lon"] = lon
+    table["region"] = anchor_rows["region"]
+    table["district"] = anchor_rows["district"]
+    # Type "rural": code existant des ancres s'il y en a un, sinon ajouté
+    urban_types = list(anchors.urban_types)
+    if "rural" not in urban_types:
+        urban_types.append("rural")
+    table["urban_type"] = urban_types.index("rural")
+    return ZoneRegistry(
+        table,
+        [f"SP-{k + 1:04d}" for k in range(n_zones)],
+        [f"Sous-préfecture {k + 1}" for k in range(n_zones)],
+        anchors.regions, anchors.districts, urban_types,
+    )
+
+
+# =============================================================================
+# POINT D'ENTRÉE
+# =============================================================================
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compile le registre binaire des zones")
+    parser.add_argument("output", help="fichier .npy du registre (+ .npy.json)")
+    parser.add_argument("--synthetic", type=int, metavar="N",
+                        help="N zones synthétiques au lieu des villes du JS")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    registry = (synthetic_cities(args.synthetic, seed=args.seed) if args.synthetic
+                else load_cities())
+    registry.save(args.output)
+    size = os.path.getsize(args.output) + os.path.getsize(f"{args.output}.json")
+    print(f"🗺️  {len(registry)} zones, {len(registry.regions)} régions, "
+          f"{len(registry.districts)} districts -> {args.output} ({size / 1024:.0f} Ko)")
+
+
+if __name__ == "__main__":
+    main()
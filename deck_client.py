@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Client du démon de présentations (deck_daemon.py)
+
+N'importe que la bibliothèque standard: le démarrage est immédiat, le
+travail est fait par les workers déjà chauds du démon. Sans argument, même
+job que `python generate_presentation.py` (chiffres nationaux, fichier
+OUTPUT_FILENAME). Si le démon ne répond pas, le deck est construit
+localement comme avant (sauf --no-fallback).
+
+Usage:
+    python deck_client.py                              # deck par défaut
+    python deck_client.py --output decks/abidjan.pptx --figures abidjan.json
+    python deck_client.py --manifest manifest.json     # format de batch_decks.py
+    python deck_client.py --status
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+import time
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# Adresse par défaut du démon (mêmes valeurs que deck_daemon.py)
+HOST = "127.0.0.1"
+PORT = 8766
+TIMEOUT = 600                   # Secondes (le premier deck par défaut simule)
+
+# =============================================================================
+# FONCTIONS
+# =============================================================================
+
+def connect(host=HOST, port=PORT, socket_path=None, timeout=TIMEOUT):
+    """Connexion au démon (socket Unix si `socket_path`)"""
+    if socket_path:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        sock.connect(socket_path)
+        return sock
+    return socket.create_connection((host, port), timeout=timeout)
+
+
+def request(message, host=HOST, port=PORT, socket_path=None, timeout=TIMEOUT):
+    """
+    Envoie une requête JSON et attend la réponse
+
+    Raises:
+        ConnectionRefusedError, FileNotFoundError: démon injoignable
+        TimeoutError: pas de réponse dans le délai
+    """
+    with connect(host, port, socket_path, timeout) as sock:
+        sock.sendall(json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as stream:
+            line = stream.readline()
+    if not line:
+        raise ConnectionError("Connexion fermée par le démon")
+    return json.loads(line)
+
+
+def build_locally(message):
+    """Repli sans démon: même travail dans ce processus (démarrage à froid)"""
+    if message["action"] == "batch":
+        from batch_decks import generate_batch
+        return generate_batch(message["decks"])
+
+    from generate_presentation import OUTPUT_FILENAME, create_presentation
+    return create_presentation(message.get("figures"), message.get("output") or OUTPUT_FILENAME)
+
+
+# =============================================================================
+# POINT D'ENTRÉE
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Client du démon de présentations")
+    parser.add_argument("--output", help="fichier .pptx (défaut: celui de generate_presentation)")
+    parser.add_argument("--figures", help="chiffres JSON (défaut: chiffres nationaux)")
+    parser.add_argument("--manifest", help="manifeste de decks (format de batch_decks.py)")
+    parser.add_argument("--refresh", action="store_true",
+                        help="recalcule les chiffres par défaut du démon")
+    parser.add_argument("--status", action="store_true", help="état du démon")
+    parser.add_argument("--shutdown", action="store_true", help="arrête le démon")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--socket", help="socket Unix du démon")
+    parser.add_argument("--no-fallback", action="store_true",
+                        help="échoue si le démon est injoignable")
+    args = parser.parse_args()
+
+    if args.status or args.shutdown:
+        message = {"action": "status" if args.status else "shutdown"}
+    elif args.manifest:
+        with open(args.manifest, encoding="utf-8") as f:
+            manifest = json.load(f)
+        decks = manifest["decks"] if isinstance(manifest, dict) else manifest
+        message = {"action": "batch", "decks": decks, "cwd": os.getcwd()}
+    else:
+        figures = None
+        if args.figures:
+            with open(args.figures, encoding="utf-8") as f:
+                figures = json.load(f)
+        message = {"action": "build", "figures": figures, "output": args.output,
+                   "refresh": args.refresh, "cwd": os.getcwd()}
+
+    start = time.perf_counter()
+    try:
+        response = request(message, args.host, args.port, args.socket)
+    except (ConnectionRefusedError, FileNotFoundError) as e:
+        if args.no_fallback or message["action"] in ("status", "shutdown"):
+            print(f"❌ Démon injoignable: {e}")
+            sys.exit(1)
+        print(f"⚠️  Démon injoignable ({e}), génération locale")
+        build_locally(message)
+        return
+
+    if not response.get("ok"):
+        if "decks" in response:
+            failed = [deck for deck in response["decks"] if not deck["ok"]]
+            print(f"❌ {len(failed)}/{len(response['decks'])} présentations en échec")
+            for deck in failed:
+                print(f"   - {deck['error']}")
+        else:
+            print(f"❌ {response.get('error', 'échec')}")
+        sys.exit(1)
+
+    seconds = time.perf_counter() - start
+    if message["action"] == "status":
+        print(json.dumps(response, ensure_ascii=False, indent=2))
+    elif message["action"] == "shutdown":
+        print("👋 Démon arrêté")
+    elif message["action"] == "batch":
+        print(f"✅ {len(response['decks'])} présentations créées en {seconds:.2f} s")
+    else:
+        print(f"✅ Présentation créée: {response['output']} "
+              f"({response['slides']} slides, {seconds:.2f} s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Démon local de génération de présentations (processus chaud)
+
+Chaque `python generate_presentation.py` paie l'import de python-pptx et
+lxml, l'ouverture du modèle par défaut, la relecture des PNG et, sans
+chiffres fournis, la simulation complète. Pour les petits decks demandés
+en série pendant une épidémie, ce démarrage domine. Le démon garde tout
+cela en mémoire:
+
+- un pool borné de workers (processus) préchauffés une fois: modules
+  python-pptx importés, modèle ouvert, images lues et hashées
+  (preload_media), constantes de la charte (ORANGE_CI, NOIR...) chargées;
+- une file d'attente bornée: au-delà, un deck isolé est refusé ("busy")
+  plutôt que d'accumuler de la latence; les decks d'un batch attendent
+  une place (contre-pression), si bien qu'un batch plus grand que la file
+  (un deck par sous-préfecture...) passe en entier;
+- les chiffres nationaux par défaut (compute_figures) calculés au premier
+  job qui les demande, puis réutilisés (`refresh` pour recalculer).
+
+Les rapports JSON (scénarios, backtest...) et le fichier de sortie sont
+relatifs au dossier du client (`cwd`), comme pour un lancement local.
+
+Protocole: une requête JSON par ligne, une réponse JSON par ligne, sur
+localhost (TCP) ou un socket Unix:
+    {"action": "build", "figures": {...} | null, "output": "deck.pptx", "cwd": "..."}
+    {"action": "batch", "decks": [{"output": ..., "figures": ...}, ...]}
+    {"action": "status"} / {"action": "shutdown"}
+
+Le client est deck_client.py. Lancer le démon depuis la racine du dépôt
+(images des slides lues dans le dossier courant).
+
+Usage:
+    python deck_daemon.py                          # 127.0.0.1:8766
+    python deck_daemon.py --socket /tmp/decks.sock --workers 4
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from pptx import Presentation
+
+from generate_presentation import (
+    OUTPUT_FILENAME,
+    attach_artifacts,
+    build_presentation,
+    compute_figures,
+    media_savings,
+    preload_media,
+)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+HOST = "127.0.0.1"              # Écoute locale uniquement
+PORT = 8766
+N_WORKERS = 2                   # Decks construits en parallèle
+QUEUE_SIZE = 32                 # Jobs en attente au-delà des workers
+MAX_MESSAGE_BYTES = 32 * 2**20  # Une requête (chiffres inclus) par ligne
+
+# Contexte des workers du pool (rempli par _init_worker)
+_worker = {}
+
+# =============================================================================
+# WORKERS
+# =============================================================================
+
+def _init_worker():
+    """Préchauffe un worker: modules, modèle par défaut et images en cache"""
+    start = time.perf_counter()
+    preload_media()
+    Presentation()
+    _worker.update(pid=os.getpid(), warmup_seconds=time.perf_counter() - start)
+
+
+def _build_job(figures, output):
+    """Tâche worker: construit et écrit un deck"""
+    start = time.perf_counter()
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    prs = build_presentation(figures)
+    prs.save(output)
+    return {
+        "output": output,
+        "slides": len(prs.slides),
+        "media_saved_bytes": media_savings(prs)["saved_bytes"],
+        "seconds": time.perf_counter() - start,
+        "worker": _worker.get("pid"),
+    }
+
+
+# =============================================================================
+# DÉMON
+# =============================================================================
+
+class QueueFull(Exception):
+    """File d'attente pleine: le job est refusé"""
+
+
+class DeckDaemon:
+    """File de jobs bornée devant un pool de workers préchauffés"""
+
+    def __init__(self, n_workers=N_WORKERS, queue_size=QUEUE_SIZE):
+        self.n_workers = n_workers
+        self.queue_size = queue_size
+        self.pool = ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker)
+        self.queue = None
+        self.stopping = None
+        self._default_figures = None
+        self._figures_lock = None
+        self.stats = {"started": time.time(), "done": 0, "failed": 0, "rejected": 0}
+
+    async def start(self):
+        """Crée la file et les consommateurs (dans la boucle asyncio)"""
+        self.queue = asyncio.Queue(self.queue_size)
+        self.stopping = asyncio.Event()
+        self._figures_lock = asyncio.Lock()
+        # Un job par worker au plus: les autres attendent dans la file
+        self._consumers = [asyncio.create_task(self._consume()) for _ in range(self.n_workers)]
+        # Démarre et préchauffe tous les workers avant le premier job
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.pool, os.getpid)
+                               for _ in range(self.n_workers)))
+
+    def close(self):
+        for consumer in self._consumers:
+            consumer.cancel()
+        self.pool.shutdown(cancel_futures=True)
+
+    async def default_figures(self, refresh=False):
+        """Chiffres nationaux (simulation + ensemble), calculés une fois"""
+        async with self._figures_lock:
+            if self._default_figures is None or refresh:
+                loop = asyncio.get_running_loop()
+                self._default_figures = await loop.run_in_executor(None, compute_figures)
+        return self._default_figures
+
+    async def _consume(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            figures, output, future = await self.queue.get()
+            try:
+                result = await loop.run_in_executor(self.pool, _build_job, figures, output)
+            except Exception as e:
+                self.stats["failed"] += 1
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                self.stats["done"] += 1
+                if not future.done():
+                    future.set_result(result)
+            finally:
+                self.queue.task_done()
+
+    async def build(self, job, wait=False):
+        """
+        Met un deck en file et attend sa construction
+
+        Sans `figures`, le deck par défaut de create_presentation (chiffres
+        nationaux + rapports JSON présents sur disque).
+
+        Args:
+            wait: attend une place si la file est pleine (decks d'un batch)
+                au lieu de lever QueueFull
+        """
+        figures = job.get("figures")
+        if figures is None:
+            figures = await self.default_figures(job.get("refresh", False))
+        # Rapports JSON et chemin de sortie relatifs au dossier du client
+        cwd = job.get("cwd") or os.getcwd()
+        figures = attach_artifacts(dict(figures), cwd)
+        output = os.path.join(cwd, job.get("output") or OUTPUT_FILENAME)
+
+        future = asyncio.get_running_loop().create_future()
+        if wait:
+            await self.queue.put((figures, output, future))
+        else:
+            if self.queue.full():
+                self.stats["rejected"] += 1
+                raise QueueFull(f"File pleine ({self.queue_size} jobs en attente)")
+            self.queue.put_nowait((figures, output, future))
+        return await future
+
+    def status(self):
+        return {
+            **self.stats,
+            "uptime_seconds": time.time() - self.stats["started"],
+            "workers": self.n_workers,
+            "queued": self.queue.qsize(),
+            "queue_size": self.queue_size,
+            "default_figures": self._default_figures is not None,
+        }
+
+    async def handle(self, request):
+        """Réponse (dict) à une requête décodée"""
+        action = request.get("action", "build")
+        if action == "build":
+            return {"ok": True, **await self.build(request)}
+        if action == "batch":
+            cwd = request.get("cwd")
+            results = await asyncio.gather(
+                *(self.build({"cwd": cwd, **deck}, wait=True) for deck in request["decks"]),
+                return_exceptions=True,
+            )
+            decks = [
+                {"ok": False, "error": str(r)} if isinstance(r, Exception) else {"ok": True, **r}
+                for r in results
+            ]
+            return {"ok": all(deck["ok"] for deck in decks), "decks": decks}
+        if action == "status":
+            return {"ok": True, **self.status()}
+        if action == "shutdown":
+            self.stopping.set()
+            return {"ok": True}
+        raise ValueError(f"Action inconnue: {action}")
+
+
+# =============================================================================
+# SOCKET
+# =============================================================================
+
+async def handle_client(daemon, reader, writer):
+    """Traite les requêtes d'une connexion (une ligne JSON chacune)"""
+    try:
+        while not daemon.stopping.is_set():
+            try:
+                line = await reader.readline()
+            except (asyncio.LimitOverrunError, ValueError):
+                response = {"ok": False, "error": "Requête trop longue"}
+                writer.write(json.dumps(response).encode("utf-8") + b"\n")
+                break
+            if not line:
+                break
+            try:
+                response = await daemon.handle(json.loads(line))
+            except QueueFull as e:
+                response = {"ok": False, "busy": True, "error": str(e)}
+            except Exception as e:
+                response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            writer.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+            await writer.drain()
+    finally:
+        writer.close()
+
+
+async def serve(daemon, host=HOST, port=PORT, socket_path=None):
+    """Lance le démon jusqu'à l'action "shutdown" ou une interruption"""
+    await daemon.start()
+
+    def client(reader, writer):
+        return handle_client(daemon, reader, writer)
+
+    if socket_path:
+        server = await asyncio.start_unix_server(client, socket_path, limit=MAX_MESSAGE_BYTES)
+    else:
+        server = await asyncio.start_server(client, host, port, limit=MAX_MESSAGE_BYTES)
+    try:
+        async with server:
+            await daemon.stopping.wait()
+    finally:
+        daemon.close()
+        if socket_path and os.path.exists(socket_path):
+            os.remove(socket_path)
+
+
+# =============================================================================
+# POINT D'ENTRÉE
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Démon local de génération de présentations")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--socket", help="socket Unix (au lieu de TCP)")
+    parser.add_argument("--workers", type=int, default=N_WORKERS)
+    parser.add_argument("--queue-size", type=int, default=QUEUE_SIZE)
+    args = parser.parse_args()
+
+    daemon = DeckDaemon(args.workers, args.queue_size)
+    address = args.socket or f"{args.host}:{args.port}"
+    print(f"🏭 Démon de présentations sur {address} "
+          f"({args.workers} workers, file de {args.queue_size} jobs)")
+    try:
+        asyncio.run(serve(daemon, args.host, args.port, args.socket))
+    except KeyboardInterrupt:
+        pass
+    print("\n👋 Arrêt du démon")
+
+
+if __name__ == "__main__":
+    main()
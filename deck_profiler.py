@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Profilage de la génération de la présentation, étape par étape
+
+Instrumente generate_presentation le temps d'une exécution: chaque
+constructeur de slide, chaque helper (add_title, add_text_box,
+add_shape_with_text, add_picture, ...), le calcul des chiffres et
+l'écriture du fichier (prs.save, compression zip) sont remplacés par une
+version chronométrée. Par étape: nombre d'appels, temps réel, temps CPU,
+blocs mémoire alloués (sys.getallocatedblocks) et, avec --tracemalloc,
+octets alloués et principaux sites d'allocation.
+
+Les temps sont inclusifs (une slide inclut ses helpers). Le rapport JSON
+peut être comparé à un rapport précédent (--baseline) pour repérer les
+régressions; --cprofile écrit en plus un profil cProfile complet.
+
+Usage:
+    python deck_profiler.py --report profile.json
+    python deck_profiler.py --repeat 10 --baseline old.json
+    python deck_profiler.py --cprofile deck.prof --tracemalloc 15
+"""
+
+import argparse
+import cProfile
+import datetime
+import functools
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+from pptx.presentation import Presentation
+
+import generate_presentation
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# Fonctions de generate_presentation chronométrées
+PROFILED_FUNCTIONS = (
+    "compute_figures", "deck_figures", "ensemble_figures", "attach_artifacts",
+    "build_presentation",
+    "create_slide_1_title", "create_slide_2_solution", "create_slide_3_anonymisation",
+    "create_slide_4_methodologie", "create_slide_5_livrables", "create_slide_6_risques",
+    "create_slide_7_prototype", "create_slide_scenarios",
+    "create_slide_from_spec", "render_plan",
+    "add_title", "add_text_box", "add_shape_with_text", "add_bullet_point",
+    "add_page_number", "add_picture", "load_image", "add_chart",
+)
+SAVE_STAGE = "prs.save"
+
+REPORT_FILENAME = "deck_profile.json"
+PROFILE_OUTPUT = "profiled_deck.pptx"
+REGRESSION_TOLERANCE = 0.20     # +20% de temps moyen par appel
+MIN_REGRESSION_MS = 5.0         # En dessous, écart considéré comme du bruit
+TOP_ALLOCATION_SITES = 10       # Sites d'allocation gardés avec tracemalloc
+
+# =============================================================================
+# PROFILEUR
+# =============================================================================
+
+class DeckProfiler:
+    """
+    Chronométrage des étapes de generate_presentation (gestionnaire de contexte)
+
+    Pendant le bloc `with`, les fonctions PROFILED_FUNCTIONS du module et
+    Presentation.save sont remplacées par des versions instrumentées; les
+    originales sont restaurées à la sortie.
+    """
+
+    def __init__(self, names=PROFILED_FUNCTIONS, trace_memory=False, top_sites=TOP_ALLOCATION_SITES):
+        self.names = names
+        self.trace_memory = trace_memory
+        self.top_sites = top_sites
+        self.top_allocations = None
+        self.stages = {}
+        self._originals = {}
+        self._started_tracing = False
+
+    def _record(self, name, wall, cpu, blocks, traced):
+        stage = self.stages.setdefault(name, {
+            "calls": 0, "wall_s": 0.0, "cpu_s": 0.0, "alloc_blocks": 0, "traced_kb": 0.0,
+        })
+        stage["calls"] += 1
+        stage["wall_s"] += wall
+        stage["cpu_s"] += cpu
+        stage["alloc_blocks"] += blocks
+        stage["traced_kb"] += traced / 1024
+
+    def wrap(self, name, function):
+        """Version chronométrée de `function`, enregistrée sous `name`"""
+        @functools.wraps(function)
+        def timed(*args, **kwargs):
+            traced = tracemalloc.get_traced_memory()[0] if self.trace_memory else 0
+            blocks = sys.getallocatedblocks()
+            cpu = time.process_time()
+            wall = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self._record(
+                    name,
+                    time.perf_counter() - wall,
+                    time.process_time() - cpu,
+                    sys.getallocatedblocks() - blocks,
+                    tracemalloc.get_traced_memory()[0] - traced if self.trace_memory else 0,
+                )
+        return timed
+
+    def __enter__(self):
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        for name in self.names:
+            if hasattr(generate_presentation, name):
+                original = getattr(generate_presentation, name)
+                self._originals[name] = original
+                setattr(generate_presentation, name, self.wrap(name, original))
+        self._original_save = Presentation.save
+        Presentation.save = self.wrap(SAVE_STAGE, self._original_save)
+        return self
+
+    def __exit__(self, *exc_info):
+        for name, original in self._originals.items():
+            setattr(generate_presentation, name, original)
+        Presentation.save = self._original_save
+        if self._started_tracing:
+            self.top_allocations = top_allocations(tracemalloc.take_snapshot(), self.top_sites)
+            tracemalloc.stop()
+        return False
+
+    def report(self, total_wall, total_cpu, runs, output=None):
+        """Rapport JSON (étapes triées par temps réel décroissant)"""
+        stages = {}
+        for name, stage in sorted(self.stages.items(), key=lambda item: -item[1]["wall_s"]):
+            stages[name] = {
+                "calls": stage["calls"],
+                "wall_s": round(stage["wall_s"], 6),
+                "cpu_s": round(stage["cpu_s"], 6),
+                "mean_ms": round(1000 * stage["wall_s"] / stage["calls"], 4),
+                "alloc_blocks": stage["alloc_blocks"],
+            }
+            if self.trace_memory:
+                stages[name]["traced_kb"] = round(stage["traced_kb"], 1)
+
+        report = {
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "runs": runs,
+            "total": {"wall_s": round(total_wall, 6), "cpu_s": round(total_cpu, 6)},
+            "stages": stages,
+        }
+        if output and os.path.exists(output):
+            report["output_bytes"] = os.path.getsize(output)
+        if self.top_allocations:
+            report["top_allocations"] = self.top_allocations
+        return report
+
+
+def top_allocations(snapshot, limit=TOP_ALLOCATION_SITES):
+    """Principaux sites d'allocation (fichier:ligne, Ko, blocs)"""
+    return [
+        {"site": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+         "kb": round(stat.size / 1024, 1), "blocks": stat.count}
+        for stat in snapshot.statistics("lineno")[:limit]
+    ]
+
+
+# =============================================================================
+# EXÉCUTION ET COMPARAISON
+# =============================================================================
+
+def profile_deck(figures=None, output=PROFILE_OUTPUT, repeat=1, top_sites=0,
+                 cprofile_path=None):
+    """
+    Génère la présentation `repeat` fois sous instrumentation
+
+    Les chiffres (simulation + ensemble) sont calculés une seule fois si
+    absents; les générations suivantes mesurent le régime "en lot" (images
+    déjà en cache). `top_sites` > 0 active tracemalloc.
+
+    Returns:
+        dict: rapport (voir DeckProfiler.report)
+    """
+    profiler = cProfile.Profile() if cprofile_path else None
+    wall = time.perf_counter()
+    cpu = time.process_time()
+
+    with DeckProfiler(trace_memory=top_sites > 0, top_sites=top_sites) as deck_profiler:
+        if profiler:
+            profiler.enable()
+        try:
+            if figures is None:
+                figures = generate_presentation.compute_figures()
+            for _ in range(repeat):
+                generate_presentation.create_presentation(dict(figures), output)
+        finally:
+            if profiler:
+                profiler.disable()
+
+    if profiler:
+        profiler.dump_stats(cprofile_path)
+    return deck_profiler.report(time.perf_counter() - wall, time.process_time() - cpu,
+                                repeat, output)
+
+
+def compare_reports(report, baseline, tolerance=REGRESSION_TOLERANCE):
+    """
+    Étapes dont le temps moyen par appel a augmenté au-delà de `tolerance`
+
+    Returns:
+        list de dict: stage, baseline_ms, current_ms, change_pct (None si
+        le temps de référence est nul)
+    """
+    regressions = []
+    for name, stage in report["stages"].items():
+        before = baseline.get("stages", {}).get(name, {}).get("mean_ms")
+        after = stage.get("mean_ms")
+        if before is None or after is None:
+            continue
+        if after - before > MIN_REGRESSION_MS and after > before * (1 + tolerance):
+            regressions.append({
+                "stage": name,
+                "baseline_ms": before,
+                "current_ms": after,
+                "change_pct": round(100 * (after / before - 1), 1) if before else None,
+            })
+    return regressions
+
+
+def format_change(change_pct):
+    """Variation en % pour l'affichage ("n/a" si non définie)"""
+    return "n/a" if change_pct is None else f"{change_pct:+}%"
+
+
+def save_report(report, path=REPORT_FILENAME):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return path
+
+
+# =============================================================================
+# POINT D'ENTRÉE
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Profilage de la génération de la présentation")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="générations successives (mesure du régime en lot)")
+    parser.add_argument("--output", default=PROFILE_OUTPUT, help="deck écrit pendant le profilage")
+    parser.add_argument("--report", default=REPORT_FILENAME)
+    parser.add_argument("--cprofile", metavar="FICHIER", help="écrit un profil cProfile")
+    parser.add_argument("--tracemalloc", type=int, metavar="N", default=0,
+                        help="suit les allocations et garde les N principaux sites")
+    parser.add_argument("--baseline", help="rapport précédent à comparer")
+    args = parser.parse_args()
+
+    report = profile_deck(None, args.output, args.repeat, args.tracemalloc, args.cprofile)
+    save_report(report, args.report)
+
+    print(f"\n⏱️  Profil ({args.repeat} génération(s), {report['total']['wall_s']:.2f} s):")
+    print(f"{'Étape':<30} {'Appels':>7} {'Réel (s)':>10} {'CPU (s)':>9} {'ms/appel':>10} "
+          f"{'Blocs':>9}")
+    for name, stage in report["stages"].items():
+        print(f"{name:<30} {stage['calls']:>7} {stage['wall_s']:>10.4f} {stage['cpu_s']:>9.4f} "
+              f"{stage['mean_ms']:>10.3f} {stage['alloc_blocks']:>9}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare_reports(report, json.load(f))
+        for regression in regressions:
+            change = format_change(regression["change_pct"])
+            print(f"⚠️  Régression {regression['stage']}: {regression['baseline_ms']:.2f} -> "
+                  f"{regression['current_ms']:.2f} ms/appel ({change})")
+        if regressions:
+            print(f"\n❌ {len(regressions)} régression(s) par rapport à {args.baseline}")
+            sys.exit(1)
+        print(f"✅ Aucune régression par rapport à {args.baseline}")
+    print(f"📝 Rapport: {args.report}")
+
+
+if __name__ == "__main__":
+    main()
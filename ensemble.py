@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Ensemble Monte Carlo du modèle SEIR métapopulationnel
+
+Lance des milliers de réalisations stochastiques (tirages binomiaux des
+transitions, foyers initiaux aléatoires comme dans initializeZone) réparties
+sur un ProcessPoolExecutor. Chaque paquet de réalisations reçoit son propre
+flux aléatoire (SeedSequence.spawn) et écrit directement ses résultats dans
+un tableau en mémoire partagée; le processus principal les réduit ensuite
+en bandes de quantiles par zone à J+7 et J+14.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from cities import load_cities, zone_column
+from mobility import build_mobility_matrix
+from seir_engine import (
+    DEFAULT_PARAMS,
+    N_OUTBREAK_CITIES,
+    OUTBREAK_PREVALENCE,
+    REFERENCE_DATE,
+    START_DATE,
+    draw_transitions,
+    transpose_mobility,
+)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+DEFAULT_RUNS = 1000
+RUNS_PER_TASK = 25                  # Réalisations simulées ensemble par tâche
+DEFAULT_QUANTILES = (0.05, 0.5, 0.95)  # Intervalle de confiance à 90%
+
+# Nombres aléatoires communs: inversion exacte sous cette moyenne
+EXACT_MAX_MEAN = 30
+EXACT_LIMIT = 120                   # Termes maximum de la récurrence exacte
+
+# État partagé par les processus workers (initialisé une fois par worker)
+_worker = {}
+
+# =============================================================================
+# SIMULATION D'UN PAQUET DE RÉALISATIONS
+# =============================================================================
+
+def _init_worker(mobility_t, population, params, shm_name, shape):
+    """Initialise un worker: matrice, paramètres et tableau partagé"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    _worker.update(
+        mobility_t=mobility_t,
+        population=population,
+        params=params,
+        shm=shm,
+        results=np.ndarray(shape, dtype=np.float64, buffer=shm.buf),
+    )
+
+
+class CommonRandomNumbers:
+    """
+    Tirages binomiaux / de Poisson par inversion, une uniforme par cellule
+
+    S'utilise à la place d'un np.random.Generator dans simulate_batch (avec
+    `initial`). Chaque tirage consomme exactement une uniforme par (run,
+    zone), et la valeur tirée est croissante en n, p ou λ: modifier les
+    données d'une zone ne décale pas les tirages des autres et ne change
+    leurs valeurs que si le décalage franchit un quantile. Les intervalles
+    des districts non touchés restent donc stables d'un jour à l'autre
+    (nombres aléatoires communs).
+
+    Inversion exacte sous EXACT_MAX_MEAN, approximation normale au-delà.
+    """
+
+    def __init__(self, seed):
+        self.rng = np.random.default_rng(seed)
+
+    @staticmethod
+    def _invert(u, pmf, ratio, limit):
+        """Plus petit k tel que F(k) >= u, par récurrence sur la loi"""
+        out = np.zeros(u.shape, dtype=np.int64)
+        cdf = pmf.copy()
+        for k in range(limit):
+            below = cdf < u
+            if not below.any():
+                break
+            out += below
+            pmf = pmf * ratio(k)
+            cdf += pmf
+        return out
+
+    @staticmethod
+    def _normal(u, mean, var):
+        """Quantile arrondi de l'approximation normale"""
+        try:
+            from scipy.special import ndtri
+        except ImportError:
+            raise ImportError(
+                "scipy est requis pour les nombres aléatoires communs (pip install scipy)"
+            )
+        return np.round(mean + np.sqrt(var) * ndtri(u)).astype(np.int64)
+
+    def binomial(self, n, p):
+        n, p = np.broadcast_arrays(np.asarray(n, dtype=np.int64), np.asarray(p, dtype=float))
+        u = self.rng.random(n.shape)
+        mean = n * p
+        small = mean < EXACT_MAX_MEAN
+        out = np.empty(n.shape, dtype=np.int64)
+
+        ns, ps = n[small], np.minimum(p[small], 1 - 1e-12)
+        out[small] = self._invert(
+            u[small], (1 - ps) ** ns, lambda k: np.maximum(ns - k, 0) / (k + 1) * ps / (1 - ps),
+            EXACT_LIMIT,
+        )
+        large = ~small
+        out[large] = np.clip(self._normal(u[large], mean[large],
+                                          mean[large] * (1 - p[large])), 0, n[large])
+        return out
+
+    def poisson(self, lam):
+        lam = np.asarray(lam, dtype=float)
+        u = self.rng.random(lam.shape)
+        small = lam < EXACT_MAX_MEAN
+        out = np.empty(lam.shape, dtype=np.int64)
+
+        ls = lam[small]
+        out[small] = self._invert(u[small], np.exp(-ls), lambda k: ls / (k + 1), EXACT_LIMIT)
+        out[~small] = np.maximum(self._normal(u[~small], lam[~small], lam[~small]), 0)
+        return out
+
+
+def simulate_batch(rng, mobility_t, population, params, n_runs, days, record_days,
+                   initial=None):
+    """
+    Simule `n_runs` réalisations en parallèle vectoriel (tableaux (runs, N))
+
+    Transitions de seir_engine.draw_transitions (binomiales de même espérance
+    que le moteur déterministe, importations de Poisson), comme le mode
+    stochastique de MetapopulationSEIR. Sans `initial` (état S/E/I/R (4, N)),
+    les réalisations partent des foyers initiaux.
+
+    Returns:
+        np.ndarray (len(record_days), n_runs, N): cas actifs aux jours demandés
+    """
+    n_zones = len(population)
+
+    if initial is not None:
+        S, E, I, R = (
+            np.repeat(np.round(row)[None, :].astype(np.int64), n_runs, axis=0)
+            for row in initial
+        )
+    else:
+        # Foyers initiaux: zones les plus peuplées, 0.8-1.2% d'infectés
+        outbreak = np.argsort(-population, kind="stable")[:N_OUTBREAK_CITIES]
+        I = np.zeros((n_runs, n_zones), dtype=np.int64)
+        random_factor = 0.8 + rng.random((n_runs, len(outbreak))) * 0.4
+        I[:, outbreak] = np.round(population[outbreak] * OUTBREAK_PREVALENCE * random_factor)
+        S = population.astype(np.int64) - I
+        E = np.zeros_like(I)
+        R = np.zeros_like(I)
+
+    recorded = np.empty((len(record_days), n_runs, n_zones))
+    slots = {day: k for k, day in enumerate(record_days)}
+    if 0 in slots:
+        recorded[slots[0]] = I
+
+    for day in range(1, days + 1):
+        imported_rate = params["mu"] * (mobility_t @ (I / population).T).T
+        new_exposed, new_infected, new_recovered, imported = draw_transitions(
+            rng, S, E, I, population, imported_rate, params,
+        )
+
+        S = S - new_exposed - imported
+        E = E + new_exposed - new_infected
+        I = I + new_infected - new_recovered + imported
+        R = R + new_recovered
+
+        if day in slots:
+            recorded[slots[day]] = I
+    return recorded
+
+
+def _run_task(task):
+    """Tâche worker: simule un paquet et écrit dans la mémoire partagée"""
+    start, stop, seed_seq, days, record_days = task
+    rng = np.random.default_rng(seed_seq)
+    _worker["results"][:, start:stop, :] = simulate_batch(
+        rng, _worker["mobility_t"], _worker["population"], _worker["params"],
+        stop - start, days, record_days,
+    )
+    return stop - start
+
+
+# =============================================================================
+# ENSEMBLE
+# =============================================================================
+
+def run_ensemble(cities, mobility, days, horizons=(7, 14), n_runs=DEFAULT_RUNS,
+                 params=None, seed=0, n_workers=None):
+    """
+    Lance l'ensemble Monte Carlo
+
+    Le découpage en tâches (RUNS_PER_TASK) et les graines ne dépendent pas du
+    nombre de workers: un même `seed` donne toujours le même ensemble.
+
+    Args:
+        cities: villes (schéma ivoryCoastCities.js)
+        mobility: matrice (N, N) dense ou scipy.sparse
+        days: nombre de jours jusqu'à "aujourd'hui"
+        horizons: horizons de prévision (jours après `days`)
+    Returns:
+        np.ndarray (1 + len(horizons), n_runs, N): cas actifs aujourd'hui puis
+        à chaque horizon
+    """
+    params = {**DEFAULT_PARAMS, **(params or {})}
+    population = zone_column(cities, "population", float)
+    mobility_t = transpose_mobility(mobility)
+
+    record_days = (days,) + tuple(days + h for h in horizons)
+    last_day = max(record_days)
+    shape = (len(record_days), n_runs, len(population))
+
+    starts = range(0, n_runs, RUNS_PER_TASK)
+    seeds = np.random.SeedSequence(seed).spawn(len(starts))
+    tasks = [
+        (start, min(start + RUNS_PER_TASK, n_runs), seed_seq, last_day, record_days)
+        for start, seed_seq in zip(starts, seeds)
+    ]
+
+    shm = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)) * 8)
+    try:
+        with ProcessPoolExecutor(
+            max_workers=n_workers or os.cpu_count(),
+            initializer=_init_worker,
+            initargs=(mobility_t, population, params, shm.name, shape),
+        ) as pool:
+            list(pool.map(_run_task, tasks))
+        return np.ndarray(shape, dtype=np.float64, buffer=shm.buf).copy()
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def quantile_bands(results, horizons=(7, 14), quantiles=DEFAULT_QUANTILES):
+    """
+    Réduit l'ensemble en bandes de quantiles par zone et au niveau national
+
+    Returns:
+        dict {h: {"zones": np.ndarray (len(quantiles), N),
+                  "national": np.ndarray (len(quantiles),)}}
+        avec h = 0 pour aujourd'hui
+    """
+    bands = {}
+    for k, horizon in enumerate((0,) + tuple(horizons)):
+        bands[horizon] = {
+            "zones": np.quantile(results[k], quantiles, axis=0),
+            "national": np.quantile(results[k].sum(axis=1), quantiles),
+        }
+    return bands
+
+
+def relative_half_width(band):
+    """Demi-largeur relative (en %) d'une bande (bas, médiane, haut)"""
+    lower, median, upper = band
+    return 100 * (upper - lower) / 2 / median if median > 0 else 0.0
+
+
+# =============================================================================
+# CHIFFRES POUR LA PRÉSENTATION
+# =============================================================================
+
+def summarize_ensemble(results, n_runs, zones=None):
+    """
+    Prévisions et intervalles de confiance à J+7 et J+14 pour un sous-ensemble
+    de zones
+
+    La prévision affichée (prediction_7d, prediction_14d) est la médiane de
+    l'ensemble: elle remplace celle du moteur déterministe dans les chiffres
+    du deck, si bien que le "±x%" décrit l'intervalle de la valeur affichée.
+
+    Args:
+        results: sortie de run_ensemble
+        zones: masque booléen (N,) des zones à agréger (toutes par défaut)
+    Returns:
+        dict: ci_level, ci_7d_pct, ci_14d_pct, prediction_7d (médiane),
+        prediction_7d_lower/upper, prediction_14d (médiane),
+        prediction_14d_lower/upper, n_runs
+    """
+    if zones is not None:
+        results = results[:, :, zones]
+    bands = quantile_bands(results)
+
+    figures = {
+        "n_runs": n_runs,
+        "ci_level": int(round(100 * (DEFAULT_QUANTILES[-1] - DEFAULT_QUANTILES[0]))),
+    }
+    for horizon in (7, 14):
+        band = bands[horizon]["national"]
+        figures[f"ci_{horizon}d_pct"] = int(round(relative_half_width(band)))
+        figures[f"prediction_{horizon}d"] = int(round(band[1]))
+        figures[f"prediction_{horizon}d_lower"] = int(round(band[0]))
+        figures[f"prediction_{horizon}d_upper"] = int(round(band[-1]))
+    return figures
+
+
+def ensemble_figures(cities=None, start_date=START_DATE, today=REFERENCE_DATE,
+                     n_runs=DEFAULT_RUNS, params=None, seed=0, n_workers=None):
+    """
+    Prévisions et intervalles de confiance nationaux à J+7 et J+14 pour les slides
+
+    Returns:
+        dict: voir summarize_ensemble()
+    """
+    cities = cities if cities is not None else load_cities()
+    mobility = build_mobility_matrix(cities, start_date)
+    results = run_ensemble(
+        cities, mobility, (today - start_date).days, n_runs=n_runs,
+        params=params, seed=seed, n_workers=n_workers,
+    )
+    return summarize_ensemble(results, n_runs)
@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""
+Serveur local de prévisions pour le dashboard (asyncio, sans dépendance)
+
+Remplace le calcul de EpidemicSimulation dans chaque onglet du navigateur
+(useRealtimeSimulation) par un état de modèle unique, partagé par tous les
+clients:
+
+- un curseur de simulation par jeu de paramètres ("default", "calibrated"
+  si calibration.json existe): les jours déjà simulés sont conservés
+  (HistoryStore), une requête pour un jour plus lointain ne simule que les
+  jours manquants;
+- un cache LRU/TTL des réponses, indexé par route, jour, jeu de paramètres
+  et options: les onglets suivants sont servis sans recalcul;
+- des réponses en colonnes: JSON columnaire (`format=json`, défaut) ou
+  binaire (`format=f32`: float32 little-endian (colonnes, ...) directement
+  lisible en Float32Array, forme et colonnes dans les en-têtes X-Shape /
+  X-Columns).
+
+Les nouveaux cas journaliers (getHistoricalData) sont les vraies entrées
+en I du modèle (σ × E de la veille) au lieu de Math.random().
+
+Routes (GET):
+    /zones                                  table des zones
+    /metrics?day=AAAA-MM-JJ&params=default  métriques et risque par zone
+    /predictions?day=...                    prévisions J+7 / J+14 par zone
+    /history?day=...&days=30&compartments=I,new_cases
+
+Usage:
+    python forecast_server.py                    # http://127.0.0.1:8765
+    python forecast_server.py --port 9000 --ttl 600
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from cities import load_cities, zone_column
+from history import HistoryStore
+from mobility import build_mobility_matrix, mobility_model
+from risk import TREND_DAYS, zone_risk
+from seir_engine import (
+    CALIBRATION_FILE,
+    COMPARTMENTS,
+    REFERENCE_DATE,
+    START_DATE,
+    MetapopulationSEIR,
+    load_params,
+)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+HOST = "127.0.0.1"              # Écoute locale uniquement
+PORT = 8765
+CACHE_SIZE = 256                # Réponses conservées (LRU)
+CACHE_TTL = 300                 # Durée de vie d'une réponse (secondes)
+MAX_SIMULATION_DAYS = 730       # Horizon maximal depuis START_DATE
+DEFAULT_HISTORY_DAYS = 30
+MAX_REQUEST_LINE = 8192
+
+HISTORY_COLUMNS = COMPARTMENTS + ("new_cases",)
+METRIC_COLUMNS = COMPARTMENTS + (
+    "prevalence", "inflow", "risk_score", "tier", "probability",
+)
+
+# =============================================================================
+# CACHE
+# =============================================================================
+
+class TTLCache:
+    """Cache LRU borné dont les entrées expirent après `ttl` secondes"""
+
+    def __init__(self, maxsize=CACHE_SIZE, ttl=CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key, value):
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# =============================================================================
+# ÉTAT PARTAGÉ DU MODÈLE
+# =============================================================================
+
+class ModelCursor:
+    """
+    Simulation d'un jeu de paramètres, avancée à la demande
+
+    L'historique S/E/I/R de tous les jours simulés est conservé: un jour
+    déjà atteint est servi tel quel, un jour plus lointain ne simule que les
+    jours manquants. Un verrou sérialise les avancées (threads du pool).
+    """
+
+    def __init__(self, cities, mobility, params=None, seed=0):
+        self.model = MetapopulationSEIR(cities, mobility, params=params, seed=seed)
+        self.forecaster = MetapopulationSEIR(cities, mobility, params=params, seed=seed)
+        self.store = HistoryStore(len(cities), COMPARTMENTS,
+                                  capacity=MAX_SIMULATION_DAYS + 1, dtype=float)
+        self.store.append(self.model.state)
+        self._lock = threading.Lock()
+
+    def history(self, day):
+        """Historique (day + 1, 4, N) jusqu'au jour `day` (simulé si besoin)"""
+        with self._lock:
+            while len(self.store) <= day:
+                self.model.step()
+                self.store.append(self.model.state)
+        return self.store.last()[:day + 1]
+
+    def forecast(self, day, horizons=(7, 14)):
+        """Prévisions {h: (N,)} depuis l'état du jour `day`"""
+        state = self.history(day)[day]
+        with self._lock:
+            self.forecaster.state = state
+            return self.forecaster.forecast(horizons)
+
+
+class ForecastService:
+    """Routes du serveur: calcul des colonnes, cache des réponses encodées"""
+
+    def __init__(self, cities, param_sets, seed=0, cache=None):
+        self.cities = cities
+        self.mobility = build_mobility_matrix(cities, START_DATE)
+        self.inflow = mobility_model(cities).inflow(START_DATE)
+        self.cursors = {name: ModelCursor(cities, self.mobility, params, seed)
+                        for name, params in param_sets.items()}
+        self.cache = cache if cache is not None else TTLCache()
+        self._pending = {}
+
+    # -- Colonnes ------------------------------------------------------------
+
+    def zones(self, query):
+        return {
+            "id": zone_column(self.cities, "id").tolist(),
+            "name": zone_column(self.cities, "name").tolist(),
+            "district": zone_column(self.cities, "district").tolist(),
+            "lat": zone_column(self.cities, "coordinates")[:, 0],
+            "lon": zone_column(self.cities, "coordinates")[:, 1],
+            "population": zone_column(self.cities, "population", float),
+        }
+
+    def metrics(self, query):
+        cursor, day = self._cursor(query), self._day(query)
+        history = cursor.history(day)
+        risk = zone_risk(self.cities, history[-TREND_DAYS:, COMPARTMENTS.index("I")],
+                         self.mobility, self.inflow)
+        columns = {name: history[-1, k] for k, name in enumerate(COMPARTMENTS)}
+        columns.update({name: risk[name] for name in METRIC_COLUMNS if name in risk})
+        return columns
+
+    def predictions(self, query):
+        cursor, day = self._cursor(query), self._day(query)
+        predictions = cursor.forecast(day)
+        return {
+            "I": cursor.history(day)[day, COMPARTMENTS.index("I")],
+            "prediction_7d": predictions[7],
+            "prediction_14d": predictions[14],
+        }
+
+    def history(self, query):
+        cursor, day = self._cursor(query), self._day(query)
+        days = int(query.get("days", DEFAULT_HISTORY_DAYS))
+        names = query.get("compartments", "I,new_cases").split(",")
+        unknown = [name for name in names if name not in HISTORY_COLUMNS]
+        if unknown or days < 1:
+            raise ValueError(f"Colonnes inconnues ou fenêtre invalide: {unknown or days}")
+
+        history = cursor.history(day)
+        first = max(0, day - days + 1)
+        columns = {}
+        for name in names:
+            if name == "new_cases":
+                # Entrées en I du jour: σ × E de la veille (cf. MetapopulationSEIR.step)
+                exposed = history[max(0, first - 1):day, COMPARTMENTS.index("E")]
+                new_cases = cursor.model.params["sigma"] * exposed
+                if first == 0:
+                    new_cases = np.vstack([np.full((1, len(self.cities)), np.nan), new_cases])
+                columns[name] = new_cases
+            else:
+                columns[name] = history[first:, COMPARTMENTS.index(name)]
+        dates = [(START_DATE + datetime.timedelta(days=d)).isoformat()
+                 for d in range(first, day + 1)]
+        return {"date": dates, **columns}
+
+    def _cursor(self, query):
+        name = query.get("params", "default")
+        if name not in self.cursors:
+            raise ValueError(f"Jeu de paramètres inconnu: {name} ({', '.join(self.cursors)})")
+        return self.cursors[name]
+
+    def _day(self, query):
+        date = datetime.date.fromisoformat(query.get("day", REFERENCE_DATE.isoformat()))
+        day = (date - START_DATE).days
+        if not 0 <= day <= MAX_SIMULATION_DAYS:
+            raise ValueError(f"Jour hors de la plage simulable: {date.isoformat()}")
+        return day
+
+    # -- Réponses ------------------------------------------------------------
+
+    ROUTES = ("zones", "metrics", "predictions", "history")
+
+    def encode(self, route, query):
+        """
+        Calcule et encode une route (exécuté dans le pool de threads)
+
+        Returns:
+            (content_type, body, en-têtes supplémentaires)
+        """
+        columns = getattr(self, route)(query)
+        if query.get("format", "json") == "f32":
+            return encode_binary(columns)
+        return encode_json(columns)
+
+    async def respond(self, route, query):
+        """
+        Réponse d'une route: cache LRU/TTL, sinon calcul dans le pool
+
+        Des requêtes identiques simultanées attendent le même calcul.
+        """
+        key = (route,) + tuple(sorted(query.items()))
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            return await pending
+
+        loop = asyncio.get_running_loop()
+        pending = loop.run_in_executor(None, self.encode, route, query)
+        self._pending[key] = pending
+        try:
+            response = await pending
+        finally:
+            self._pending.pop(key, None)
+        self.cache.put(key, response)
+        return response
+
+
+def encode_json(columns):
+    """JSON columnaire: {"columns": [...], "data": {nom: valeurs}}"""
+    data = {}
+    for name, values in columns.items():
+        if isinstance(values, np.ndarray):
+            values = np.where(np.isnan(values), None, np.round(values, 3)).tolist() \
+                if values.dtype.kind == "f" else values.tolist()
+        data[name] = values
+    body = json.dumps({"columns": list(columns), "data": data},
+                      ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return "application/json; charset=utf-8", body, {}
+
+
+def encode_binary(columns):
+    """float32 little-endian (colonnes numériques, ...), forme dans X-Shape"""
+    numeric = {name: np.asarray(values, dtype="<f4") for name, values in columns.items()
+               if isinstance(values, np.ndarray)}
+    if not numeric:
+        raise ValueError("Aucune colonne numérique pour le format binaire")
+    stacked = np.stack(list(numeric.values()))
+    headers = {
+        "X-Columns": ",".join(numeric),
+        "X-Shape": ",".join(str(size) for size in stacked.shape),
+    }
+    return "application/octet-stream", stacked.tobytes(), headers
+
+
+# =============================================================================
+# HTTP
+# =============================================================================
+
+STATUS_TEXT = {200: "OK", 204: "No Content", 400: "Bad Request", 404: "Not Found",
+               405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+async def _send(writer, status, content_type=None, body=b"", headers=None):
+    lines = [
+        f"HTTP/1.1 {status} {STATUS_TEXT[status]}",
+        f"Content-Length: {len(body)}",
+        "Access-Control-Allow-Origin: *",
+        "Access-Control-Expose-Headers: X-Columns, X-Shape",
+        "Connection: close",
+    ]
+    if content_type:
+        lines.append(f"Content-Type: {content_type}")
+    lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+    await writer.drain()
+
+
+def _error(message):
+    return json.dumps({"error": message}, ensure_ascii=False).encode("utf-8")
+
+
+async def handle_client(service, reader, writer):
+    """Traite une requête HTTP (une par connexion)"""
+    try:
+        request_line = await reader.readline()
+        if len(request_line) > MAX_REQUEST_LINE:
+            await _send(writer, 400, "application/json", _error("Requête trop longue"))
+            return
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+            pass  # en-têtes ignorés
+
+        parts = request_line.decode("latin-1").split()
+        if len(parts) < 2:
+            await _send(writer, 400, "application/json", _error("Requête invalide"))
+            return
+        method, target = parts[0], parts[1]
+        if method == "OPTIONS":
+            await _send(writer, 204, headers={"Access-Control-Allow-Methods": "GET"})
+            return
+        if method != "GET":
+            await _send(writer, 405, "application/json", _error("Méthode non supportée"))
+            return
+
+        url = urlsplit(target)
+        route = url.path.strip("/")
+        if route not in service.ROUTES:
+            await _send(writer, 404, "application/json", _error(f"Route inconnue: {url.path}"))
+            return
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        try:
+            content_type, body, headers = await service.respond(route, query)
+        except ValueError as e:
+            await _send(writer, 400, "application/json", _error(str(e)))
+            return
+        await _send(writer, 200, content_type, body, headers)
+    except Exception as e:
+        await _send(writer, 500, "application/json", _error(str(e)))
+    finally:
+        writer.close()
+
+
+async def serve(service, host=HOST, port=PORT):
+    """Lance le serveur jusqu'à interruption"""
+    server = await asyncio.start_server(
+        lambda reader, writer: handle_client(service, reader, writer), host, port
+    )
+    async with server:
+        await server.serve_forever()
+
+
+# =============================================================================
+# POINT D'ENTRÉE
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Serveur local de prévisions du dashboard")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--params", default=CALIBRATION_FILE,
+                        help="paramètres calibrés, servis sous params=calibrated (si présent)")
+    parser.add_argument("--ttl", type=float, default=CACHE_TTL,
+                        help="durée de vie des réponses en cache (secondes)")
+    parser.add_argument("--cache-size", type=int, default=CACHE_SIZE)
+    args = parser.parse_args()
+
+    cities = load_cities()
+    param_sets = {"default": None}
+    if os.path.exists(args.params):
+        param_sets["calibrated"] = load_params(args.params, cities)
+
+    service = ForecastService(cities, param_sets, cache=TTLCache(args.cache_size, args.ttl))
+    print(f"🌐 Serveur de prévisions sur http://{args.host}:{args.port} "
+          f"({len(cities)} zones, paramètres: {', '.join(param_sets)})")
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        print("\n👋 Arrêt du serveur")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,12 +8,22 @@ conforme aux critères d'évaluation du challenge.
 """
 
 from pptx import Presentation
-from pptx.util import Inches, Pt
+from pptx.util import Emu, Inches, Pt
 from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
 from pptx.dml.color import RGBColor
 from pptx.enum.shapes import MSO_SHAPE
+from pptx.parts.image import Image, ImagePart
+import io
+import json
 import os
 
+import media
+from ensemble import ensemble_figures
+from charts import add_chart
+from cities import load_cities
+from seir_engine import CALIBRATION_FILE, deck_figures, load_params
+from slide_spec import compile_slide, load_spec, render_text
+
 # =============================================================================
 # CONFIGURATION - Charte Graphique Orange CI
 # =============================================================================
@@ -23,10 +33,54 @@ NOIR = RGBColor(0, 0, 0)                 # #000000
 GRIS_CLAIR = RGBColor(247, 247, 247)     # #F7F7F7
 BLANC = RGBColor(255, 255, 255)          # #FFFFFF
 
+# Couleurs accessibles par nom dans les spécifications de slides (slides/*.json)
+THEME = {
+    "ORANGE_CI": ORANGE_CI,
+    "NOIR": NOIR,
+    "GRIS_CLAIR": GRIS_CLAIR,
+    "BLANC": BLANC,
+}
+
+ALIGNMENTS = {
+    "left": PP_ALIGN.LEFT,
+    "center": PP_ALIGN.CENTER,
+    "right": PP_ALIGN.RIGHT,
+}
+
 # Chemins des images
 ARCHITECTURE_IMAGE = "architecture.png"
 ANONYMISATION_IMAGE = "anonymisation.png"
 
+# Hauteur affichée des images (largeur déduite des proportions)
+ARCHITECTURE_HEIGHT = Inches(3.5)
+ANONYMISATION_HEIGHT = Inches(4.5)
+
+# Résolution des images embarquées (rééchantillonnées au cadre d'affichage,
+# voir media.py); None pour embarquer les fichiers d'origine
+MEDIA_DPI = media.TARGET_DPI
+
+# Rapport de suppression k-anonymat (écrit par cdr_ingest.py --k)
+ANONYMISATION_REPORT = os.path.join("od", "anonymisation_report.json")
+
+# Synthèse du backtest J+7 / J+14 (écrite par backtest.py)
+BACKTEST_SUMMARY = "backtest_summary.json"
+
+# Tableau comparatif des scénarios d'intervention (écrit par scenarios.py)
+SCENARIOS_FILE = "scenarios.json"
+MAX_SCENARIO_ROWS = 8       # Lignes du tableau en annexe (référence incluse)
+
+# Chiffres sans valeur par défaut, lus directement par les slides 2 et 4
+REQUIRED_FIGURES = ("n_zones", "n_abidjan", "n_other", "prediction_7d", "prediction_14d")
+
+# Fichier de sortie par défaut
+OUTPUT_FILENAME = "Orange_Think_Tank_2025_Prediction_Epidemies.pptx"
+
+# Images déjà lues et hashées dans ce processus ((chemin, cadre) -> Image python-pptx)
+_MEDIA_CACHE = {}
+
+# Taille d'origine (octets) des images rééchantillonnées, par SHA1 embarqué
+_MEDIA_ORIGINAL_BYTES = {}
+
 # =============================================================================
 # FONCTIONS UTILITAIRES
 # =============================================================================
@@ -111,6 +165,84 @@ def add_page_number(slide, slide_number, total_slides=7):
     p.alignment = PP_ALIGN.RIGHT
 
 
+def load_image(image_path, width=None, height=None):
+    """
+    Lit une image une seule fois par processus (blob, SHA1 et taille en cache)
+
+    Avec un cadre d'affichage (EMU), l'image est rééchantillonnée à MEDIA_DPI
+    pour ce cadre (media.resample, cache disque par contenu et taille).
+    """
+    key = (image_path, width, height)
+    image = _MEDIA_CACHE.get(key)
+    if image is None:
+        if MEDIA_DPI is None or (width is None and height is None):
+            image = Image.from_file(image_path)
+        else:
+            image = Image.from_file(media.resample(image_path, (width, height), MEDIA_DPI))
+            _MEDIA_ORIGINAL_BYTES[image.sha1] = os.path.getsize(image_path)
+        _MEDIA_CACHE[key] = image
+    return image
+
+
+def display_box(image_path, width=None, height=None):
+    """Cadre affiché (EMU) d'une image, côté manquant déduit des proportions"""
+    if width is None and height is None:
+        return None, None
+    return media.display_size(load_image(image_path).size, width, height)
+
+
+def preload_media(images=((ARCHITECTURE_IMAGE, None, ARCHITECTURE_HEIGHT),
+                          (ANONYMISATION_IMAGE, None, ANONYMISATION_HEIGHT))):
+    """
+    Précharge les images des slides dans leur cadre d'affichage (utile avant
+    de générer plusieurs decks): (chemin, largeur, hauteur) en EMU
+
+    Les versions rééchantillonnées sont lues (ou produites) une fois, sous
+    la même clé que celle demandée par add_picture.
+    """
+    for image_path, width, height in images:
+        if os.path.exists(image_path):
+            load_image(image_path, *display_box(image_path, width, height))
+
+
+def add_picture(slide, image_path, left, top, width=None, height=None):
+    """
+    Ajoute une image sans relire le fichier
+
+    slide.shapes.add_picture sur le blob en cache au lieu du chemin: pas
+    d'accès disque, et python-pptx réutilise la partie image déjà présente
+    dans le deck (même SHA1) au lieu de la dupliquer. Avec une taille,
+    l'image embarquée est celle du cadre (voir load_image).
+    """
+    width, height = display_box(image_path, width, height)
+    image = load_image(image_path, width, height)
+    return slide.shapes.add_picture(io.BytesIO(image.blob), left, top, width, height)
+
+
+def media_savings(prs):
+    """
+    Octets d'images du deck: tailles d'origine, embarquées et économisées
+
+    Returns:
+        dict: original_bytes, embedded_bytes, saved_bytes
+    """
+    original = embedded = 0
+    for part in prs.part.package.iter_parts():
+        if isinstance(part, ImagePart):
+            embedded += len(part.blob)
+            original += _MEDIA_ORIGINAL_BYTES.get(part.sha1, len(part.blob))
+    return {
+        "original_bytes": original,
+        "embedded_bytes": embedded,
+        "saved_bytes": original - embedded,
+    }
+
+
+def format_int(value):
+    """Formate un entier à la française (espace comme séparateur de milliers)"""
+    return f"{int(value):,}".replace(",", " ")
+
+
 def add_bullet_point(text_frame, text, level=0, font_size=16):
     """Ajoute un point de liste"""
     p = text_frame.add_paragraph()
@@ -121,11 +253,65 @@ def add_bullet_point(text_frame, text, level=0, font_size=16):
     return p
 
 
+def render_plan(slide, plan, figures=None):
+    """
+    Émet les formes d'un plan compilé (voir slide_spec.compile_slide)
+
+    Les positions sont déjà en EMU: seuls les textes sont formatés.
+    """
+    if plan["title"]:
+        add_title(slide, plan["title"]["text"], plan["title"].get("font_size", 44))
+
+    for op in plan["ops"]:
+        position = (Emu(op["left"]), Emu(op["top"]))
+        style = op["style"]
+
+        if op["kind"] == "image":
+            if os.path.exists(style["path"]):
+                add_picture(slide, style["path"], *position,
+                            width=op["width"] and Emu(op["width"]),
+                            height=op["height"] and Emu(op["height"]))
+            continue
+
+        size = (Emu(op["width"]), Emu(op["height"]))
+        text = render_text(op["text"], figures)
+        if op["kind"] == "box":
+            shape = add_shape_with_text(
+                slide, *position, *size, text,
+                fill_color=RGBColor(*style["fill"]),
+                line_color=RGBColor(*style["line"]),
+                font_size=style["font_size"],
+                font_color=RGBColor(*style["font_color"])
+            )
+            paragraph = shape.text_frame.paragraphs[0]
+            paragraph.alignment = ALIGNMENTS[style["align"]]
+            if style["bold"]:
+                paragraph.font.bold = True
+        else:
+            add_text_box(
+                slide, *position, *size, text,
+                font_size=style["font_size"],
+                bold=style["bold"],
+                color=RGBColor(*style["font_color"]),
+                alignment=ALIGNMENTS[style["align"]]
+            )
+
+    if plan["page"]:
+        add_page_number(slide, plan["page"])
+
+
+def create_slide_from_spec(prs, spec_path, figures=None):
+    """Crée une slide à partir d'une spécification JSON/YAML (plan mis en cache)"""
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    render_plan(slide, compile_slide(load_spec(spec_path), THEME), figures)
+    return slide
+
+
 # =============================================================================
 # CRÉATION DES SLIDES
 # =============================================================================
 
-def create_slide_1_title(prs):
+def create_slide_1_title(prs, figures=None):
     """
     SLIDE 1: Page de Titre + Problématique
     """
@@ -180,6 +366,8 @@ def create_slide_1_title(prs):
     )
     p = footer.text_frame.paragraphs[0]
     p.text = "Orange Think Tank Challenge 2025 | Thème Santé"
+    if figures and figures.get("scope"):
+        p.text += f" | {figures['scope']}"
     p.font.size = Pt(14)
     p.font.color.rgb = NOIR
     p.alignment = PP_ALIGN.CENTER
@@ -190,7 +378,7 @@ def create_slide_1_title(prs):
     return slide
 
 
-def create_slide_2_solution(prs):
+def create_slide_2_solution(prs, figures):
     """
     SLIDE 2: La Solution - Architecture du Système
     """
@@ -204,8 +392,8 @@ def create_slide_2_solution(prs):
     if os.path.exists(ARCHITECTURE_IMAGE):
         left = Inches(1.5)
         top = Inches(1.5)
-        pic = slide.shapes.add_picture(
-            ARCHITECTURE_IMAGE, left, top, height=Inches(3.5)
+        pic = add_picture(
+            slide, ARCHITECTURE_IMAGE, left, top, height=ARCHITECTURE_HEIGHT
         )
 
     # 3 Points clés (en bas)
@@ -229,18 +417,22 @@ def create_slide_2_solution(prs):
     add_shape_with_text(
         slide,
         Inches(0.5) + point_width + spacing, points_top, point_width, point_height,
-        "Prédictions 7-14 jours\n\nAnticipation pour allocation\noptimale des ressources",
+        "Prédictions 7-14 jours\n\n"
+        f"J+7: {format_int(figures['prediction_7d'])} cas actifs\n"
+        f"J+14: {format_int(figures['prediction_14d'])} cas actifs",
         fill_color=GRIS_CLAIR,
         line_color=ORANGE_CI,
         font_size=14,
         font_color=NOIR
     )
 
-    # Point 3: 30 zones
+    # Point 3: zones couvertes
     add_shape_with_text(
         slide,
         Inches(0.5) + 2*(point_width + spacing), points_top, point_width, point_height,
-        "30 zones couvertes\n\n13 communes d'Abidjan\n+ 17 villes majeures",
+        f"{figures['n_zones']} zones couvertes\n\n"
+        f"{figures['n_abidjan']} communes d'Abidjan\n"
+        f"+ {figures['n_other']} villes majeures",
         fill_color=GRIS_CLAIR,
         line_color=ORANGE_CI,
         font_size=14,
@@ -253,7 +445,7 @@ def create_slide_2_solution(prs):
     return slide
 
 
-def create_slide_3_anonymisation(prs):
+def create_slide_3_anonymisation(prs, figures=None):
     """
     SLIDE 3: Protection des Données - Anonymisation
     """
@@ -267,15 +459,25 @@ def create_slide_3_anonymisation(prs):
     if os.path.exists(ANONYMISATION_IMAGE):
         left = Inches(1.5)
         top = Inches(1.3)
-        pic = slide.shapes.add_picture(
-            ANONYMISATION_IMAGE, left, top, height=Inches(4.5)
+        pic = add_picture(
+            slide, ANONYMISATION_IMAGE, left, top, height=ANONYMISATION_HEIGHT
+        )
+
+    # Garantie k-anonymat: chiffres réels si un rapport de suppression existe
+    report = (figures or {}).get("anonymisation")
+    if report:
+        k_anonymity = (
+            f"✓ K-anonymat k≥{report['k']}: {format_int(report['cells_published'])} flux "
+            f"publiés, {str(report['suppressed_pct']).replace('.', ',')}% supprimés"
         )
+    else:
+        k_anonymity = "✓ K-anonymat k≥50 personnes par groupe"
 
     # Encadré garanties (en bas)
     guarantees_box = add_shape_with_text(
         slide,
         Inches(0.8), Inches(6), Inches(8.4), Inches(0.9),
-        "✓ K-anonymat k≥50 personnes par groupe  •  ✓ Aucun identifiant personnel conservé\n"
+        f"{k_anonymity}  •  ✓ Aucun identifiant personnel conservé\n"
         "✓ Conformité RGPD et législation ivoirienne  •  ✓ Comité d'éthique de supervision",
         fill_color=RGBColor(250, 200, 150),  # Orange très léger
         line_color=ORANGE_CI,
@@ -290,119 +492,38 @@ def create_slide_3_anonymisation(prs):
     return slide
 
 
-def create_slide_4_methodologie(prs):
-    """
-    SLIDE 4: Méthodologie - Comment ça Marche?
+def interval_claims(figures):
     """
-    slide_layout = prs.slide_layouts[6]
-    slide = prs.slides.add_slide(slide_layout)
-
-    # Titre
-    add_title(slide, "Méthodologie: De la Donnée à la Prédiction", 40)
-
-    # 4 étapes horizontales avec flèches
-    box_width = Inches(2.0)
-    box_height = Inches(3.8)
-    box_top = Inches(1.8)
-    spacing = Inches(0.15)
-    arrow_width = Inches(0.3)
-
-    # Étape 1: COLLECTE
-    box1 = add_shape_with_text(
-        slide,
-        Inches(0.5), box_top, box_width, box_height,
-        "ÉTAPE 1: COLLECTE\n\n"
-        "• 15M d'abonnés Orange CI\n"
-        "• Données CDR (Call Detail Records)\n"
-        "• Matrices origine-destination quotidiennes",
-        fill_color=GRIS_CLAIR,
-        line_color=ORANGE_CI,
-        font_size=13,
-        font_color=NOIR
-    )
+    Lignes d'intervalle de confiance des slides 4 et 6
 
-    # Flèche 1
-    add_text_box(
-        slide,
-        Inches(0.5) + box_width, box_top + box_height/2 - Inches(0.2),
-        arrow_width, Inches(0.4),
-        "→",
-        font_size=32,
-        color=ORANGE_CI,
-        alignment=PP_ALIGN.CENTER
-    )
-
-    # Étape 2: TRAITEMENT
-    x2 = Inches(0.5) + box_width + arrow_width + spacing
-    box2 = add_shape_with_text(
-        slide,
-        x2, box_top, box_width, box_height,
-        "ÉTAPE 2: TRAITEMENT\n\n"
-        "• Anonymisation K-anonymat k≥50\n"
-        "• Agrégation spatiale (30 zones)\n"
-        "• Agrégation temporelle",
-        fill_color=GRIS_CLAIR,
-        line_color=ORANGE_CI,
-        font_size=13,
-        font_color=NOIR
-    )
-
-    # Flèche 2
-    add_text_box(
-        slide,
-        x2 + box_width, box_top + box_height/2 - Inches(0.2),
-        arrow_width, Inches(0.4),
-        "→",
-        font_size=32,
-        color=ORANGE_CI,
-        alignment=PP_ALIGN.CENTER
-    )
-
-    # Étape 3: MODÉLISATION
-    x3 = x2 + box_width + arrow_width + spacing
-    box3 = add_shape_with_text(
-        slide,
-        x3, box_top, box_width, box_height,
-        "ÉTAPE 3: MODÉLISATION\n\n"
-        "• Modèle SEIR métapopulationnel\n"
-        "• Intégration flux de mobilité\n"
-        "• Calibration sur épidémies passées",
-        fill_color=GRIS_CLAIR,
-        line_color=ORANGE_CI,
-        font_size=13,
-        font_color=NOIR
-    )
+    Remplies seulement si les chiffres viennent d'un ensemble Monte Carlo
+    (ensemble.summarize_ensemble); sinon, textes du deck d'origine
+    (slide_spec.FIGURE_DEFAULTS).
+    """
+    if "ci_level" not in figures:
+        return {}
+    return {
+        "ci_line": (f"• IC {figures['ci_level']}%: ±{figures['ci_7d_pct']}% (J+7), "
+                    f"±{figures['ci_14d_pct']}% (J+14)\n"),
+        "interval_claim": (f"Intervalle de confiance ±{figures['ci_7d_pct']}% "
+                           f"({figures['n_runs']} simulations)"),
+    }
 
-    # Flèche 3
-    add_text_box(
-        slide,
-        x3 + box_width, box_top + box_height/2 - Inches(0.2),
-        arrow_width, Inches(0.4),
-        "→",
-        font_size=32,
-        color=ORANGE_CI,
-        alignment=PP_ALIGN.CENTER
-    )
 
-    # Étape 4: PRÉDICTIONS
-    x4 = x3 + box_width + arrow_width + spacing
-    box4 = add_shape_with_text(
-        slide,
-        x4, box_top, box_width, box_height,
-        "ÉTAPE 4: PRÉDICTIONS\n\n"
-        "• Prédictions J+7 et J+14\n"
-        "• Précision visée >75%\n"
-        "• Identification zones à risque",
-        fill_color=GRIS_CLAIR,
-        line_color=ORANGE_CI,
-        font_size=13,
-        font_color=NOIR
-    )
-
-    # Numéro de page
-    add_page_number(slide, 4)
+def create_slide_4_methodologie(prs, figures):
+    """
+    SLIDE 4: Méthodologie - Comment ça Marche?
 
-    return slide
+    4 étapes horizontales avec flèches, décrites dans slides/methodologie.json
+    """
+    # Précision mesurée par le backtest si disponible, objectif sinon
+    accuracy = (figures.get("backtest") or {}).get("7", {}).get("accuracy")
+    if accuracy is not None:
+        claim = f"Précision mesurée {accuracy:.0f}% (J+7)"
+    else:
+        claim = "Précision visée >75%"
+    return create_slide_from_spec(prs, "methodologie.json",
+                                  {**figures, **interval_claims(figures), "accuracy_claim": claim})
 
 
 def create_slide_5_livrables(prs):
@@ -569,90 +690,22 @@ def create_slide_5_livrables(prs):
     return slide
 
 
-def create_slide_6_risques(prs):
+def create_slide_6_risques(prs, figures):
     """
     SLIDE 6: Risques & Stratégies de Mitigation
-    """
-    slide_layout = prs.slide_layouts[6]
-    slide = prs.slides.add_slide(slide_layout)
-
-    # Titre
-    add_title(slide, "Risques Identifiés & Solutions", 44)
-
-    # Tableau 2 colonnes (4 lignes de risques)
-    col1_left = Inches(0.5)
-    col2_left = Inches(5.2)
-    col_width = Inches(4.5)
-    row_height = Inches(1.15)
-    top_start = Inches(1.5)
-    row_spacing = Inches(0.05)
-
-    risques = [
-        {
-            "risque": "1. Vie privée des citoyens",
-            "mitigation": "• K-anonymat renforcé (k≥50)\n"
-                         "• Suppression totale des identifiants\n"
-                         "• Comité d'éthique indépendant\n"
-                         "• Audits annuels par tiers"
-        },
-        {
-            "risque": "2. Précision des modèles",
-            "mitigation": "• Calibration sur épidémies passées (COVID, Dengue)\n"
-                         "• Validation scientifique continue\n"
-                         "• Intervalle de confiance ±15%\n"
-                         "• Amélioration continue"
-        },
-        {
-            "risque": "3. Adoption par utilisateurs",
-            "mitigation": "• Formation complète (20-30 personnes)\n"
-                         "• Interface intuitive et visuelle\n"
-                         "• Support technique dédié\n"
-                         "• Co-conception avec Ministère Santé"
-        },
-        {
-            "risque": "4. Pérennité du système",
-            "mitigation": "• Transfert de compétences progressif\n"
-                         "• Documentation exhaustive\n"
-                         "• Modèle économique long terme\n"
-                         "• Infrastructure scalable (cloud)"
-        }
-    ]
-
-    for i, risk_item in enumerate(risques):
-        row_top = top_start + i * (row_height + row_spacing)
 
-        # Colonne RISQUE
-        risk_box = add_shape_with_text(
-            slide,
-            col1_left, row_top, col_width, row_height,
-            risk_item["risque"],
-            fill_color=RGBColor(255, 240, 230),  # Orange très léger
-            line_color=ORANGE_CI,
-            font_size=14,
-            font_color=NOIR
-        )
-        risk_box.text_frame.paragraphs[0].font.bold = True
-
-        # Colonne MITIGATION
-        mitigation_box = add_shape_with_text(
-            slide,
-            col2_left, row_top, col_width, row_height,
-            risk_item["mitigation"],
-            fill_color=BLANC,
-            line_color=ORANGE_CI,
-            font_size=12,
-            font_color=NOIR
-        )
-
-    # Numéro de page
-    add_page_number(slide, 6)
-
-    return slide
+    Tableau 2 colonnes (4 lignes de risques), décrit dans slides/risques.json
+    """
+    return create_slide_from_spec(prs, "risques.json", {**figures, **interval_claims(figures)})
 
 
-def create_slide_7_prototype(prs):
+def create_slide_7_prototype(prs, figures=None):
     """
     SLIDE 7: Démonstration du Prototype
+
+    Graphiques natifs (évolution des zones les plus touchées, prévisions
+    J+7) si les séries de la simulation sont disponibles, sinon un
+    emplacement pour une capture d'écran du dashboard.
     """
     slide_layout = prs.slide_layouts[6]
     slide = prs.slides.add_slide(slide_layout)
@@ -660,23 +713,38 @@ def create_slide_7_prototype(prs):
     # Titre
     add_title(slide, "Prototype Fonctionnel", 44)
 
-    # Message pour capture d'écran
-    placeholder_box = add_shape_with_text(
-        slide,
-        Inches(1.5), Inches(2), Inches(7), Inches(3.5),
-        "CAPTURE D'ÉCRAN DU DASHBOARD\n\n"
-        "À insérer ici:\n"
-        "• Carte 3D de Côte d'Ivoire avec zones colorées\n"
-        "• 4 KPI principaux (Cas actifs, Mobilité, Zones à risque, Prédiction J+7)\n"
-        "• Graphique d'évolution temporelle\n"
-        "• Tableau des régions\n\n"
-        "(Veuillez capturer une vue du dashboard et remplacer cette zone)",
-        fill_color=GRIS_CLAIR,
-        line_color=ORANGE_CI,
-        font_size=16,
-        font_color=NOIR
-    )
-    placeholder_box.text_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
+    charts = (figures or {}).get("charts")
+    if charts:
+        trend = charts["trend"]
+        add_chart(
+            slide, "line", trend["categories"], trend["series"],
+            Inches(0.3), Inches(1.3), Inches(5.4), Inches(4.4),
+            title=f"Cas actifs: {len(trend['series'])} zones les plus à risque",
+        )
+        prediction = charts["prediction_7d"]
+        add_chart(
+            slide, "bar", prediction["categories"], {"Prédiction J+7": prediction["values"]},
+            Inches(5.8), Inches(1.3), Inches(3.9), Inches(4.4),
+            title="Prédiction J+7 par zone", legend=None,
+        )
+    else:
+        # Message pour capture d'écran
+        placeholder_box = add_shape_with_text(
+            slide,
+            Inches(1.5), Inches(2), Inches(7), Inches(3.5),
+            "CAPTURE D'ÉCRAN DU DASHBOARD\n\n"
+            "À insérer ici:\n"
+            "• Carte 3D de Côte d'Ivoire avec zones colorées\n"
+            "• 4 KPI principaux (Cas actifs, Mobilité, Zones à risque, Prédiction J+7)\n"
+            "• Graphique d'évolution temporelle\n"
+            "• Tableau des régions\n\n"
+            "(Veuillez capturer une vue du dashboard et remplacer cette zone)",
+            fill_color=GRIS_CLAIR,
+            line_color=ORANGE_CI,
+            font_size=16,
+            font_color=NOIR
+        )
+        placeholder_box.text_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
 
     # Call to action
     cta_box = add_shape_with_text(
@@ -697,48 +765,173 @@ def create_slide_7_prototype(prs):
     return slide
 
 
+def create_slide_scenarios(prs, figures):
+    """
+    ANNEXE: Comparaison des scénarios d'intervention (scenarios.py)
+
+    Référence en tête, puis les scénarios qui évitent le plus de cas.
+    """
+    slide_layout = prs.slide_layouts[6]
+    slide = prs.slides.add_slide(slide_layout)
+
+    add_title(slide, "Annexe: Scénarios d'Intervention", 36)
+
+    scenarios = figures["scenarios"]
+    reference, others = scenarios["rows"][0], scenarios["rows"][1:]
+    others = sorted(others, key=lambda row: -row["cases_averted"])
+    rows = [reference] + others[:MAX_SCENARIO_ROWS - 1]
+
+    header = ("Scénario", "Pic (cas actifs)", "Cas évités", "Mobilité perdue")
+    table = slide.shapes.add_table(
+        len(rows) + 1, len(header),
+        Inches(0.5), Inches(1.4), Inches(9), Inches(0.45) * (len(rows) + 1)
+    ).table
+    for column, width in enumerate((3.6, 1.9, 1.8, 1.7)):
+        table.columns[column].width = Inches(width)
+
+    cells = [header] + [
+        (row["name"], format_int(row["peak_cases"]), format_int(row["cases_averted"]),
+         f"{row['mobility_lost_pct']:.0f}%")
+        for row in rows
+    ]
+    for i, values in enumerate(cells):
+        for j, value in enumerate(values):
+            cell = table.cell(i, j)
+            cell.fill.solid()
+            cell.fill.fore_color.rgb = ORANGE_CI if i == 0 else (GRIS_CLAIR if i % 2 else BLANC)
+            p = cell.text_frame.paragraphs[0]
+            p.text = value
+            p.font.size = Pt(13)
+            p.font.bold = i == 0
+            p.font.color.rgb = BLANC if i == 0 else NOIR
+            p.alignment = PP_ALIGN.LEFT if j == 0 else PP_ALIGN.RIGHT
+
+    add_text_box(
+        slide,
+        Inches(0.5), Inches(6.4), Inches(9), Inches(0.5),
+        f"Simulation sur {scenarios['days']} jours; cas évités par rapport à "
+        "l'absence d'intervention.",
+        font_size=12
+    )
+    return slide
+
+
 # =============================================================================
 # FONCTION PRINCIPALE
 # =============================================================================
 
-def create_presentation():
+def build_presentation(figures, verbose=False):
     """
-    Fonction principale qui crée la présentation complète
+    Construit les 7 slides en mémoire (sans sauvegarde)
+
+    Args:
+        figures: chiffres des slides (voir create_presentation)
+        verbose: affiche la progression slide par slide
+    Returns:
+        Presentation
     """
-    print("🚀 Début de la création de la présentation...")
+    def log(message):
+        if verbose:
+            print(message)
 
     # Créer une nouvelle présentation
     prs = Presentation()
     prs.slide_width = Inches(10)  # 16:9
     prs.slide_height = Inches(7.5)
 
-    print("📄 Création de la Slide 1: Titre et Problématique...")
-    create_slide_1_title(prs)
+    log("📄 Création de la Slide 1: Titre et Problématique...")
+    create_slide_1_title(prs, figures)
 
-    print("📄 Création de la Slide 2: Solution et Architecture...")
-    create_slide_2_solution(prs)
+    log("📄 Création de la Slide 2: Solution et Architecture...")
+    create_slide_2_solution(prs, figures)
 
-    print("📄 Création de la Slide 3: Anonymisation...")
-    create_slide_3_anonymisation(prs)
+    log("📄 Création de la Slide 3: Anonymisation...")
+    create_slide_3_anonymisation(prs, figures)
 
-    print("📄 Création de la Slide 4: Méthodologie...")
-    create_slide_4_methodologie(prs)
+    log("📄 Création de la Slide 4: Méthodologie...")
+    create_slide_4_methodologie(prs, figures)
 
-    print("📄 Création de la Slide 5: Livrables et Impacts...")
+    log("📄 Création de la Slide 5: Livrables et Impacts...")
     create_slide_5_livrables(prs)
 
-    print("📄 Création de la Slide 6: Risques et Mitigations...")
-    create_slide_6_risques(prs)
+    log("📄 Création de la Slide 6: Risques et Mitigations...")
+    create_slide_6_risques(prs, figures)
+
+    log("📄 Création de la Slide 7: Prototype...")
+    create_slide_7_prototype(prs, figures)
+
+    if figures.get("scenarios"):
+        log("📄 Création de l'annexe: Scénarios d'intervention...")
+        create_slide_scenarios(prs, figures)
+
+    return prs
+
+
+def compute_figures():
+    """Chiffres nationaux: simulation SEIR et ensemble Monte Carlo"""
+    cities = load_cities()
+    params = None
+    if os.path.exists(CALIBRATION_FILE):
+        print(f"🎯 Paramètres calibrés: {CALIBRATION_FILE}")
+        params = load_params(CALIBRATION_FILE, cities)
+    print("🦠 Simulation SEIR métapopulationnelle...")
+    figures = deck_figures(cities, params=params)
+    print("🎲 Ensemble Monte Carlo pour les prévisions et intervalles de confiance...")
+    figures.update(ensemble_figures(cities, params=params))
+    return figures
+
+
+def attach_artifacts(figures, root="."):
+    """
+    Ajoute aux chiffres les rapports JSON présents sur disque (anonymisation,
+    scénarios, backtest), sans écraser ceux déjà fournis
+
+    Args:
+        root: dossier où chercher les rapports (défaut: dossier courant)
+    """
+    anonymisation_report = os.path.join(root, ANONYMISATION_REPORT)
+    if "anonymisation" not in figures and os.path.exists(anonymisation_report):
+        with open(anonymisation_report, encoding="utf-8") as f:
+            figures["anonymisation"] = json.load(f)
+
+    scenarios_file = os.path.join(root, SCENARIOS_FILE)
+    if "scenarios" not in figures and os.path.exists(scenarios_file):
+        with open(scenarios_file, encoding="utf-8") as f:
+            figures["scenarios"] = json.load(f)
+
+    backtest_summary = os.path.join(root, BACKTEST_SUMMARY)
+    if "backtest" not in figures and os.path.exists(backtest_summary):
+        with open(backtest_summary, encoding="utf-8") as f:
+            figures["backtest"] = json.load(f)["national"]
+    return figures
+
+
+def create_presentation(figures=None, output_filename=OUTPUT_FILENAME):
+    """
+    Fonction principale qui crée la présentation complète
+
+    Args:
+        figures: chiffres issus du moteur SEIR (voir seir_engine.deck_figures
+            et ensemble.ensemble_figures); calculés automatiquement si absents
+        output_filename: chemin du fichier .pptx à écrire
+    """
+    print("🚀 Début de la création de la présentation...")
+
+    if figures is None:
+        figures = compute_figures()
 
-    print("📄 Création de la Slide 7: Prototype...")
-    create_slide_7_prototype(prs)
+    attach_artifacts(figures)
+    prs = build_presentation(figures, verbose=True)
 
     # Sauvegarder la présentation
-    output_filename = "Orange_Think_Tank_2025_Prediction_Epidemies.pptx"
     prs.save(output_filename)
 
     print(f"\n✅ Présentation créée avec succès: {output_filename}")
     print(f"📊 Nombre de slides: {len(prs.slides)}")
+    savings = media_savings(prs)
+    if savings["saved_bytes"]:
+        print(f"🖼️  Images: {savings['embedded_bytes'] / 1024:.0f} Ko embarqués "
+              f"({savings['saved_bytes'] / 1024:.0f} Ko économisés)")
     print("\n📋 Résumé:")
     print("  - Slide 1: Titre et Problématique")
     print("  - Slide 2: Solution et Architecture (avec architecture.png)")
@@ -747,9 +940,12 @@ def create_presentation():
     print("  - Slide 5: Livrables et Impacts (2 colonnes)")
     print("  - Slide 6: Risques et Mitigations")
     print("  - Slide 7: Prototype")
+    if figures.get("scenarios"):
+        print("  - Annexe: Scénarios d'intervention")
     print("\n⚠️  N'oubliez pas:")
     print("  - Vérifier que architecture.png et anonymisation.png sont dans le même dossier")
-    print("  - Ajouter une capture d'écran du dashboard sur la slide 7")
+    if not figures.get("charts"):
+        print("  - Ajouter une capture d'écran du dashboard sur la slide 7")
     print("  - Vérifier les couleurs et ajuster si nécessaire")
 
     return output_filename
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Utilitaires géographiques vectorisés et index spatial des zones
+
+Portage de src/utils/geoUtils.js pour les moteurs Python: au lieu d'appeler
+haversineDistance paire par paire et isWithinRadius en parcours linéaire,
+les zones (30 villes, 393 sous-préfectures ou plus) sont indexées une fois
+dans un arbre k-d (scipy.spatial.cKDTree) sur leurs vecteurs unitaires 3D.
+La corde entre deux vecteurs unitaires est une fonction croissante de la
+distance de Haversine: plus proche voisin et requêtes de rayon sont donc
+exacts, en O(log N) par point, sur des millions de points à la fois.
+
+L'index est persisté (pickle) sous .cache/geo, indexé par un hash des
+identifiants et coordonnées des zones. Sans scipy, les requêtes se font
+par blocs de points en force brute (mémoire bornée).
+"""
+
+import hashlib
+import json
+import os
+import pickle
+
+import numpy as np
+
+from cities import zone_column
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+EARTH_RADIUS_KM = 6371
+
+# Cache disque des index spatiaux
+GEO_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), ".cache", "geo"
+)
+
+# Champs de la table de zones qui influencent l'index
+INDEX_FIELDS = ("id", "coordinates")
+
+POINT_CHUNK = 100_000       # Points traités à la fois en force brute
+
+# =============================================================================
+# FONCTIONS
+# =============================================================================
+
+def haversine_matrix(lat, lon, rows=slice(None)):
+    """
+    Distances de Haversine (km) entre toutes les paires de points
+
+    Args:
+        lat, lon: tableaux (N,) en degrés
+        rows: lignes (origines) à calculer, toutes par défaut
+    Returns:
+        np.ndarray (R, N)
+    """
+    lat = np.radians(np.asarray(lat, dtype=float))
+    lon = np.radians(np.asarray(lon, dtype=float))
+    dlat = lat[None, :] - lat[rows, None]
+    dlon = lon[None, :] - lon[rows, None]
+    a = (np.sin(dlat / 2) ** 2
+         + np.cos(lat[rows])[:, None] * np.cos(lat)[None, :] * np.sin(dlon / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+def unit_vectors(lat, lon):
+    """Vecteurs unitaires 3D (N, 3) de points en degrés"""
+    lat = np.radians(np.asarray(lat, dtype=float))
+    lon = np.radians(np.asarray(lon, dtype=float))
+    cos_lat = np.cos(lat)
+    return np.column_stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)])
+
+
+def chord_to_km(chord):
+    """Distance de Haversine (km) correspondant à une corde sur la sphère unité"""
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.clip(np.asarray(chord) / 2, 0, 1))
+
+
+def km_to_chord(distance_km):
+    """Corde sur la sphère unité correspondant à une distance (km)"""
+    return 2 * np.sin(np.minimum(np.asarray(distance_km) / (2 * EARTH_RADIUS_KM), np.pi / 2))
+
+
+def zone_table_hash(cities):
+    """Hash stable des identifiants et coordonnées des zones (clé du cache)"""
+    table = [[city.get(field) for field in INDEX_FIELDS] for city in cities]
+    payload = json.dumps(table, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+
+# =============================================================================
+# INDEX SPATIAL
+# =============================================================================
+
+class ZoneIndex:
+    """
+    Index spatial des zones: plus proche zone, zones dans un rayon, distances
+
+    Attributs principaux:
+        coordinates: np.ndarray (N, 2) lat / lon en degrés
+        vectors: np.ndarray (N, 3) vecteurs unitaires
+        tree: scipy.spatial.cKDTree (None sans scipy)
+    """
+
+    def __init__(self, cities):
+        self.coordinates = zone_column(cities, "coordinates", float)
+        self.vectors = unit_vectors(self.coordinates[:, 0], self.coordinates[:, 1])
+        try:
+            from scipy.spatial import cKDTree
+        except ImportError:
+            self.tree = None
+        else:
+            self.tree = cKDTree(self.vectors)
+
+    @classmethod
+    def load(cls, cities, cache_dir=GEO_CACHE_DIR):
+        """Charge l'index depuis le cache, ou le construit et le persiste"""
+        if cache_dir is None:
+            return cls(cities)
+
+        path = os.path.join(cache_dir, f"zones_{zone_table_hash(cities)}.pkl")
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                index = pickle.load(f)
+            if index.tree is not None:
+                return index
+
+        index = cls(cities)
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        return index
+
+    def __len__(self):
+        return len(self.coordinates)
+
+    def nearest(self, lat, lon):
+        """
+        Zone la plus proche de chaque point
+
+        Args:
+            lat, lon: tableaux (P,) en degrés
+        Returns:
+            tuple (indices de zone (P,), distances en km (P,))
+        """
+        points = unit_vectors(lat, lon)
+        if self.tree is not None:
+            chord, zone = self.tree.query(points)
+            return zone.astype(np.intp), chord_to_km(chord)
+
+        zone = np.empty(len(points), dtype=np.intp)
+        chord = np.empty(len(points))
+        for start in range(0, len(points), POINT_CHUNK):
+            block = points[start:start + POINT_CHUNK]
+            # |a - b|² = 2 - 2 a·b pour des vecteurs unitaires
+            squared = np.maximum(2 - 2 * block @ self.vectors.T, 0)
+            zone[start:start + len(block)] = np.argmin(squared, axis=1)
+            chord[start:start + len(block)] = np.sqrt(squared.min(axis=1))
+        return zone, chord_to_km(chord)
+
+    def within_radius(self, lat, lon, radius_km):
+        """
+        Paires (point, zone) à moins de `radius_km` (isWithinRadius en bloc)
+
+        Returns:
+            tuple (indices de point, indices de zone), triés par point
+        """
+        points = unit_vectors(lat, lon)
+        radius = km_to_chord(radius_km)
+        if self.tree is not None:
+            neighbours = self.tree.query_ball_point(points, radius)
+            counts = np.fromiter((len(n) for n in neighbours), dtype=np.intp,
+                                 count=len(neighbours))
+            point_idx = np.repeat(np.arange(len(points)), counts)
+            zone_idx = np.fromiter((z for n in neighbours for z in n), dtype=np.intp,
+                                   count=int(counts.sum()))
+            return point_idx, zone_idx
+
+        point_parts, zone_parts = [], []
+        for start in range(0, len(points), POINT_CHUNK):
+            block = points[start:start + POINT_CHUNK]
+            squared = np.maximum(2 - 2 * block @ self.vectors.T, 0)
+            p, z = np.nonzero(squared <= radius ** 2)
+            point_parts.append(p + start)
+            zone_parts.append(z)
+        return np.concatenate(point_parts), np.concatenate(zone_parts)
+
+    def zones_within(self, zone, radius_km):
+        """Indices des zones (triés) à moins de `radius_km` de la zone `zone`"""
+        lat, lon = self.coordinates[zone]
+        return np.sort(self.within_radius([lat], [lon], radius_km)[1])
+
+    def distance_matrix(self, rows=slice(None)):
+        """Distances (R, N) en km entre les zones `rows` et toutes les zones"""
+        return haversine_matrix(self.coordinates[:, 0], self.coordinates[:, 1], rows)
+
+    def sparse_distance_matrix(self, max_km):
+        """
+        Distances (km) des paires de zones à moins de `max_km`, en CSR
+
+        Seules les paires proches sont calculées (parcours de l'arbre): la
+        mémoire suit le nombre de voisins, pas N². La diagonale est absente.
+        """
+        if self.tree is None:
+            raise ImportError(
+                "scipy est requis pour la matrice de distances creuse (pip install scipy)"
+            )
+        pairs = self.tree.sparse_distance_matrix(self.tree, km_to_chord(max_km),
+                                                 output_type="coo_matrix").tocsr()
+        pairs.data = chord_to_km(pairs.data)
+        pairs.eliminate_zeros()
+        return pairs
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Historique de simulation colonnaire, préalloué, optionnellement circulaire
+
+Remplace les tableaux history.S/E/I/R par zone et les instantanés
+getMetrics() quotidiens de EpidemicModel.js par un seul tableau
+(jours, compartiments, zones) en float32:
+
+- capacité fixe (`capacity`) ou fenêtre glissante (`window`): en mode
+  circulaire chaque jour est écrit deux fois (positions i et i + window),
+  si bien que les k derniers jours sont toujours une vue contiguë, sans
+  copie, obtenue en O(1);
+- stockage en mémoire ou sur disque (`path`, np.memmap au format .npy):
+  les longues simulations restent hors de la RAM et les graphiques des
+  slides lisent directement la projection mémoire.
+
+Les métadonnées (fenêtre, nombre de jours écrits, compartiments) sont
+écrites à côté du fichier (`<path>.json`) par flush().
+"""
+
+import json
+
+import numpy as np
+
+# =============================================================================
+# HISTORIQUE
+# =============================================================================
+
+class HistoryStore:
+    """
+    Historique (jours, compartiments, zones) d'une simulation
+
+    Attributs principaux:
+        compartments: noms des compartiments (ex: ("S", "E", "I", "R"))
+        window: taille de la fenêtre glissante (None si capacité fixe)
+        total_days: nombre de jours écrits depuis la création
+    """
+
+    def __init__(self, n_zones, compartments, capacity=None, window=None,
+                 path=None, dtype=np.float32):
+        if (capacity is None) == (window is None):
+            raise ValueError("Indiquer soit `capacity`, soit `window`")
+
+        self.compartments = tuple(compartments)
+        self.window = window
+        self.path = path
+        self.total_days = 0
+
+        rows = capacity if window is None else 2 * window
+        shape = (rows, len(self.compartments), n_zones)
+        if path is None:
+            self._data = np.zeros(shape, dtype=dtype)
+        else:
+            self._data = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=shape)
+
+    @classmethod
+    def open(cls, path):
+        """Rouvre un historique écrit sur disque, en lecture seule (np.memmap)"""
+        with open(f"{path}.json", encoding="utf-8") as f:
+            meta = json.load(f)
+        store = cls.__new__(cls)
+        store.compartments = tuple(meta["compartments"])
+        store.window = meta["window"]
+        store.path = path
+        store.total_days = meta["total_days"]
+        store._data = np.load(path, mmap_mode="r")
+        return store
+
+    @property
+    def n_zones(self):
+        return self._data.shape[2]
+
+    def __len__(self):
+        """Nombre de jours conservés"""
+        if self.window is None:
+            return self.total_days
+        return min(self.total_days, self.window)
+
+    def append(self, state):
+        """Ajoute l'état d'un jour (compartiments, zones) en O(1)"""
+        if self.window is None:
+            if self.total_days >= len(self._data):
+                raise IndexError(f"Historique plein ({len(self._data)} jours)")
+            self._data[self.total_days] = state
+        else:
+            slot = self.total_days % self.window
+            self._data[slot] = state
+            self._data[slot + self.window] = state
+        self.total_days += 1
+
+    def last(self, days=None):
+        """
+        Vue (sans copie) des `days` derniers jours conservés, du plus ancien
+        au plus récent (tous par défaut)
+        """
+        days = len(self) if days is None else min(days, len(self))
+        if self.window is None:
+            end = self.total_days
+        else:
+            end = (self.total_days - 1) % self.window + self.window + 1 if self.total_days else 0
+        return self._data[end - days:end]
+
+    def compartment(self, name, days=None):
+        """Vue (jours, zones) d'un compartiment sur les `days` derniers jours"""
+        return self.last(days)[:, self.compartments.index(name)]
+
+    def flush(self):
+        """Écrit les données et les métadonnées sur disque (mode memmap)"""
+        if self.path is None:
+            return
+        if isinstance(self._data, np.memmap) and self._data.mode != "r":
+            self._data.flush()
+        with open(f"{self.path}.json", "w", encoding="utf-8") as f:
+            json.dump({
+                "compartments": list(self.compartments),
+                "window": self.window,
+                "total_days": self.total_days,
+            }, f)
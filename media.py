@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Préparation des images des slides: rééchantillonnage au cadre d'affichage
+
+architecture.png (1344 × 896) et anonymisation.png (896 × 1344) sont
+affichées sur 3,5 et 4,5 pouces de haut: à pleine résolution, chaque deck
+embarque plusieurs centaines de Ko inutiles. Chaque image est réduite au
+nombre de pixels du cadre à TARGET_DPI (jamais agrandie), puis
+recompressée: PNG optimisé, ou JPEG si plus petit et sans transparence.
+
+Les résultats sont mis en cache sur disque sous .cache/media, nommés par
+le SHA1 du contenu d'origine et la taille cible: un fichier modifié ou un
+cadre différent produit une nouvelle entrée, les builds suivants relisent
+simplement le fichier préparé.
+"""
+
+import hashlib
+import io
+import math
+import os
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+MEDIA_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), ".cache", "media"
+)
+
+TARGET_DPI = 150            # Netteté suffisante en projection et à l'impression
+JPEG_QUALITY = 88
+EMU_PER_INCH = 914400
+
+# =============================================================================
+# FONCTIONS
+# =============================================================================
+
+def display_size(pixel_size, width=None, height=None):
+    """
+    Taille affichée (EMU) d'une image, côté manquant déduit des proportions
+
+    Même règle que python-pptx pour add_picture avec un seul côté fourni.
+    """
+    px_width, px_height = pixel_size
+    if width is None:
+        width = round(height * px_width / px_height)
+    elif height is None:
+        height = round(width * px_height / px_width)
+    return int(width), int(height)
+
+
+def target_pixels(display, dpi=TARGET_DPI):
+    """Pixels (largeur, hauteur) d'un cadre en EMU à `dpi`"""
+    return tuple(max(1, math.ceil(emu / EMU_PER_INCH * dpi)) for emu in display)
+
+
+def _encode(image):
+    """Plus petit encodage: PNG optimisé, ou JPEG sans transparence"""
+    candidates = []
+    png = io.BytesIO()
+    image.save(png, "PNG", optimize=True)
+    candidates.append((png.getvalue(), "png"))
+    if image.mode in ("RGB", "L"):
+        jpeg = io.BytesIO()
+        image.save(jpeg, "JPEG", quality=JPEG_QUALITY, optimize=True)
+        candidates.append((jpeg.getvalue(), "jpg"))
+    return min(candidates, key=lambda candidate: len(candidate[0]))
+
+
+def resample(path, display, dpi=TARGET_DPI, cache_dir=MEDIA_CACHE_DIR):
+    """
+    Image à embarquer pour un cadre d'affichage
+
+    Args:
+        path: image d'origine
+        display: (largeur, hauteur) affichées en EMU
+        dpi: résolution cible
+        cache_dir: dossier du cache disque
+    Returns:
+        str: chemin du fichier préparé (en cache), ou `path` si l'image
+        n'est pas plus grande que le cadre ou si la recompression ne gagne rien
+    """
+    from PIL import Image as PILImage
+
+    with open(path, "rb") as f:
+        blob = f.read()
+    with PILImage.open(io.BytesIO(blob)) as image:
+        size = target_pixels(display, dpi)
+        if size[0] >= image.width and size[1] >= image.height:
+            return path
+
+        stem = os.path.join(cache_dir, f"{hashlib.sha1(blob).hexdigest()}_{size[0]}x{size[1]}")
+        for ext in ("png", "jpg"):
+            if os.path.exists(f"{stem}.{ext}"):
+                return f"{stem}.{ext}"
+        if os.path.exists(f"{stem}.orig"):
+            return path
+
+        if image.mode not in ("RGB", "RGBA", "L", "LA"):
+            image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+        data, ext = _encode(image.resize(size, PILImage.LANCZOS))
+
+    os.makedirs(cache_dir, exist_ok=True)
+    if len(data) >= len(blob):
+        # Marqueur: l'original est déjà le plus compact pour ce cadre
+        open(f"{stem}.orig", "wb").close()
+        return path
+    cached = f"{stem}.{ext}"
+    tmp_path = f"{cached}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, cached)
+    return cached
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Matrice de mobilité (modèle de gravité) pour les moteurs Python
+
+Portage vectorisé de src/simulation/MobilityGenerator.js:
+flux ∝ (pop_i × pop_j × centralité_j) / distance², modulé par les facteurs
+saisonniers et de corridors économiques. Toutes les paires sont calculées
+en une seule passe NumPy au lieu d'une double boucle.
+
+Le noyau statique (distances, gravité, centralité, corridors) est calculé une
+seule fois par table de villes et persisté en .npy, indexé par un hash de la
+table. Les variantes saisonnières ne sont plus que des masques appliqués
+élément par élément, et les flux entrants/sortants par zone sont des
+vecteurs pré-calculés (lookup O(1) au lieu de getTotalInflow). Un même
+MobilityModel est partagé par table de villes (mobility_model), si bien que
+chaque variante mensuelle n'est calculée qu'une fois par processus.
+
+Au-delà de quelques milliers de zones (sous-préfectures, antennes), la
+matrice est construite par blocs de lignes et stockée en CSR (scipy.sparse):
+le seuil MIN_DAILY_FLOW la rend très creuse, et la mémoire reste
+proportionnelle au nombre de flux non nuls au lieu de N².
+"""
+
+import datetime
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from cities import zone_column
+from geo import haversine_matrix
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+GRAVITY_SCALE = 0.00001     # Constante du modèle de gravité (MobilityGenerator.js)
+MIN_DAILY_FLOW = 50         # Seuil minimum pour éviter flux négligeables
+
+# Corridors économiques majeurs: (origine, destination) -> boost
+CORRIDORS = {
+    # Corridor Nord : Abidjan → Yamoussoukro → Bouaké → Korhogo
+    ("Plateau", "Yamoussoukro"): 3.0,
+    ("Yamoussoukro", "Bouaké"): 3.0,
+    ("Bouaké", "Korhogo"): 3.0,
+    # Corridor Ouest : Abidjan → Daloa → Man
+    ("Plateau", "Daloa"): 2.5,
+    ("Daloa", "Man"): 2.5,
+    # Corridor Littoral : Abidjan → Sassandra → San Pedro
+    ("Plateau", "Sassandra"): 2.2,
+    ("Sassandra", "San Pedro"): 2.2,
+}
+ABIDJAN_COMMUTE_BOOST = 5.0  # Flux pendulaires intra-Abidjan
+
+# Cache disque des noyaux de gravité
+MOBILITY_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), ".cache", "mobility"
+)
+
+# Champs de la table de villes qui influencent le noyau
+KERNEL_FIELDS = ("id", "name", "region", "coordinates", "population", "centrality")
+# ... et les masques saisonniers (MobilityModel partagé)
+MODEL_FIELDS = KERNEL_FIELDS + ("district",)
+MAX_MODELS = 4              # Tables de villes gardées en mémoire (mobility_model)
+
+# MobilityModel partagés (hash de la table, dossier du cache) -> modèle
+_MODELS = {}
+
+# Stockage creux (CSR) à partir de ce nombre de zones
+SPARSE_MIN_ZONES = 1000
+SPARSE_BLOCK_ROWS = 256     # Lignes du noyau calculées à la fois en mode creux
+
+# =============================================================================
+# FONCTIONS
+# =============================================================================
+
+def corridor_boost(cities, rows=slice(None)):
+    """Boost (R, N) des corridors économiques et des flux pendulaires d'Abidjan"""
+    n = len(cities)
+    origins = range(n)[rows]
+    boost = np.ones((len(origins), n))
+
+    abidjan = zone_column(cities, "region") == "Abidjan"
+    boost[np.ix_(abidjan[rows], abidjan)] = ABIDJAN_COMMUTE_BOOST
+
+    index = {}
+    for k, city in enumerate(cities):
+        index.setdefault(city["name"], []).append(k)
+    for (origin, dest), value in CORRIDORS.items():
+        for i in index.get(origin, []):
+            if i not in origins:
+                continue
+            for j in index.get(dest, []):
+                boost[i - origins.start, j] = value
+    return boost
+
+
+def city_table_hash(cities, fields=KERNEL_FIELDS):
+    """Hash stable de la table de villes (clé du cache disque)"""
+    table = [[city.get(field) for field in fields] for city in cities]
+    payload = json.dumps(table, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+
+def gravity_kernel(cities, rows=slice(None)):
+    """
+    Noyau statique (R, N): gravité × échelle × centralité × corridors
+
+    Ne dépend pas de la date; la matrice d'un jour donné est ce noyau
+    multiplié par le facteur saisonnier puis seuillée. `rows` limite le
+    calcul à un bloc d'origines (mode creux).
+    """
+    coords = zone_column(cities, "coordinates", float)
+    population = zone_column(cities, "population", float)
+    centrality = zone_column(cities, "centrality", float)
+    origins = range(len(cities))[rows]
+
+    distance = np.maximum(haversine_matrix(coords[:, 0], coords[:, 1], rows), 1)
+    kernel = np.outer(population[rows], population) / distance ** 2
+    kernel *= GRAVITY_SCALE
+    kernel *= (centrality / 50)[None, :]  # Abidjan attire x10
+    kernel *= corridor_boost(cities, rows)
+    kernel[np.arange(len(origins)), np.asarray(origins)] = 0
+    return kernel
+
+
+def load_gravity_kernel(cities, cache_dir=MOBILITY_CACHE_DIR):
+    """Charge le noyau depuis le cache .npy, ou le calcule et le persiste"""
+    if cache_dir is None:
+        return gravity_kernel(cities)
+
+    path = os.path.join(cache_dir, f"gravity_{city_table_hash(cities)}.npy")
+    if os.path.exists(path):
+        return np.load(path)
+
+    kernel = gravity_kernel(cities)
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp.npy"
+    np.save(tmp_path, kernel)
+    os.replace(tmp_path, path)
+    return kernel
+
+
+# =============================================================================
+# MODÈLE DE MOBILITÉ
+# =============================================================================
+
+class MobilityModel:
+    """
+    Matrices de mobilité d'une table de villes, avec caches
+
+    Le noyau est chargé une fois (cache disque), les masques saisonniers sont
+    des vecteurs booléens, et chaque variante mensuelle est calculée au plus
+    une fois avec ses vecteurs de flux entrants / sortants.
+
+    Le noyau dense n'est chargé qu'au premier accès: `sparse_matrix` le
+    recalcule par blocs sans jamais matérialiser N × N.
+    """
+
+    def __init__(self, cities, cache_dir=MOBILITY_CACHE_DIR):
+        self.cities = cities
+        self.cache_dir = cache_dir
+        self._kernel = None
+
+        regions = zone_column(cities, "region")
+        self.dest_cocoa = np.array(["Daloa" in r or "Soubré" in r for r in regions], dtype=bool)
+        self.abidjan = regions == "Abidjan"
+        self.dest_savanes = zone_column(cities, "district") == "Savanes"
+
+        self._variants = {}
+        self._sparse_variants = {}
+        self._sparse_totals = {}
+
+    @property
+    def kernel(self):
+        """Noyau de gravité dense (N, N), chargé depuis le cache au premier accès"""
+        if self._kernel is None:
+            self._kernel = load_gravity_kernel(self.cities, self.cache_dir)
+        return self._kernel
+
+    def seasonal_factor(self, date, rows=slice(None)):
+        """
+        Facteur saisonnier (R, N) origine → destination
+
+        Même ordre de priorité que getSeasonalFactor (MobilityGenerator.js).
+        """
+        month = date.month - 1  # 0-11 comme en JS
+        is_harvest = month >= 9 or month <= 2
+        is_holiday = month in (11, 0)
+        is_dry = month >= 10 or month <= 2
+
+        # Du moins prioritaire au plus prioritaire
+        factor = np.where(is_dry & self.dest_savanes[None, :], 1.3, 1.0)
+        holiday = is_holiday & self.abidjan[rows, None] & ~self.abidjan[None, :]
+        factor = np.where(holiday, 2.8, factor)
+        return np.where(is_harvest & self.dest_cocoa[None, :], 1.8, factor)
+
+    def _variant(self, date):
+        """Matrice, flux entrants et sortants du mois de `date` (mémoïsés)"""
+        key = date.month
+        if key not in self._variants:
+            flows = self.kernel * self.seasonal_factor(date)
+            flows[flows <= MIN_DAILY_FLOW] = 0
+            flows = np.round(flows)
+            flows.setflags(write=False)
+            self._variants[key] = (flows, flows.sum(axis=0), flows.sum(axis=1))
+        return self._variants[key]
+
+    def matrix(self, date=None):
+        """Matrice des flux quotidiens M[origine, destination] (lecture seule)"""
+        return self._variant(date or datetime.date.today())[0]
+
+    def _totals(self, date):
+        """Flux entrants et sortants (N,) du mois de `date` (mémoïsés)"""
+        date = date or datetime.date.today()
+        if len(self.cities) < SPARSE_MIN_ZONES:
+            return self._variant(date)[1:]
+        # Grandes tables: sommes de la matrice creuse, sans noyau dense
+        if date.month not in self._sparse_totals:
+            flows = self.sparse_matrix(date)
+            self._sparse_totals[date.month] = (np.asarray(flows.sum(axis=0)).ravel(),
+                                               np.asarray(flows.sum(axis=1)).ravel())
+        return self._sparse_totals[date.month]
+
+    def inflow(self, date=None):
+        """Flux total entrant par zone (N,)"""
+        return self._totals(date)[0]
+
+    def outflow(self, date=None):
+        """Flux total sortant par zone (N,)"""
+        return self._totals(date)[1]
+
+    def sparse_matrix(self, date=None, block_rows=SPARSE_BLOCK_ROWS):
+        """
+        Matrice des flux quotidiens en CSR (mémoire ∝ nombre de flux non nuls)
+
+        Mêmes valeurs que `matrix`, calculées par blocs de `block_rows`
+        origines. Mémoïsée par mois.
+        """
+        try:
+            from scipy import sparse
+        except ImportError:
+            raise ImportError(
+                "scipy est requis pour la matrice de mobilité creuse (pip install scipy)"
+            )
+
+        date = date or datetime.date.today()
+        if date.month not in self._sparse_variants:
+            n = len(self.cities)
+            blocks = []
+            for start in range(0, n, block_rows):
+                rows = slice(start, min(start + block_rows, n))
+                flows = gravity_kernel(self.cities, rows) * self.seasonal_factor(date, rows)
+                flows[flows <= MIN_DAILY_FLOW] = 0
+                blocks.append(sparse.csr_matrix(np.round(flows)))
+            self._sparse_variants[date.month] = sparse.vstack(blocks, format="csr")
+        return self._sparse_variants[date.month]
+
+
+def mobility_model(cities, cache_dir=MOBILITY_CACHE_DIR):
+    """
+    MobilityModel partagé d'une table de villes
+
+    Mémoïsé par hash de la table (MODEL_FIELDS) et dossier du cache: les
+    variantes mensuelles et les vecteurs inflow/outflow sont réutilisés
+    d'un appel à l'autre. Les MAX_MODELS dernières tables sont gardées;
+    `cache_dir=None` désactive aussi ce cache (modèle neuf à chaque appel).
+    """
+    if cache_dir is None:
+        return MobilityModel(cities, cache_dir)
+
+    key = (city_table_hash(cities, MODEL_FIELDS), cache_dir)
+    model = _MODELS.pop(key, None)
+    if model is None:
+        model = MobilityModel(cities, cache_dir)
+        while len(_MODELS) >= MAX_MODELS:
+            del _MODELS[next(iter(_MODELS))]
+    _MODELS[key] = model          # Plus récemment utilisé en dernier
+    return model
+
+
+def build_mobility_matrix(cities, date=None, cache_dir=MOBILITY_CACHE_DIR, sparse=None):
+    """
+    Construit la matrice des flux quotidiens M[origine, destination]
+
+    Args:
+        cities: liste de villes (schéma ivoryCoastCities.js)
+        date: date pour les facteurs saisonniers (défaut: aujourd'hui)
+        cache_dir: dossier du cache des noyaux (None pour désactiver les
+            caches, disque et mémoire)
+        sparse: True pour une matrice CSR; par défaut dès SPARSE_MIN_ZONES zones
+    Returns:
+        np.ndarray (N, N) ou scipy.sparse.csr_matrix de flux arrondis,
+        0 sur la diagonale et sous le seuil
+    """
+    if sparse is None:
+        sparse = len(cities) >= SPARSE_MIN_ZONES
+    model = mobility_model(cities, cache_dir)
+    if sparse:
+        return model.sparse_matrix(date).copy()
+    return model.matrix(date).copy()
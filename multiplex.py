@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""
+Modèle multiplex mobilité + communication (SIR × information)
+
+Transposition du modèle de Lima et al. (Sci. Rep. 5, 10650, 2015; voir
+info2.md) à l'échelle des sous-préfectures: deux couches sur les mêmes
+zones, stockées en CSR (scipy.sparse):
+
+- couche mobilité (mobility.py): transporte la maladie, comme dans
+  MetapopulationSEIR (cas importés μ × Mᵀ · prévalence);
+- couche communication (appels entre zones, plus dense que la mobilité):
+  transporte l'information préventive, y compris à distance.
+
+États par zone: S, I, R × U (non informé) / A (informé), soit SU, SA, IU,
+IA et R. Paramètres de participation:
+
+    omega   part des infectés qui diffusent l'information (campagne)
+    psi     part des informés qui relaient l'information
+    xi      part des nouveaux informés qui adoptent une protection durable
+            (passage direct en R); les autres oublient au taux `delta`
+
+Formulation adaptée (les équations exactes de l'article ne sont pas
+reprises): chaque jour, la force d'infection λ et la pression
+d'information π d'une zone sont calculées pour toutes les zones et toutes
+les combinaisons (ω, ψ, ξ) à la fois, les états étant des tableaux (P, N).
+Un balayage de la grille est ainsi réparti en quelques lots par cœur.
+
+Usage:
+    python multiplex.py                                  # 393 zones synthétiques
+    python multiplex.py --omega 0 0.1 0.3 --psi 0 0.2 --xi 0 0.5
+    python multiplex.py --cities --calls od/calls_mean.npy
+"""
+
+import argparse
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from cities import load_cities, synthetic_cities, zone_column
+from geo import haversine_matrix
+from mobility import SPARSE_BLOCK_ROWS, build_mobility_matrix
+from seir_engine import (
+    N_OUTBREAK_CITIES,
+    OUTBREAK_PREVALENCE,
+    REFERENCE_DATE,
+    START_DATE,
+    transpose_mobility,
+)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# Paramètres maladie / information (SIR, cf. DEFAULT_PARAMS de seir_engine)
+MULTIPLEX_PARAMS = {
+    "beta": 0.35,        # Taux de transmission
+    "gamma": 1 / 14,     # Taux de guérison
+    "mu": 0.0001,        # Facteur d'influence de la mobilité
+    "alpha": 0.5,        # Taux de transmission de l'information
+    "efficacy": 0.6,     # Réduction de susceptibilité des informés
+    "delta": 1 / 30,     # Taux d'oubli de l'information (protection temporaire)
+}
+
+MULTIPLEX_COMPARTMENTS = ("SU", "SA", "IU", "IA", "R")
+N_SUBPREFECTURES = 393
+
+# Couche communication: gravité à décroissance plus lente que la mobilité
+CALL_SCALE = 0.000001       # Constante du modèle d'appels
+CALL_DISTANCE_EXPONENT = 1.0
+MIN_DAILY_CALLS = 10        # Seuil minimum d'appels quotidiens
+
+# Grille de participation par défaut
+DEFAULT_OMEGAS = (0.0, 0.1, 0.3, 0.5)
+DEFAULT_PSIS = (0.0, 0.1, 0.3, 0.5)
+DEFAULT_XIS = (0.0, 0.5)
+NO_CAMPAIGN = (0.0, 0.0, 0.0)   # Référence (ω, ψ, ξ) des cas évités
+BATCH_SIZE = 8              # Combinaisons simulées ensemble par tâche
+
+MULTIPLEX_FILENAME = "multiplex_sweep.json"
+
+# État d'un worker du balayage (initialisé une fois par processus)
+_worker = {}
+
+# =============================================================================
+# COUCHES
+# =============================================================================
+
+def communication_matrix(cities, block_rows=SPARSE_BLOCK_ROWS):
+    """
+    Appels quotidiens C[origine, destination] estimés par gravité, en CSR
+
+    appels ∝ pop_i × pop_j / distance: la décroissance plus lente et le seuil
+    plus bas que la mobilité donnent une couche plus dense, comme observé
+    sur les CDR. Calcul par blocs de lignes (pas de matrice N × N dense).
+    """
+    try:
+        from scipy import sparse
+    except ImportError:
+        raise ImportError(
+            "scipy est requis pour le modèle multiplex (pip install scipy)"
+        )
+
+    coords = zone_column(cities, "coordinates", float)
+    population = zone_column(cities, "population", float)
+    n = len(cities)
+    blocks = []
+    for start in range(0, n, block_rows):
+        rows = slice(start, min(start + block_rows, n))
+        distance = np.maximum(haversine_matrix(coords[:, 0], coords[:, 1], rows), 1)
+        calls = CALL_SCALE * np.outer(population[rows], population)
+        calls /= distance ** CALL_DISTANCE_EXPONENT
+        calls[np.arange(rows.stop - start), np.arange(start, rows.stop)] = 0
+        calls[calls <= MIN_DAILY_CALLS] = 0
+        blocks.append(sparse.csr_matrix(np.round(calls)))
+    return sparse.vstack(blocks, format="csr")
+
+
+def load_layer(path):
+    """
+    Charge une couche observée: .npz (scipy.sparse) ou .npy (matrice OD dense,
+    ex: sortie de cdr_ingest.py), renvoyée en CSR
+    """
+    try:
+        from scipy import sparse
+    except ImportError:
+        raise ImportError(
+            "scipy est requis pour le modèle multiplex (pip install scipy)"
+        )
+
+    if path.endswith(".npz"):
+        return sparse.load_npz(path).tocsr()
+    return sparse.csr_matrix(np.load(path))
+
+
+def layer_density(layer):
+    """Part des paires origine → destination non nulles"""
+    n = layer.shape[0]
+    return layer.nnz / (n * (n - 1)) if n > 1 else 0.0
+
+
+# =============================================================================
+# MODÈLE
+# =============================================================================
+
+class MultiplexSIR:
+    """
+    Modèle SIR × information sur deux couches (mobilité, communication)
+
+    `omega`, `psi` et `xi` sont des scalaires ou des tableaux (P,): les P
+    combinaisons sont simulées ensemble, chaque état étant un tableau (P, N).
+
+    Attributs principaux:
+        SU, SA, IU, IA, R: np.ndarray (P, N) des compartiments par zone
+        infected_total: infections cumulées (P, N)
+        immunised: passages en R par l'information (P, N)
+    """
+
+    def __init__(self, cities, mobility, communication, params=None,
+                 omega=0.0, psi=0.0, xi=0.0, seed=None):
+        self.cities = cities
+        self.params = {**MULTIPLEX_PARAMS, **(params or {})}
+        self.population = zone_column(cities, "population", float)
+
+        self.mobility_t = transpose_mobility(mobility)
+        self.communication_t = transpose_mobility(communication)
+
+        self.omega, self.psi, self.xi = (
+            np.atleast_1d(np.asarray(value, dtype=float))[:, None]
+            for value in np.broadcast_arrays(omega, psi, xi)
+        )
+        self.n_sets = len(self.omega)
+
+        self.rng = np.random.default_rng(seed)
+        self.current_day = 0
+        self.reset()
+
+    def reset(self):
+        """Réinitialise les compartiments (mêmes foyers que MetapopulationSEIR)"""
+        outbreak = np.zeros(len(self.population), dtype=bool)
+        outbreak[np.argsort(-self.population, kind="stable")[:N_OUTBREAK_CITIES]] = True
+        random_factor = 0.8 + self.rng.random(len(self.population)) * 0.4
+        infected = np.where(outbreak, self.population * OUTBREAK_PREVALENCE * random_factor, 0.0)
+
+        shape = (self.n_sets, len(self.population))
+        self.IU = np.broadcast_to(infected, shape).copy()
+        self.SU = self.population - self.IU
+        self.SA = np.zeros(shape)
+        self.IA = np.zeros(shape)
+        self.R = np.zeros(shape)
+        self.infected_total = self.IU.copy()
+        self.immunised = np.zeros(shape)
+        self.current_day = 0
+
+    @property
+    def state(self):
+        """État courant (5, P, N) dans l'ordre de MULTIPLEX_COMPARTMENTS"""
+        return np.stack([self.SU, self.SA, self.IU, self.IA, self.R])
+
+    def _spread(self, layer_t, values):
+        """Produit Cᵀ · x pour les P combinaisons à la fois: (P, N) -> (P, N)"""
+        return np.asarray(layer_t @ values.T).T
+
+    def force_of_infection(self):
+        """λ (P, N): transmission locale + cas importés par la couche mobilité"""
+        prevalence = (self.IU + self.IA) / self.population
+        imported = self.params["mu"] * self._spread(self.mobility_t, prevalence)
+        return np.minimum(self.params["beta"] * prevalence + imported / self.population, 1)
+
+    def information_pressure(self):
+        """
+        π (P, N): informateurs locaux + appels reçus d'informateurs distants
+
+        Les informateurs sont la part ω des infectés et ψ des informés.
+        """
+        informers = (self.omega * (self.IU + self.IA)
+                     + self.psi * (self.SA + self.IA)) / self.population
+        remote = self._spread(self.communication_t, informers) / self.population
+        return informers + remote
+
+    def step(self):
+        """Simule un pas de temps (1 jour) des deux couches pour toutes les zones"""
+        gamma, efficacy, delta = (self.params[k] for k in ("gamma", "efficacy", "delta"))
+
+        infection = self.force_of_infection()
+        aware = 1 - np.exp(-self.params["alpha"] * self.information_pressure())
+
+        # Infection et guérison d'abord, puis information sur les restants
+        infected_u = infection * self.SU
+        infected_a = (1 - efficacy) * infection * self.SA
+        informed_s = aware * (self.SU - infected_u)
+        recovered_u = gamma * self.IU
+        recovered_a = gamma * self.IA
+        informed_i = aware * (self.IU - recovered_u)
+        forgot_s = delta * self.SA
+        forgot_i = delta * self.IA
+        immunised = self.xi * informed_s
+
+        self.SU = np.maximum(0, self.SU - infected_u - informed_s + forgot_s)
+        self.SA = np.maximum(0, self.SA - infected_a + informed_s - immunised - forgot_s)
+        self.IU = np.maximum(0, self.IU + infected_u - recovered_u - informed_i + forgot_i)
+        self.IA = np.maximum(0, self.IA + infected_a - recovered_a + informed_i - forgot_i)
+        self.R = self.R + recovered_u + recovered_a + immunised
+        self.infected_total += infected_u + infected_a
+        self.immunised += immunised
+        self.current_day += 1
+
+    def run(self, days):
+        """
+        Simule `days` jours
+
+        Returns:
+            np.ndarray (days + 1, 5, P): totaux nationaux par compartiment
+        """
+        totals = np.empty((days + 1, len(MULTIPLEX_COMPARTMENTS), self.n_sets))
+        totals[0] = self.state.sum(axis=2)
+        for day in range(days):
+            self.step()
+            totals[day + 1] = self.state.sum(axis=2)
+        return totals
+
+
+# =============================================================================
+# BALAYAGE
+# =============================================================================
+
+def participation_grid(omegas=DEFAULT_OMEGAS, psis=DEFAULT_PSIS, xis=DEFAULT_XIS):
+    """Combinaisons (ω, ψ, ξ), référence sans campagne (0, 0, 0) en tête"""
+    grid = [NO_CAMPAIGN]
+    for combo in itertools.product(omegas, psis, xis):
+        combo = tuple(float(value) for value in combo)
+        if combo not in grid:
+            grid.append(combo)
+    return grid
+
+
+def _init_worker(cities, mobility, communication, params, seed, days):
+    """Initialise un worker: villes, deux couches et horizon"""
+    _worker.update(cities=cities, mobility=mobility, communication=communication,
+                   params=params, seed=seed, days=days)
+
+
+def run_batch(combos):
+    """
+    Tâche worker: simule un lot de combinaisons (ω, ψ, ξ) ensemble
+
+    Returns:
+        list de dict: omega, psi, xi, total_infected, attack_rate_pct,
+        peak_cases, peak_day, aware_pct, immunised_pct
+    """
+    omega, psi, xi = np.array(combos, dtype=float).T
+    model = MultiplexSIR(_worker["cities"], _worker["mobility"], _worker["communication"],
+                         params=_worker["params"], omega=omega, psi=psi, xi=xi,
+                         seed=_worker["seed"])
+    totals = model.run(_worker["days"])
+
+    population = model.population.sum()
+    active = totals[:, 2] + totals[:, 3]
+    aware = totals[-1, 1] + totals[-1, 3]
+    infected = model.infected_total.sum(axis=1)
+    immunised = model.immunised.sum(axis=1)
+    return [
+        {
+            "omega": float(omega[k]),
+            "psi": float(psi[k]),
+            "xi": float(xi[k]),
+            "total_infected": int(round(infected[k])),
+            "attack_rate_pct": round(100 * infected[k] / population, 2),
+            "peak_cases": int(round(active[:, k].max())),
+            "peak_day": int(np.argmax(active[:, k])),
+            "aware_pct": round(100 * aware[k] / population, 2),
+            "immunised_pct": round(100 * immunised[k] / population, 2),
+        }
+        for k in range(len(combos))
+    ]
+
+
+def sweep(cities, grid=None, days=None, start_date=START_DATE, params=None,
+          communication=None, seed=0, batch_size=BATCH_SIZE, n_workers=None):
+    """
+    Simule toutes les combinaisons de participation en parallèle
+
+    Args:
+        grid: combinaisons (ω, ψ, ξ) (défaut: participation_grid());
+            la référence NO_CAMPAIGN est ajoutée en tête si absente
+        communication: couche d'appels observée (défaut: communication_matrix)
+    Returns:
+        dict: rows (ordre de la grille; cas évités par rapport à la ligne
+        NO_CAMPAIGN, où qu'elle soit), days, density (des deux couches),
+        seconds
+    """
+    start = time.perf_counter()
+    days = days if days is not None else (REFERENCE_DATE - start_date).days
+    grid = participation_grid() if grid is None else grid
+    grid = [tuple(float(value) for value in combo) for combo in grid]
+    if NO_CAMPAIGN not in grid:
+        grid = [NO_CAMPAIGN] + grid
+
+    mobility = build_mobility_matrix(cities, start_date, sparse=True)
+    communication = communication_matrix(cities) if communication is None else communication
+    batches = [grid[k:k + batch_size] for k in range(0, len(grid), batch_size)]
+
+    with ProcessPoolExecutor(
+        max_workers=n_workers or os.cpu_count(),
+        initializer=_init_worker,
+        initargs=(cities, mobility, communication, params, seed, days),
+    ) as pool:
+        rows = [row for batch in pool.map(run_batch, batches) for row in batch]
+
+    reference = next(row for row in rows
+                     if (row["omega"], row["psi"], row["xi"]) == NO_CAMPAIGN)
+    for row in rows:
+        row["cases_averted"] = reference["total_infected"] - row["total_infected"]
+        row["cases_averted_pct"] = round(
+            100 * row["cases_averted"] / reference["total_infected"], 1
+        ) if reference["total_infected"] else 0.0
+
+    return {
+        "rows": rows,
+        "days": days,
+        "density": {"mobility": layer_density(mobility),
+                    "communication": layer_density(communication)},
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def save_sweep(result, path=MULTIPLEX_FILENAME):
+    """Écrit le tableau du balayage en JSON"""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({key: result[key] for key in ("days", "density", "rows")}, f,
+                  ensure_ascii=False, indent=2)
+    return path
+
+
+# =============================================================================
+# POINT D'ENTRÉE
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Campagne d'information: modèle multiplex mobilité + communication"
+    )
+    parser.add_argument("--zones", type=int, default=N_SUBPREFECTURES,
+                        help="nombre de zones synthétiques (défaut: 393 sous-préfectures)")
+    parser.add_argument("--cities", action="store_true",
+                        help="utiliser les 30 villes au lieu des zones synthétiques")
+    parser.add_argument("--calls", default=None,
+                        help="couche communication observée (.npy ou .npz)")
+    parser.add_argument("--omega", type=float, nargs="+", default=DEFAULT_OMEGAS)
+    parser.add_argument("--psi", type=float, nargs="+", default=DEFAULT_PSIS)
+    parser.add_argument("--xi", type=float, nargs="+", default=DEFAULT_XIS)
+    parser.add_argument("--days", type=int, default=None,
+                        help="horizon de simulation (défaut: jusqu'à la date de référence)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--out", default=MULTIPLEX_FILENAME)
+    args = parser.parse_args()
+
+    cities = load_cities() if args.cities else synthetic_cities(args.zones, seed=args.seed)
+    communication = load_layer(args.calls) if args.calls else None
+    grid = participation_grid(args.omega, args.psi, args.xi)
+
+    print(f"📡 {len(grid)} combinaisons (ω, ψ, ξ) sur {len(cities)} zones...")
+    result = sweep(cities, grid, args.days, communication=communication,
+                   seed=args.seed, n_workers=args.workers)
+    save_sweep(result, args.out)
+
+    density = result["density"]
+    print(f"   Densité: mobilité {density['mobility']:.1%}, "
+          f"communication {density['communication']:.1%}")
+    print(f"\n{'ω':>5} {'ψ':>5} {'ξ':>5} {'Attaque':>9} {'Pic':>11} {'Jour':>5} "
+          f"{'Informés':>9} {'Cas évités':>11}")
+    for row in result["rows"]:
+        print(f"{row['omega']:>5.2f} {row['psi']:>5.2f} {row['xi']:>5.2f} "
+              f"{row['attack_rate_pct']:>8.1f}% {row['peak_cases']:>11,} {row['peak_day']:>5} "
+              f"{row['aware_pct']:>8.1f}% {row['cases_averted_pct']:>10.1f}%")
+    print(f"\n✅ {len(result['rows'])} combinaisons en {result['seconds']:.1f} s -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
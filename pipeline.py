@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+"""
+Pipeline quotidien événementiel: ingestion, état du modèle, prévisions, decks
+
+Chaque jour, au lieu de relancer la simulation depuis le 1er jour (reset()
+du dashboard, deck_figures()), le pipeline:
+
+1. ingère la matrice OD de la veille (od/od_AAAA-MM-JJ.npy, cdr_ingest.py)
+   et les cas observés (cases/cases_AAAA-MM-JJ.csv: zone, cases);
+2. avance l'état stocké du modèle d'un jour et le recale sur les cas
+   (backtest.assimilate);
+3. rafraîchit prévisions J+7 / J+14, intervalles et niveaux de risque;
+4. régénère uniquement les decks (national et par district) dont les
+   chiffres ont changé.
+
+Dépendances entre étapes par hash de contenu:
+    entrées du jour (hash des fichiers, mémoïsé par taille / date de
+    modification) -> clé d'état chaînée (clé de la veille + entrées) ->
+    clé de prévision -> empreinte des chiffres de chaque deck.
+Une étape n'est recalculée que si sa clé a changé: une journée sans
+nouveauté se termine en quelques secondes, une correction de cas dans un
+seul district ne reconstruit que les decks dont les chiffres bougent, et une
+correction d'un jour passé rejoue la chaîne à partir de ce jour.
+
+L'état de départ (veille du premier jour suivi) est simulé une fois depuis
+START_DATE; l'historique complet sert aux pics et aux graphiques.
+
+Usage:
+    python pipeline.py                         # traite la veille
+    python pipeline.py --date 2025-12-03 --out pipeline/
+"""
+
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from backtest import INTERVAL_RUNS, assimilate
+from batch_decks import _slug, generate_batch
+from cities import load_cities, zone_column
+from ensemble import CommonRandomNumbers, simulate_batch, summarize_ensemble
+from generate_presentation import OUTPUT_FILENAME, attach_artifacts
+from mobility import SPARSE_MIN_ZONES, build_mobility_matrix, city_table_hash, mobility_model
+from risk import TREND_DAYS, total_inflow, zone_risk
+from seir_engine import (
+    CALIBRATION_FILE,
+    COMPARTMENTS,
+    DEFAULT_PARAMS,
+    START_DATE,
+    MetapopulationSEIR,
+    chart_data,
+    load_params,
+    summarize,
+)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+PIPELINE_DIR = "pipeline"
+OD_DIR = "od"                   # Matrices OD quotidiennes (cdr_ingest.py)
+CASES_DIR = "cases"             # Cas observés quotidiens
+MANIFEST_FILENAME = "pipeline.json"
+HORIZONS = (7, 14)
+
+# =============================================================================
+# ENTRÉES
+# =============================================================================
+
+def file_digest(path, memo):
+    """
+    sha256 du contenu d'un fichier (None s'il est absent)
+
+    `memo` (chemin -> taille, date de modification, hash) évite de relire
+    les fichiers inchangés d'un jour à l'autre.
+    """
+    if not os.path.exists(path):
+        return None
+    stat = os.stat(path)
+    entry = memo.get(path)
+    if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+        return entry["sha256"]
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    memo[path] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+                  "sha256": digest.hexdigest()}
+    return memo[path]["sha256"]
+
+
+def od_path(od_dir, date):
+    return os.path.join(od_dir, f"od_{date.isoformat()}.npy")
+
+
+def cases_path(cases_dir, date):
+    return os.path.join(cases_dir, f"cases_{date.isoformat()}.csv")
+
+
+def load_day_cases(path, cities):
+    """Cas actifs observés d'un jour (N,), NaN pour les zones non observées"""
+    observed = np.full(len(cities), np.nan)
+    if not os.path.exists(path):
+        return observed
+    frame = pd.read_csv(path, dtype={"zone": str})
+    name_to_id = {city["name"]: city["id"] for city in cities}
+    totals = frame.groupby(frame["zone"].map(lambda z: name_to_id.get(z, z)))["cases"].sum()
+    ids = pd.Index([city["id"] for city in cities])
+    position = ids.get_indexer(totals.index)
+    observed[position[position >= 0]] = totals.to_numpy(dtype=float)[position >= 0]
+    return observed
+
+
+def _hash(*parts):
+    """sha256 d'une suite de chaînes"""
+    return hashlib.sha256("\x1f".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+
+
+def _figures_payload(value):
+    """Chiffres sérialisables: tableaux arrondis au cas près (comme affichés)"""
+    if isinstance(value, dict):
+        return {str(key): _figures_payload(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_figures_payload(item) for item in value]
+    if isinstance(value, np.ndarray):
+        return np.round(value).astype(np.int64).tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def figures_digest(figures):
+    """Empreinte des chiffres d'un deck (clé de régénération)"""
+    payload = json.dumps(_figures_payload(figures), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# =============================================================================
+# PIPELINE
+# =============================================================================
+
+class DailyPipeline:
+    """
+    État persistant du pipeline quotidien (dossier `workdir`)
+
+    Contenu du dossier:
+        pipeline.json           manifeste (clés des jours, hash des entrées,
+                                empreintes des decks)
+        bootstrap_<clé>.npy     historique simulé jusqu'à la veille du 1er jour
+        states/state_<date>.npy état recalé de chaque jour suivi
+        forecast_<clé>.npz      prévisions et ensemble d'un état
+        decks/                  decks par district (deck national à la racine)
+    """
+
+    def __init__(self, cities=None, params=None, seed=0, workdir=PIPELINE_DIR,
+                 od_dir=OD_DIR, cases_dir=CASES_DIR, n_runs=INTERVAL_RUNS):
+        self.cities = cities if cities is not None else load_cities()
+        self.params = {**DEFAULT_PARAMS, **(params or {})}
+        self.seed = seed
+        self.workdir = workdir
+        self.od_dir = od_dir
+        self.cases_dir = cases_dir
+        self.n_runs = n_runs
+        self.population = zone_column(self.cities, "population", float)
+
+        self.run_key = _hash(
+            city_table_hash(self.cities),
+            json.dumps({k: np.asarray(v).tolist() for k, v in sorted(self.params.items())}),
+            seed,
+        )
+        self.manifest_path = os.path.join(workdir, MANIFEST_FILENAME)
+        self.manifest = self._load_manifest()
+
+    # -- Manifeste -----------------------------------------------------------
+
+    def _load_manifest(self):
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("run_key") == self.run_key:
+                return manifest
+        # Table de villes, paramètres ou graine modifiés: tout est à refaire
+        return {"run_key": self.run_key, "first_date": None, "days": {},
+                "files": {}, "decks": {}}
+
+    def save_manifest(self):
+        """Écrit le manifeste de façon atomique"""
+        os.makedirs(self.workdir, exist_ok=True)
+        tmp_path = f"{self.manifest_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _state_path(self, date):
+        return os.path.join(self.workdir, "states", f"state_{date.isoformat()}.npy")
+
+    def _bootstrap_path(self):
+        first = self.manifest["first_date"]
+        return os.path.join(self.workdir, f"bootstrap_{_hash(self.run_key, first)[:24]}.npy")
+
+    # -- Étapes --------------------------------------------------------------
+
+    def mobility(self, date):
+        """Matrice OD observée du jour, à défaut le modèle de gravité du mois"""
+        path = od_path(self.od_dir, date)
+        if not os.path.exists(path):
+            return build_mobility_matrix(self.cities, date)
+        flows = np.load(path)
+        if len(self.cities) >= SPARSE_MIN_ZONES:
+            from scipy import sparse
+            return sparse.csr_matrix(flows)
+        return flows
+
+    def inflow(self, date, mobility):
+        """
+        Flux entrants du jour (N,)
+
+        Vecteur mémoïsé du modèle de gravité du mois, ou somme de la matrice
+        OD observée si elle existe (voir mobility).
+        """
+        if os.path.exists(od_path(self.od_dir, date)):
+            return total_inflow(mobility)
+        return mobility_model(self.cities).inflow(date)
+
+    def day_inputs(self, date):
+        """Hash des entrées d'un jour (OD observée ou gravité, cas observés)"""
+        files = self.manifest["files"]
+        od = file_digest(od_path(self.od_dir, date), files)
+        return {
+            "od": od or f"gravity:{date.month}",
+            "cases": file_digest(cases_path(self.cases_dir, date), files),
+        }
+
+    def bootstrap(self, first_date):
+        """
+        Simule de START_DATE à la veille de `first_date` (une seule fois)
+
+        Si `first_date` est START_DATE, l'historique initial est vide: le
+        premier jour suivi part de l'état initial du modèle (voir advance).
+
+        Raises:
+            ValueError: `first_date` antérieur à START_DATE
+        """
+        if first_date < START_DATE:
+            raise ValueError(f"Jour {first_date} antérieur au départ de la simulation "
+                             f"({START_DATE})")
+        self.manifest.update(first_date=first_date.isoformat(), days={}, decks={})
+        path = self._bootstrap_path()
+        if not os.path.exists(path):
+            model = MetapopulationSEIR(self.cities, build_mobility_matrix(self.cities, START_DATE),
+                                       params=self.params, seed=self.seed)
+            pre_roll = (first_date - START_DATE).days
+            if pre_roll:
+                history = model.run(pre_roll - 1)
+            else:
+                history = np.empty((0,) + model.state.shape)
+            os.makedirs(self.workdir, exist_ok=True)
+            np.save(path, history)
+
+    def advance(self, date):
+        """
+        Avance l'état jour par jour jusqu'à `date`, en ne recalculant que les
+        jours dont la clé (clé de la veille + entrées) a changé
+
+        Returns:
+            (clé de l'état de `date`, dates recalculées)
+        """
+        if self.manifest["first_date"] is None or date.isoformat() < self.manifest["first_date"]:
+            self.bootstrap(date)
+
+        day = datetime.date.fromisoformat(self.manifest["first_date"])
+        key = _hash(self.run_key, "bootstrap", self.manifest["first_date"])
+        state = None
+        recomputed = []
+        while day <= date:
+            inputs = self.day_inputs(day)
+            key = _hash(key, inputs["od"], inputs["cases"])
+            entry = self.manifest["days"].get(day.isoformat())
+            path = self._state_path(day)
+
+            if entry and entry["key"] == key and os.path.exists(path):
+                state = None  # chargé seulement si un jour suivant est recalculé
+            else:
+                if state is None:
+                    state = self._previous_state(day)
+                model = MetapopulationSEIR(self.cities, self.mobility(day),
+                                           params=self.params, seed=self.seed)
+                if state is not None:
+                    model.state = state
+                    model.step()
+                # Sans veille (START_DATE), le jour est l'état initial du modèle
+                assimilate(model, load_day_cases(cases_path(self.cases_dir, day), self.cities))
+                state = model.state
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                np.save(path, state)
+                self.manifest["days"][day.isoformat()] = {"key": key, "inputs": inputs}
+                recomputed.append(day)
+            day += datetime.timedelta(days=1)
+        return key, recomputed
+
+    def _previous_state(self, date):
+        """
+        État (4, N) de la veille: état stocké ou fin de l'historique initial
+        (None pour START_DATE, qui n'a pas de veille)
+        """
+        if date.isoformat() == self.manifest["first_date"]:
+            history = np.load(self._bootstrap_path(), mmap_mode="r")
+            return history[-1].copy() if len(history) else None
+        return np.load(self._state_path(date - datetime.timedelta(days=1)))
+
+    def history(self, date):
+        """Historique (jours, 4, N) de START_DATE à `date` inclus"""
+        first = datetime.date.fromisoformat(self.manifest["first_date"])
+        tracked = [self._state_path(first + datetime.timedelta(days=k))
+                   for k in range((date - first).days + 1)]
+        return np.concatenate([np.load(self._bootstrap_path()),
+                               np.stack([np.load(path) for path in tracked])])
+
+    def forecast(self, date, key):
+        """
+        Prévisions J+7 / J+14 et ensemble depuis l'état de `date` (mis en cache)
+
+        Returns:
+            (predictions {h: (N,)}, results (1 + H, runs, N), recalculé?)
+        """
+        path = os.path.join(self.workdir, f"forecast_{_hash(key, self.n_runs)[:24]}.npz")
+        if os.path.exists(path):
+            cached = np.load(path)
+            predictions = {h: cached[f"prediction_{h}"] for h in HORIZONS}
+            return predictions, cached["results"], False
+
+        state = np.load(self._state_path(date))
+        model = MetapopulationSEIR(self.cities, self.mobility(date),
+                                   params=self.params, seed=self.seed)
+        model.state = state
+        predictions = model.forecast(HORIZONS)
+
+        # Nombres aléatoires communs: une correction locale ne décale pas les
+        # intervalles des autres districts
+        rng = CommonRandomNumbers([self.seed, date.toordinal()])
+        runs = simulate_batch(rng, model.mobility_t, self.population, self.params,
+                              self.n_runs, max(HORIZONS), HORIZONS, initial=state)
+        today = np.repeat(state[COMPARTMENTS.index("I")][None, :], self.n_runs, axis=0)
+        results = np.concatenate([today[None], runs])
+        np.savez(path, results=results,
+                 **{f"prediction_{h}": predictions[h] for h in HORIZONS})
+        return predictions, results, True
+
+    def deck_specs(self, date, history, predictions, results):
+        """Chiffres du deck national et d'un deck par district"""
+        mobility = self.mobility(date)
+        risk = zone_risk(self.cities, history[-TREND_DAYS:, COMPARTMENTS.index("I")], mobility,
+                         self.inflow(date, mobility))
+
+        national = summarize(self.cities, history, predictions, risk=risk)
+        national.update(summarize_ensemble(results, self.n_runs))
+        national["charts"] = chart_data(self.cities, history, predictions, today=date, risk=risk)
+        specs = {"national": {"output": os.path.join(self.workdir, OUTPUT_FILENAME),
+                              "figures": attach_artifacts(national)}}
+
+        districts = zone_column(self.cities, "district")
+        for district in sorted(set(districts)):
+            zones = districts == district
+            figures = summarize(self.cities, history, predictions, zones, risk)
+            figures.update(summarize_ensemble(results, self.n_runs, zones))
+            figures["charts"] = chart_data(self.cities, history, predictions, zones, date,
+                                           risk=risk)
+            figures["scope"] = f"District {district}"
+            specs[district] = {
+                "output": os.path.join(self.workdir, "decks", f"{_slug(district)}.pptx"),
+                "figures": figures,
+            }
+        return specs
+
+    def run(self, date, n_workers=None):
+        """
+        Traite le jour `date` (toutes les étapes, avec saut des étapes à jour)
+
+        Returns:
+            dict: date, recomputed_days, forecast_recomputed, rebuilt (decks
+            régénérés), unchanged (decks à jour), seconds
+        """
+        start = time.perf_counter()
+        key, recomputed = self.advance(date)
+        self.save_manifest()
+
+        predictions, results, forecast_recomputed = self.forecast(date, key)
+        specs = self.deck_specs(date, self.history(date), predictions, results)
+
+        changed = []
+        for name, spec in specs.items():
+            digest = figures_digest(spec["figures"])
+            previous = self.manifest["decks"].get(name, {})
+            if previous.get("digest") != digest or not os.path.exists(spec["output"]):
+                changed.append((name, digest, spec))
+        if changed:
+            generate_batch([spec for _, _, spec in changed], n_workers=n_workers)
+            for name, digest, spec in changed:
+                self.manifest["decks"][name] = {"digest": digest, "output": spec["output"],
+                                                "date": date.isoformat()}
+        self.manifest["last_date"] = date.isoformat()
+        self.save_manifest()
+
+        return {
+            "date": date.isoformat(),
+            "recomputed_days": [day.isoformat() for day in recomputed],
+            "forecast_recomputed": forecast_recomputed,
+            "rebuilt": [name for name, _, _ in changed],
+            "unchanged": [name for name in specs if name not in {n for n, _, _ in changed}],
+            "seconds": time.perf_counter() - start,
+        }
+
+
+# =============================================================================
+# POINT D'ENTRÉE
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Pipeline quotidien de prévision")
+    parser.add_argument("--date", type=datetime.date.fromisoformat,
+                        default=datetime.date.today() - datetime.timedelta(days=1),
+                        help="jour à traiter (défaut: la veille)")
+    parser.add_argument("--od-dir", default=OD_DIR)
+    parser.add_argument("--cases-dir", default=CASES_DIR)
+    parser.add_argument("--params", default=CALIBRATION_FILE,
+                        help="paramètres calibrés (si présent)")
+    parser.add_argument("--runs", type=int, default=INTERVAL_RUNS,
+                        help="réalisations de l'ensemble pour les intervalles")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--out", default=PIPELINE_DIR)
+    args = parser.parse_args()
+    if args.date < START_DATE:
+        parser.error(f"--date antérieure au départ de la simulation ({START_DATE})")
+
+    cities = load_cities()
+    params = load_params(args.params, cities) if os.path.exists(args.params) else None
+    pipeline = DailyPipeline(cities, params, workdir=args.out, od_dir=args.od_dir,
+                             cases_dir=args.cases_dir, n_runs=args.runs)
+
+    print(f"📅 Pipeline du {args.date.isoformat()} ({len(cities)} zones)...")
+    report = pipeline.run(args.date, n_workers=args.workers)
+
+    print(f"   États recalculés: {len(report['recomputed_days'])} jour(s)")
+    print(f"   Prévisions: {'recalculées' if report['forecast_recomputed'] else 'en cache'}")
+    print(f"   Decks régénérés: {', '.join(report['rebuilt']) or 'aucun'}")
+    print(f"\n✅ Jour traité en {report['seconds']:.1f} s -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Score de risque, niveau de quarantaine et probabilité de transition vectorisés
+
+Portage de calculateRiskScore, getQuarantineStatus,
+calculateTransitionProbability et getGlobalMetrics (EpidemicModel.js):
+toutes les zones sont évaluées en quelques opérations sur tableaux, avec un
+seul vecteur de flux entrants par jour (MobilityModel.inflow, pré-calculé
+par mois et passé par les appelants) au lieu d'un parcours complet de la
+matrice de mobilité par zone.
+
+Mêmes formules et mêmes seuils (40 / 60 / 85) que le dashboard, y compris
+l'arrondi de Math.round.
+"""
+
+import numpy as np
+
+from cities import zone_column
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+TIER_THRESHOLDS = (40, 60, 85)                          # Seuils des niveaux
+TIER_NAMES = ("none", "moderate", "severe", "strict")   # getQuarantineStatus
+RED_ZONE_SCORE = 60         # Zones "rouges" pour le facteur d'affluence
+HIGH_RISK_SCORE = 70        # Zones à risque élevé (getGlobalMetrics)
+TREND_DAYS = 7              # Fenêtre de tendance (history.I.slice(-7))
+
+# Poids de la probabilité de transition (tendance, affluence, seuil, capacité)
+TRANSITION_WEIGHTS = (0.35, 0.25, 0.25, 0.15)
+
+# =============================================================================
+# FONCTIONS
+# =============================================================================
+
+def js_round(values):
+    """Arrondi de Math.round (demi vers +∞, contrairement à np.round)"""
+    return np.floor(np.asarray(values, dtype=float) + 0.5)
+
+
+def total_inflow(mobility):
+    """Flux entrant total par zone (N,) pour une matrice dense ou creuse"""
+    return np.asarray(mobility.sum(axis=0), dtype=float).ravel()
+
+
+def risk_scores(infected, population, inflow, centrality):
+    """
+    Score de risque (0-100) de toutes les zones
+
+    prévalence (0-40) + mobilité entrante (0-30) + capacité sanitaire (0-30)
+    """
+    prevalence_score = np.minimum(infected / population * 10000, 40)
+    mobility_score = np.minimum(inflow / 10000 * 30, 30)
+    capacity_score = np.maximum(0, 30 - centrality / 100 * 30)
+    return np.minimum(js_round(prevalence_score + mobility_score + capacity_score), 100).astype(int)
+
+
+def quarantine_tiers(scores, thresholds=TIER_THRESHOLDS):
+    """Indice du niveau de quarantaine (0-3, voir TIER_NAMES) de chaque zone"""
+    return np.searchsorted(thresholds, scores, side="right")
+
+
+def transition_probability(scores, recent_infected, mobility, inflow, centrality):
+    """
+    Probabilité (%) de passer au niveau de risque supérieur
+
+    Args:
+        scores: scores de risque (N,)
+        recent_infected: cas actifs des TREND_DAYS derniers jours (T, N)
+        mobility: matrice (N, N) des flux origine → destination
+        inflow: flux entrant total (N,)
+    Returns:
+        dict de tableaux (N,): probability, target_threshold, trend,
+        affluence, risk, capacity (facteurs en %)
+    """
+    thresholds = np.array(TIER_THRESHOLDS + (100,))
+    target = thresholds[quarantine_tiers(scores)]
+    maximal = scores >= TIER_THRESHOLDS[-1]
+    enough_history = len(recent_infected) >= TREND_DAYS
+
+    # Facteur 1: tendance sur les 7 derniers points
+    trend = np.zeros(len(scores))
+    if enough_history:
+        window = recent_infected[-TREND_DAYS:]
+        current = window[-1]
+        growth = np.divide(window[-1] - window[0], TREND_DAYS * current,
+                           out=np.zeros(len(scores)), where=current > 0)
+        trend = np.clip(growth * 100, 0, 1)
+
+    # Facteur 2: part du flux entrant venant des zones rouges (un seul produit)
+    red = (scores > RED_ZONE_SCORE).astype(float)
+    from_red = np.asarray(mobility.T @ red, dtype=float).ravel()
+    affluence = np.divide(from_red, inflow, out=np.zeros(len(scores)), where=inflow > 0)
+
+    # Facteur 3: proximité du seuil; facteur 4: capacité sanitaire
+    distance = target - scores
+    risk = np.where(distance < 20, np.maximum(0, 1 - distance / 20), 0)
+    capacity = 1 - centrality / 100
+
+    w_trend, w_affluence, w_risk, w_capacity = TRANSITION_WEIGHTS
+    probability = (w_trend * trend + w_affluence * affluence
+                   + w_risk * risk + w_capacity * capacity) * 100
+    probability = js_round(np.minimum(probability, 99))
+
+    # Niveau maximal: aucune transition; historique insuffisant: probabilité nulle
+    active = ~maximal & enough_history
+    factors = {
+        name: np.where(active, js_round(value * 100), 0).astype(int)
+        for name, value in (("trend", trend), ("affluence", affluence),
+                            ("risk", risk), ("capacity", capacity))
+    }
+    return {
+        "probability": np.where(active, probability, 0).astype(int),
+        "target_threshold": target,
+        **factors,
+    }
+
+
+def zone_risk(cities, infected_history, mobility, inflow=None):
+    """
+    Métriques de risque de toutes les zones (équivalent vectorisé de getMetrics)
+
+    Args:
+        cities: villes (schéma ivoryCoastCities.js)
+        infected_history: cas actifs par jour (T, N), le dernier jour étant
+            "aujourd'hui" (TREND_DAYS jours suffisent)
+        mobility: matrice (N, N) dense ou scipy.sparse
+        inflow: flux entrant total (N,), typiquement MobilityModel.inflow;
+            recalculé depuis `mobility` si absent (matrice OD observée...)
+    Returns:
+        dict de tableaux (N,): prevalence (%), inflow, risk_score, tier,
+        quarantine_status, puis les champs de transition_probability
+    """
+    population = zone_column(cities, "population", float)
+    centrality = zone_column(cities, "centrality", float)
+    inflow = total_inflow(mobility) if inflow is None else inflow
+    infected = np.asarray(infected_history[-1], dtype=float)
+
+    scores = risk_scores(infected, population, inflow, centrality)
+    tiers = quarantine_tiers(scores)
+    return {
+        "prevalence": infected / population * 100,
+        "inflow": inflow,
+        "risk_score": scores,
+        "tier": tiers,
+        "quarantine_status": np.array(TIER_NAMES)[tiers],
+        **transition_probability(scores, infected_history, mobility, inflow, centrality),
+    }
+
+
+def risk_summary(risk, zones=None):
+    """
+    Comptes par niveau de quarantaine et zones à risque élevé
+
+    Returns:
+        dict: high_risk_zones, zones_moderate, zones_severe, zones_strict
+    """
+    zones = np.ones(len(risk["risk_score"]), dtype=bool) if zones is None else zones
+    counts = np.bincount(risk["tier"][zones], minlength=len(TIER_NAMES))
+    return {
+        "high_risk_zones": int((risk["risk_score"][zones] > HIGH_RISK_SCORE).sum()),
+        **{f"zones_{name}": int(counts[k]) for k, name in enumerate(TIER_NAMES) if k > 0},
+    }
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Balayage de scénarios d'intervention (quarantaines, restrictions de mobilité)
+
+Équivalent de updateMobilityMatrix (src/store/simulationStore.js) pour des
+simulations "et si": chaque jour, le niveau de quarantaine des zones
+(risk.py) détermine un facteur de réduction par zone, et chaque flux est
+réduit par le facteur le plus restrictif de son origine et de sa
+destination. Au lieu de régénérer la matrice et de chercher les zones flux
+par flux, les facteurs sont appliqués en masque sur les flux non nuls de la
+matrice de base (tableaux origine / destination / volume calculés une fois).
+
+Une politique décrit:
+    name        libellé du scénario
+    thresholds  seuils des niveaux de risque (défaut 40 / 60 / 85)
+    reduction   facteur de mobilité par niveau (défaut 1.0 / 0.7 / 0.3 / 0.05)
+    contact     facteur de transmission locale par niveau (défaut: aucun effet)
+    start_day   premier jour des mesures (jours depuis le début)
+    zones       identifiants des zones ciblées (défaut: toutes)
+
+Tous les scénarios (plus une référence sans intervention) sont simulés en
+parallèle; le tableau comparatif (pic, cas évités, mobilité perdue) est
+écrit en JSON et rendu en annexe de la présentation.
+
+Usage:
+    python scenarios.py                       # grille par défaut
+    python scenarios.py policies.json --days 240
+"""
+
+import argparse
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from cities import load_cities, zone_column
+from mobility import build_mobility_matrix
+from risk import TIER_THRESHOLDS, quarantine_tiers, risk_scores
+from seir_engine import (
+    CALIBRATION_FILE,
+    REFERENCE_DATE,
+    START_DATE,
+    MetapopulationSEIR,
+    load_params,
+)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# Facteurs de réduction de mobilité par niveau (getReductionFactor)
+REDUCTION_FACTORS = (1.0, 0.7, 0.3, 0.05)
+NO_CONTACT_REDUCTION = (1.0, 1.0, 1.0, 1.0)
+# Effet des restrictions sur la transmission (cf. getZonePrediction7d)
+QUARANTINE_CONTACT = (1.0, 1.0, 0.8, 0.6)
+MIN_ADJUSTED_FLOW = 5       # Flux ajustés conservés (> 5, updateMobilityMatrix)
+
+BASELINE_NAME = "Aucune intervention"
+SCENARIOS_FILENAME = "scenarios.json"
+
+# État d'un worker de scénarios (initialisé une fois par processus)
+_worker = {}
+
+# =============================================================================
+# POLITIQUES
+# =============================================================================
+
+def make_policy(name, thresholds=TIER_THRESHOLDS, reduction=REDUCTION_FACTORS,
+                contact=NO_CONTACT_REDUCTION, start_day=0, zones=None):
+    """Politique d'intervention complète (valeurs par défaut explicites)"""
+    return {
+        "name": name,
+        "thresholds": tuple(thresholds),
+        "reduction": tuple(reduction),
+        "contact": tuple(contact),
+        "start_day": int(start_day),
+        "zones": None if zones is None else list(zones),
+    }
+
+
+def policy_grid(thresholds=(TIER_THRESHOLDS,), reductions=(REDUCTION_FACTORS,),
+                contacts=(NO_CONTACT_REDUCTION,), start_days=(0,), zones=(None,)):
+    """Produit cartésien des options: une politique par combinaison"""
+    policies = []
+    for k, (t, r, c, d, z) in enumerate(
+        itertools.product(thresholds, reductions, contacts, start_days, zones)
+    ):
+        policies.append(make_policy(f"S{k + 1}", t, r, c, d, z))
+    return policies
+
+
+def default_policies():
+    """Grille par défaut: calendrier et intensité des restrictions"""
+    return [
+        make_policy("Restrictions dès J0", start_day=0),
+        make_policy("Restrictions à J+30", start_day=30),
+        make_policy("Restrictions à J+60", start_day=60),
+        make_policy("Seuils abaissés (30/50/75)", thresholds=(30, 50, 75)),
+        make_policy("Restrictions légères", reduction=(1.0, 0.85, 0.6, 0.3)),
+        make_policy("Quarantaine + distanciation", contact=QUARANTINE_CONTACT),
+        make_policy("Quarantaine + distanciation à J+30", contact=QUARANTINE_CONTACT,
+                    start_day=30),
+    ]
+
+
+def load_policies(path):
+    """Charge une liste de politiques JSON (champs de make_policy)"""
+    with open(path, encoding="utf-8") as f:
+        policies = json.load(f)
+    return [make_policy(**policy) for policy in policies]
+
+
+# =============================================================================
+# MODÈLE AVEC INTERVENTIONS
+# =============================================================================
+
+class InterventionSEIR(MetapopulationSEIR):
+    """
+    MetapopulationSEIR dont la mobilité et la transmission suivent une politique
+
+    Les flux non nuls de la matrice de base sont gardés en trois tableaux
+    (origine, destination, volume): la matrice ajustée du jour est un
+    masque sur ces tableaux et les cas importés un bincount pondéré.
+    """
+
+    def __init__(self, cities, mobility, policy, params=None, seed=None):
+        super().__init__(cities, mobility, params=params, seed=seed)
+        self.policy = policy
+
+        if hasattr(mobility, "tocoo"):
+            coo = mobility.tocoo()
+            self.flow_origin, self.flow_dest, self.flow_volume = coo.row, coo.col, coo.data
+        else:
+            self.flow_origin, self.flow_dest = np.nonzero(mobility)
+            self.flow_volume = mobility[self.flow_origin, self.flow_dest]
+        self.flows = self.flow_volume
+
+        self.inflow = np.bincount(self.flow_dest, weights=self.flow_volume,
+                                  minlength=len(self.population))
+        self.centrality = zone_column(cities, "centrality", float)
+        self.targeted = np.ones(len(cities), dtype=bool)
+        if policy["zones"] is not None:
+            self.targeted = np.isin(zone_column(cities, "id"), policy["zones"])
+
+        self.base_beta = self.params["beta"]
+        self.reduction = np.array(policy["reduction"])
+        self.contact = np.array(policy["contact"])
+        self.mobility_kept = []
+        self.restricted_zone_days = 0
+
+    def tiers(self):
+        """Niveau de restriction actuel de chaque zone (0 hors politique)"""
+        if self.current_day < self.policy["start_day"]:
+            return np.zeros(len(self.population), dtype=int)
+        scores = risk_scores(self.I, self.population, self.inflow, self.centrality)
+        return np.where(self.targeted, quarantine_tiers(scores, self.policy["thresholds"]), 0)
+
+    def imported_cases(self, infected=None):
+        """Cas importés par les flux ajustés du jour"""
+        infected = self.I if infected is None else infected
+        prevalence = infected / self.population
+        imported = np.bincount(self.flow_dest, weights=self.flows * prevalence[self.flow_origin],
+                               minlength=len(self.population))
+        return self.params["mu"] * imported
+
+    def step(self):
+        """Applique la politique du jour puis avance d'un pas"""
+        tiers = self.tiers()
+        factor = self.reduction[tiers]
+        flows = np.round(self.flow_volume * np.minimum(factor[self.flow_origin],
+                                                       factor[self.flow_dest]))
+        flows[flows <= MIN_ADJUSTED_FLOW] = 0
+        self.flows = flows
+        self.params["beta"] = self.base_beta * self.contact[tiers]
+
+        self.mobility_kept.append(flows.sum() / self.flow_volume.sum()
+                                  if len(flows) else 1.0)
+        self.restricted_zone_days += int((tiers > 0).sum())
+        super().step()
+
+
+# =============================================================================
+# BALAYAGE
+# =============================================================================
+
+def _init_worker(cities, mobility, params, seed, days):
+    """Initialise un worker: villes, matrice de base et horizon"""
+    _worker.update(cities=cities, mobility=mobility, params=params, seed=seed, days=days)
+
+
+def run_scenario(policy):
+    """
+    Tâche worker: simule une politique
+
+    Returns:
+        dict: name, peak_cases, peak_day, total_infected, mobility_lost_pct,
+        restricted_zone_days
+    """
+    model = InterventionSEIR(_worker["cities"], _worker["mobility"], policy,
+                             params=_worker["params"], seed=_worker["seed"])
+    history = model.run(_worker["days"])
+    active = history[:, 2].sum(axis=1)
+    susceptible = history[:, 0].sum(axis=1)
+    return {
+        "name": policy["name"],
+        "peak_cases": int(round(active.max())),
+        "peak_day": int(np.argmax(active)),
+        "total_infected": int(round(model.population.sum() - susceptible[-1])),
+        "mobility_lost_pct": round(100 * (1 - float(np.mean(model.mobility_kept))), 1),
+        "restricted_zone_days": model.restricted_zone_days,
+    }
+
+
+def run_scenarios(cities, policies, days=None, start_date=START_DATE, params=None,
+                  seed=0, n_workers=None):
+    """
+    Simule la référence sans intervention et toutes les politiques en parallèle
+
+    Returns:
+        dict: rows (tableau comparatif, référence en tête), days, seconds
+    """
+    start = time.perf_counter()
+    days = days if days is not None else (REFERENCE_DATE - start_date).days
+    mobility = build_mobility_matrix(cities, start_date)
+
+    # Référence: facteurs à 1, aucune restriction ni distanciation
+    baseline = make_policy(BASELINE_NAME, reduction=(1.0,) * 4)
+    with ProcessPoolExecutor(
+        max_workers=n_workers or os.cpu_count(),
+        initializer=_init_worker,
+        initargs=(cities, mobility, params, seed, days),
+    ) as pool:
+        rows = list(pool.map(run_scenario, [baseline] + list(policies)))
+
+    reference = rows[0]
+    for row in rows:
+        row["cases_averted"] = reference["total_infected"] - row["total_infected"]
+        row["peak_reduction_pct"] = round(
+            100 * (1 - row["peak_cases"] / reference["peak_cases"]), 1
+        ) if reference["peak_cases"] else 0.0
+
+    return {"rows": rows, "days": days, "seconds": time.perf_counter() - start}
+
+
+def save_scenarios(result, path=SCENARIOS_FILENAME):
+    """Écrit le tableau comparatif en JSON (lu par generate_presentation.py)"""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"days": result["days"], "rows": result["rows"]}, f,
+                  ensure_ascii=False, indent=2)
+    return path
+
+
+# =============================================================================
+# POINT D'ENTRÉE
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Comparaison de scénarios d'intervention")
+    parser.add_argument("policies", nargs="?", help="politiques JSON (défaut: grille intégrée)")
+    parser.add_argument("--days", type=int, default=None,
+                        help="horizon de simulation (défaut: jusqu'à la date de référence)")
+    parser.add_argument("--params", default=CALIBRATION_FILE,
+                        help="paramètres calibrés (si présent)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--out", default=SCENARIOS_FILENAME)
+    args = parser.parse_args()
+
+    cities = load_cities()
+    params = load_params(args.params, cities) if os.path.exists(args.params) else None
+    policies = load_policies(args.policies) if args.policies else default_policies()
+
+    print(f"🧪 {len(policies)} scénarios + référence sur {len(cities)} zones...")
+    result = run_scenarios(cities, policies, args.days, params=params, n_workers=args.workers)
+    save_scenarios(result, args.out)
+
+    print(f"\n{'Scénario':<36} {'Pic':>10} {'Jour':>5} {'Cas évités':>12} {'Mob. perdue':>12}")
+    for row in result["rows"]:
+        print(f"{row['name']:<36} {row['peak_cases']:>10,} {row['peak_day']:>5} "
+              f"{row['cases_averted']:>12,} {row['mobility_lost_pct']:>11.1f}%")
+    print(f"\n✅ {len(result['rows'])} scénarios en {result['seconds']:.1f} s -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
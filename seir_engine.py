@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+Moteur SEIR métapopulationnel vectorisé
+
+Équivalent Python de EpidemicSimulation (src/simulation/EpidemicModel.js):
+les compartiments S/E/I/R de toutes les zones sont des tableaux NumPy et
+les cas importés sont calculés pour toutes les zones en un seul produit
+matrice-vecteur par jour: importés = μ × Mᵀ · (I / N).
+
+La matrice de mobilité peut être dense (np.ndarray) ou creuse (scipy.sparse),
+ce qui permet de passer des 30 zones du dashboard aux 393 sous-préfectures.
+
+En mode stochastique (`stochastic=True`), les transitions des petites
+zones sont tirées (binomiales, importations de Poisson) en un appel
+vectorisé par jour: effectifs entiers, extinctions possibles, et plus
+d'importations fractionnaires perpétuelles. Les zones dont E et I dépassent
+STOCHASTIC_THRESHOLD (Yopougon en pleine épidémie...) gardent la mise à
+jour déterministe, si bien que le coût reste proche du moteur déterministe.
+"""
+
+import datetime
+import json
+
+import numpy as np
+
+from cities import load_cities, zone_column
+from history import HistoryStore
+from mobility import build_mobility_matrix, mobility_model
+from risk import TREND_DAYS, risk_summary, zone_risk
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# Paramètres épidémiologiques (calibrés sur COVID-19/Dengue, cf. EpidemicModel.js)
+DEFAULT_PARAMS = {
+    "beta": 0.35,        # Taux de transmission
+    "sigma": 1 / 5.1,    # Taux d'incubation (1/durée latence en jours)
+    "gamma": 1 / 14,     # Taux de guérison (1/durée infectiosité)
+    "mu": 0.0001,        # Facteur d'influence de la mobilité
+}
+
+START_DATE = datetime.date(2025, 6, 1)     # Départ de la simulation (dashboard)
+REFERENCE_DATE = datetime.date(2025, 12, 3)  # "Aujourd'hui" pour le dashboard
+N_OUTBREAK_CITIES = 5                      # Foyers initiaux (villes les plus peuplées)
+OUTBREAK_PREVALENCE = 0.01                 # 1% d'infectés dans les foyers
+
+COMPARTMENTS = ("S", "E", "I", "R")
+
+# Mode stochastique: une zone reste en tirages binomiaux / Poisson tant que
+# E ou I est sous ce seuil, puis suit la mise à jour déterministe
+STOCHASTIC_THRESHOLD = 1000
+
+# Paramètres calibrés sur des épidémies passées (écrit par calibration.py)
+CALIBRATION_FILE = "calibration.json"
+
+# =============================================================================
+# PARAMÈTRES
+# =============================================================================
+
+def load_params(path=CALIBRATION_FILE, cities=None):
+    """
+    Charge un fichier de paramètres calibrés (voir calibration.py)
+
+    Sans `cities`, renvoie les paramètres nationaux. Avec `cities`, les
+    ajustements par zone (ou groupe de zones) remplacent les valeurs
+    nationales: chaque paramètre devient un tableau (N,), que le modèle
+    vectorisé accepte tel quel.
+    """
+    with open(path, encoding="utf-8") as f:
+        calibration = json.load(f)
+
+    national = calibration.get("national", {}).get("params", {})
+    params = {key: float(national.get(key, value)) for key, value in DEFAULT_PARAMS.items()}
+    if cities is None or not calibration.get("zones"):
+        return params
+
+    index = {city["id"]: k for k, city in enumerate(cities)}
+    arrays = {key: np.full(len(cities), value) for key, value in params.items()}
+    for entry in calibration["zones"].values():
+        rows = [index[zone_id] for zone_id in entry["zone_ids"] if zone_id in index]
+        for key in DEFAULT_PARAMS:
+            arrays[key][rows] = entry["params"][key]
+    return arrays
+
+
+# =============================================================================
+# MODÈLE
+# =============================================================================
+
+def draw_transitions(rng, S, E, I, population, imported_rate, params):
+    """
+    Transitions stochastiques d'un jour (noyau commun au mode stochastique
+    du moteur et à l'ensemble Monte Carlo, ensemble.simulate_batch)
+
+    Tirages binomiaux de même espérance que la mise à jour d'Euler du moteur
+    déterministe (probabilités β·I/N, σ, γ, plafonnées à 1), importations de
+    Poisson prélevées sur les susceptibles restants (population conservée,
+    comme la branche d'Euler de MetapopulationSEIR._stochastic_step). Les tableaux peuvent être
+    (N,) ou (runs, N); les paramètres scalaires ou alignés sur les zones.
+
+    Args:
+        rng: np.random.Generator ou ensemble.CommonRandomNumbers
+        S, E, I: effectifs entiers (np.int64)
+        imported_rate: espérance des cas importés (μ × Mᵀ · prévalence)
+    Returns:
+        (new_exposed, new_infected, new_recovered, imported)
+    """
+    beta, sigma, gamma = (params[k] for k in ("beta", "sigma", "gamma"))
+    new_exposed = rng.binomial(S, np.minimum(beta * I / population, 1))
+    new_infected = rng.binomial(E, np.minimum(sigma, 1))
+    new_recovered = rng.binomial(I, np.minimum(gamma, 1))
+    imported = np.minimum(rng.poisson(imported_rate), S - new_exposed)
+    return new_exposed, new_infected, new_recovered, imported
+
+
+def transpose_mobility(mobility):
+    """
+    Transposée de la matrice de mobilité, prête pour le produit par jour
+
+    (Mᵀ · x)[i] = Σ_j flux_j→i × x_j; CSR si la matrice est creuse.
+    """
+    if hasattr(mobility, "tocsr"):
+        return mobility.T.tocsr()
+    return np.ascontiguousarray(mobility.T)
+
+
+class MetapopulationSEIR:
+    """
+    Modèle SEIR métapopulationnel couplé par la mobilité
+
+    Attributs principaux:
+        S, E, I, R: np.ndarray (N,) des compartiments par zone
+        population: np.ndarray (N,)
+        mobility: matrice (N, N) des flux origine → destination
+        stochastic: tirages aléatoires pour les petites zones (voir step)
+    """
+
+    def __init__(self, cities, mobility, params=None, seed=None, stochastic=False,
+                 threshold=STOCHASTIC_THRESHOLD):
+        self.cities = cities
+        self.stochastic = stochastic
+        self.threshold = threshold
+        self.params = {**DEFAULT_PARAMS, **(params or {})}
+        self.population = zone_column(cities, "population", float)
+
+        self.mobility = mobility
+        self.mobility_t = transpose_mobility(mobility)
+
+        self.rng = np.random.default_rng(seed)
+        self.outbreak_mask = self._select_outbreak_zones()
+        self.current_day = 0
+        self.reset()
+
+    def _select_outbreak_zones(self):
+        """Sélectionne les zones les plus peuplées comme foyers initiaux"""
+        mask = np.zeros(len(self.population), dtype=bool)
+        order = np.argsort(-self.population, kind="stable")
+        mask[order[:N_OUTBREAK_CITIES]] = True
+        return mask
+
+    def reset(self):
+        """Réinitialise les compartiments (foyers: 0.8-1.2% d'infectés)"""
+        random_factor = 0.8 + self.rng.random(len(self.population)) * 0.4
+        self.I = np.where(
+            self.outbreak_mask,
+            self.population * OUTBREAK_PREVALENCE * random_factor,
+            0.0,
+        )
+        self.S = self.population - self.I
+        self.E = np.zeros_like(self.population)
+        self.R = np.zeros_like(self.population)
+        self.current_day = 0
+
+    @property
+    def state(self):
+        """État courant (4, N) dans l'ordre S, E, I, R"""
+        return np.stack([self.S, self.E, self.I, self.R])
+
+    @state.setter
+    def state(self, value):
+        self.S, self.E, self.I, self.R = (np.array(row, dtype=float) for row in value)
+
+    def imported_cases(self, infected=None):
+        """Cas importés pour toutes les zones: μ × Σ_j (I_j / N_j) × flux_j→i"""
+        infected = self.I if infected is None else infected
+        prevalence = infected / self.population
+        return self.params["mu"] * (self.mobility_t @ prevalence)
+
+    def step(self):
+        """Simule un pas de temps (1 jour) pour toutes les zones"""
+        if self.stochastic:
+            self._stochastic_step()
+            return
+
+        beta, sigma, gamma = (self.params[k] for k in ("beta", "sigma", "gamma"))
+
+        new_exposed = beta * self.S * self.I / self.population
+        new_infected = sigma * self.E
+        new_recovered = gamma * self.I
+        imported = self.imported_cases()
+
+        self.S = np.maximum(0, self.S - new_exposed)
+        self.E = np.maximum(0, self.E + new_exposed - new_infected)
+        self.I = np.maximum(0, self.I + new_infected - new_recovered + imported)
+        self.R = np.maximum(0, self.R + new_recovered)
+        self.current_day += 1
+
+    def _stochastic_step(self):
+        """
+        Pas mixte: tirages pour les zones sous le seuil, Euler pour les autres
+
+        Zones aléatoires: transitions de draw_transitions sur des effectifs
+        entiers. Dans les deux branches, les cas importés sont prélevés sur
+        les susceptibles restants: mêmes espérances et population conservée,
+        si bien que le passage d'un mode à l'autre ne décale pas la dynamique
+        moyenne. (Le moteur déterministe, fidèle à EpidemicModel.js, ajoute
+        les importés à I sans les retirer de S.)
+        """
+        beta, sigma, gamma = (self.params[k] for k in ("beta", "sigma", "gamma"))
+        random = (self.E < self.threshold) | (self.I < self.threshold)
+
+        # Effectifs entiers pour les zones tirées (arrondi à l'entrée du mode)
+        for name in COMPARTMENTS:
+            values = getattr(self, name)
+            values[random] = np.round(values[random])
+
+        imported_rate = self.imported_cases()
+        new_exposed = beta * self.S * self.I / self.population
+        new_infected = sigma * self.E
+        new_recovered = gamma * self.I
+        imported = np.minimum(imported_rate, np.maximum(self.S - new_exposed, 0))
+
+        params = {key: value[random] if np.ndim(value) else value
+                  for key, value in self.params.items()}
+        S, E, I = (values[random].astype(np.int64) for values in (self.S, self.E, self.I))
+        drawn = draw_transitions(self.rng, S, E, I, self.population[random],
+                                 imported_rate[random], params)
+        for values, draws in zip((new_exposed, new_infected, new_recovered, imported), drawn):
+            values[random] = draws
+
+        self.S = np.maximum(0, self.S - new_exposed - imported)
+        self.E = np.maximum(0, self.E + new_exposed - new_infected)
+        self.I = np.maximum(0, self.I + new_infected - new_recovered + imported)
+        self.R = np.maximum(0, self.R + new_recovered)
+        self.current_day += 1
+
+    def run(self, days, store=None):
+        """
+        Simule `days` jours
+
+        Args:
+            store: HistoryStore où écrire l'historique (fenêtre glissante,
+                fichier memmap...); par défaut un tableau en mémoire
+        Returns:
+            np.ndarray (days + 1, 4, N): historique S/E/I/R (jour 0 inclus),
+            vue des jours conservés par `store`
+        """
+        if store is None:
+            store = HistoryStore(len(self.population), COMPARTMENTS,
+                                 capacity=days + 1, dtype=float)
+        store.append(self.state)
+        for _ in range(days):
+            self.step()
+            store.append(self.state)
+        store.flush()
+        return store.last()
+
+    def forecast(self, horizons=(7, 14)):
+        """
+        Prévision des cas actifs par zone à J+h sans modifier l'état courant
+
+        Returns:
+            dict {h: np.ndarray (N,)}
+        """
+        saved_state, saved_day = self.state, self.current_day
+        saved_rng = self.rng.bit_generator.state
+        predictions = {}
+        for day in range(1, max(horizons) + 1):
+            self.step()
+            if day in horizons:
+                predictions[day] = self.I.copy()
+        self.state, self.current_day = saved_state, saved_day
+        self.rng.bit_generator.state = saved_rng
+        return predictions
+
+
+# =============================================================================
+# CHIFFRES POUR LA PRÉSENTATION
+# =============================================================================
+
+def simulate_to_date(cities, start_date=START_DATE, today=REFERENCE_DATE,
+                     params=None, seed=0, store=None, mobility=None, stochastic=False):
+    """
+    Simule de `start_date` à `today` puis prévoit J+7 et J+14
+
+    Args:
+        store: HistoryStore optionnel (voir MetapopulationSEIR.run)
+        mobility: matrice de mobilité (défaut: celle de `start_date`)
+        stochastic: mode stochastique des petites zones (une réalisation)
+    Returns:
+        (history, predictions): historique (jours, 4, N) et {7: I, 14: I}
+    """
+    if mobility is None:
+        mobility = build_mobility_matrix(cities, start_date)
+    model = MetapopulationSEIR(cities, mobility, params=params, seed=seed, stochastic=stochastic)
+    history = model.run((today - start_date).days, store)
+    return history, model.forecast((7, 14))
+
+
+def summarize(cities, history, predictions, zones=None, risk=None):
+    """
+    Chiffres des slides pour un sous-ensemble de zones (toutes par défaut)
+
+    Args:
+        zones: masque booléen (N,) des zones à agréger
+        risk: métriques de risque (risk.zone_risk), optionnelles
+    Returns:
+        dict: n_zones, n_abidjan, n_other, active_cases, prediction_7d,
+        prediction_14d, peak_day, peak_cases (+ voir risk.risk_summary)
+    """
+    zones = np.ones(len(cities), dtype=bool) if zones is None else zones
+    active = history[:, COMPARTMENTS.index("I"), :][:, zones].sum(axis=1)
+
+    n_zones = int(zones.sum())
+    n_abidjan = int(np.count_nonzero(zones & (zone_column(cities, "region") == "Abidjan")))
+    figures = {
+        "n_zones": n_zones,
+        "n_abidjan": n_abidjan,
+        "n_other": n_zones - n_abidjan,
+        "active_cases": int(round(active[-1])),
+        "prediction_7d": int(round(predictions[7][zones].sum())),
+        "prediction_14d": int(round(predictions[14][zones].sum())),
+        "peak_day": int(np.argmax(active)),
+        "peak_cases": int(round(active.max())),
+    }
+    if risk is not None:
+        figures.update(risk_summary(risk, zones))
+    return figures
+
+
+def chart_data(cities, history, predictions, zones=None, today=REFERENCE_DATE,
+               top=10, days=30, risk=None):
+    """
+    Séries des graphiques de la slide prototype
+
+    Args:
+        history: historique (jours, 4, N), jusqu'à `today` inclus
+        zones: masque booléen (N,) des zones retenues
+        risk: métriques de risque (risk.zone_risk); les zones de la courbe
+            sont classées par score de risque puis par prévalence
+    Returns:
+        dict: "trend" (cas actifs des `top` zones les plus à risque sur les
+        `days` derniers jours) et "prediction_7d" (prévision J+7 des `top`
+        zones les plus touchées à J+7)
+    """
+    zones = np.ones(len(cities), dtype=bool) if zones is None else zones
+    population = zone_column(cities, "population", float)
+    active = history[-days:, COMPARTMENTS.index("I"), :]
+
+    prevalence = np.where(zones, active[-1] / population, -1)
+    if risk is None:
+        order = np.argsort(-prevalence, kind="stable")
+    else:
+        order = np.lexsort((-prevalence, -np.where(zones, risk["risk_score"], -1)))
+    trend_zones = order[:min(top, zones.sum())]
+    dates = [today - datetime.timedelta(days=len(active) - 1 - k) for k in range(len(active))]
+
+    predicted = np.where(zones, predictions[7], -1)
+    bar_zones = np.argsort(-predicted, kind="stable")[:min(top, zones.sum())]
+    return {
+        "trend": {
+            "categories": [date.strftime("%d/%m") for date in dates],
+            "series": {cities[k]["name"]: active[:, k] for k in trend_zones},
+        },
+        "prediction_7d": {
+            "categories": [cities[k]["name"] for k in bar_zones],
+            "values": predictions[7][bar_zones],
+        },
+    }
+
+
+def deck_figures(cities=None, start_date=START_DATE, today=REFERENCE_DATE,
+                 params=None, seed=0, store=None):
+    """
+    Simule de `start_date` à `today` et renvoie les chiffres nationaux des slides
+
+    Args:
+        store: HistoryStore optionnel où conserver l'historique (graphiques)
+    Returns:
+        dict: voir summarize()
+    """
+    cities = cities if cities is not None else load_cities()
+    mobility = build_mobility_matrix(cities, start_date)
+    history, predictions = simulate_to_date(cities, start_date, today, params, seed, store,
+                                            mobility)
+    risk = zone_risk(cities, history[-TREND_DAYS:, COMPARTMENTS.index("I")], mobility,
+                     mobility_model(cities).inflow(start_date))
+    figures = summarize(cities, history, predictions, risk=risk)
+    figures["charts"] = chart_data(cities, history, predictions, today=today, risk=risk)
+    return figures
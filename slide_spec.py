@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Slides décrites comme des données (JSON / YAML) et compilées en plan de mise en page
+
+Une spécification décrit une slide avec des éléments de haut niveau
+(titre, boîte, zone de texte, image, rangée de boîtes fléchées, tableau)
+positionnés en pouces. `compile_slide` la transforme en plan: une liste
+d'opérations aux coordonnées EMU absolues, couleurs du thème résolues.
+
+Le plan est mémoïsé par hash de la spécification et du thème: regénérer des
+centaines de decks avec des chiffres différents ne refait pas la mise en
+page, seuls les textes (gabarits `{clé}`) sont reformatés à l'émission.
+"""
+
+import hashlib
+import json
+import os
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+EMU_PER_INCH = 914400
+
+SLIDES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "slides")
+
+# Valeurs par défaut (mêmes que add_shape_with_text / add_text_box)
+BOX_DEFAULTS = {
+    "fill": "GRIS_CLAIR",
+    "line": "ORANGE_CI",
+    "font_size": 16,
+    "font_color": "NOIR",
+    "bold": False,
+    "align": "left",
+}
+TEXT_DEFAULTS = {
+    "font_size": 18,
+    "font_color": "NOIR",
+    "bold": False,
+    "align": "left",
+}
+
+# Valeurs des gabarits absentes des chiffres fournis: textes du deck statique
+# d'origine (sans ensemble Monte Carlo ni backtest, ou sans chiffres). Aucun
+# intervalle chiffré n'est inventé: les lignes d'intervalle ne sont remplies
+# que par les résultats d'un ensemble (generate_presentation.interval_claims)
+FIGURE_DEFAULTS = {
+    "n_zones": 30,
+    "ci_line": "",
+    "interval_claim": "Intervalle de confiance ±15%",
+    "accuracy_claim": "Précision visée >75%",
+}
+
+# Plans compilés (hash de la spécification -> plan)
+_PLAN_CACHE = {}
+
+# Spécifications déjà lues ((chemin, mtime) -> spec)
+_SPEC_CACHE = {}
+
+# =============================================================================
+# CHARGEMENT
+# =============================================================================
+
+def load_spec(path):
+    """Charge une spécification de slide (.json, ou .yaml si PyYAML est installé)"""
+    if not os.path.isabs(path) and not os.path.exists(path):
+        path = os.path.join(SLIDES_DIR, path)
+
+    key = (path, os.path.getmtime(path))
+    if key in _SPEC_CACHE:
+        return _SPEC_CACHE[key]
+
+    with open(path, encoding="utf-8") as f:
+        if path.endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError(
+                    f"PyYAML est requis pour lire {path} (pip install pyyaml)"
+                )
+            spec = yaml.safe_load(f)
+        else:
+            spec = json.load(f)
+
+    _SPEC_CACHE[key] = spec
+    return spec
+
+
+def spec_hash(spec, theme):
+    """Hash stable d'une spécification et du thème de couleurs"""
+    payload = json.dumps(
+        {"spec": spec, "theme": {k: str(v) for k, v in theme.items()}},
+        ensure_ascii=False, sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# =============================================================================
+# COMPILATION
+# =============================================================================
+
+def _color(value, theme):
+    """Résout un nom de couleur du thème ("ORANGE_CI") ou un triplet [r, g, b]"""
+    if isinstance(value, str):
+        if value not in theme:
+            raise KeyError(f"Couleur inconnue dans le thème: {value}")
+        return theme[value]
+    return tuple(value)
+
+
+def _style(element, defaults, theme):
+    """Fusionne le style d'un élément avec les valeurs par défaut"""
+    style = {key: element.get(key, default) for key, default in defaults.items()}
+    for key in ("fill", "line", "font_color"):
+        if key in style:
+            style[key] = _color(style[key], theme)
+    return style
+
+
+def _emu(inches):
+    """Pouces -> EMU (arrondi, pour absorber les erreurs d'addition flottante)"""
+    return int(round(inches * EMU_PER_INCH)) if inches is not None else None
+
+
+def _op(kind, left, top, width, height, text=None, **style):
+    """Opération élémentaire du plan (coordonnées converties en EMU)"""
+    return {
+        "kind": kind,
+        "left": _emu(left),
+        "top": _emu(top),
+        "width": _emu(width),
+        "height": _emu(height),
+        "text": text,
+        "style": style,
+    }
+
+
+def _compile_row(element, theme):
+    """Rangée de boîtes de même taille séparées par un symbole (ex: flèche)"""
+    ops = []
+    left, top = element["left"], element["top"]
+    width, height = element["item_width"], element["item_height"]
+    gap = element.get("gap", 0)
+    separator = element.get("separator")
+    separator_width = separator["width"] if separator else 0
+
+    x = left
+    for k, item in enumerate(element["items"]):
+        ops.append(_op("box", x, top, width, height, item["text"],
+                       **_style({**element.get("style", {}), **item}, BOX_DEFAULTS, theme)))
+        if separator and k < len(element["items"]) - 1:
+            ops.append(_op(
+                "text", x + width, top + height / 2 - separator["height"] / 2,
+                separator_width, separator["height"], separator["text"],
+                **_style(separator, TEXT_DEFAULTS, theme),
+            ))
+        x += width + separator_width + gap
+    return ops
+
+
+def _compile_table(element, theme):
+    """Tableau de boîtes: une boîte par cellule, lignes de hauteur fixe"""
+    ops = []
+    top = element["top"]
+    row_height = element["row_height"]
+    row_spacing = element.get("row_spacing", 0)
+
+    for i, row in enumerate(element["rows"]):
+        row_top = top + i * (row_height + row_spacing)
+        for column, text in zip(element["columns"], row):
+            ops.append(_op("box", column["left"], row_top, column["width"], row_height,
+                           text, **_style(column, BOX_DEFAULTS, theme)))
+    return ops
+
+
+def _compile_element(element, theme):
+    """Compile un élément de la spécification en opérations du plan"""
+    kind = element["type"]
+    if kind == "row":
+        return _compile_row(element, theme)
+    if kind == "table":
+        return _compile_table(element, theme)
+    if kind == "box":
+        return [_op("box", element["left"], element["top"], element["width"],
+                    element["height"], element["text"],
+                    **_style(element, BOX_DEFAULTS, theme))]
+    if kind == "text":
+        return [_op("text", element["left"], element["top"], element["width"],
+                    element["height"], element["text"],
+                    **_style(element, TEXT_DEFAULTS, theme))]
+    if kind == "image":
+        return [_op("image", element["left"], element["top"], element.get("width"),
+                    element.get("height"), path=element["path"])]
+    raise ValueError(f"Type d'élément inconnu: {kind}")
+
+
+def compile_slide(spec, theme):
+    """
+    Compile une spécification de slide en plan de mise en page
+
+    Args:
+        spec: dict {"title": {"text", "font_size"}, "page": int,
+                    "elements": [...]}
+        theme: dict nom -> couleur (ex: {"ORANGE_CI": ORANGE_CI, ...})
+    Returns:
+        dict: {"title", "page", "ops"} (mémoïsé par hash de spec + thème)
+    """
+    key = spec_hash(spec, theme)
+    plan = _PLAN_CACHE.get(key)
+    if plan is None:
+        ops = []
+        for element in spec.get("elements", []):
+            ops.extend(_compile_element(element, theme))
+        plan = {"title": spec.get("title"), "page": spec.get("page"), "ops": ops}
+        _PLAN_CACHE[key] = plan
+    return plan
+
+
+def render_text(template, figures):
+    """
+    Remplit un gabarit de texte (`{clé}`) avec les chiffres du deck
+
+    Les clés absentes de `figures` prennent leur valeur de FIGURE_DEFAULTS;
+    une clé inconnue des deux lève KeyError (faute de frappe dans la spec).
+    """
+    return template.format_map({**FIGURE_DEFAULTS, **(figures or {})})
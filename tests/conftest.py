@@ -0,0 +1,8 @@
+"""Les scripts du projet sont à la racine du dépôt: rendus importables par les tests"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
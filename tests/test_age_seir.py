@@ -0,0 +1,66 @@
+"""Modèle SEIR structuré par âge (age_seir.py)"""
+
+import numpy as np
+import pytest
+
+from age_seir import ZONE_TYPES, AgeStructuredSEIR, proportional_contacts
+from cities import load_cities, synthetic_cities
+from mobility import build_mobility_matrix
+from seir_engine import START_DATE, MetapopulationSEIR
+
+N_BANDS = 4
+
+
+@pytest.fixture(scope="module")
+def network():
+    cities = load_cities()
+    return cities, build_mobility_matrix(cities, START_DATE)
+
+
+def test_proportional_model_reduces_to_homogeneous(network):
+    cities, mobility = network
+    age_model = AgeStructuredSEIR(cities, mobility, contacts=proportional_contacts(N_BANDS),
+                                  n_bands=N_BANDS, travel_weights=np.ones(N_BANDS), seed=3)
+    homogeneous = MetapopulationSEIR(cities, mobility, seed=3)
+
+    history, _ = age_model.run(60)
+    np.testing.assert_allclose(history.sum(axis=-1), homogeneous.run(60), rtol=1e-9)
+
+
+def test_contacts_follow_zone_types():
+    cities = list(load_cities()) + list(synthetic_cities(10, seed=1))     # zones rurales
+    contacts = np.stack([proportional_contacts(N_BANDS)] * len(ZONE_TYPES))
+    model = AgeStructuredSEIR(cities, build_mobility_matrix(cities, START_DATE),
+                              contacts=contacts, n_bands=N_BANDS)
+
+    expected = [ZONE_TYPES.index(city["urbanType"]) for city in cities]
+    np.testing.assert_array_equal(model.zone_type, expected)
+    assert set(model.zone_type) == {0, 1, 2}
+
+
+def test_unknown_zone_type_raises(network):
+    cities, mobility = network
+    cities = [dict(city) for city in cities]
+    cities[0]["urbanType"] = "lagunaire"
+    contacts = np.stack([proportional_contacts(N_BANDS)] * len(ZONE_TYPES))
+    with pytest.raises(ValueError, match="lagunaire"):
+        AgeStructuredSEIR(cities, mobility, contacts=contacts, n_bands=N_BANDS)
+
+
+def test_zone_type_without_contacts_raises(network):
+    cities, mobility = network
+    contacts = np.stack([proportional_contacts(N_BANDS)] * 2)
+    with pytest.raises(ValueError):
+        AgeStructuredSEIR(cities, mobility, contacts=contacts, n_bands=N_BANDS,
+                          zone_type=np.full(len(cities), 2))
+
+
+def test_susceptibility_accepts_list_and_checks_length(network):
+    cities, mobility = network
+    model = AgeStructuredSEIR(cities, mobility, n_bands=N_BANDS,
+                              susceptibility=[0.5, 1, 1, 1.2])
+    assert model.susceptibility.dtype == float
+    model.step()
+
+    with pytest.raises(ValueError, match="susceptibility"):
+        AgeStructuredSEIR(cities, mobility, n_bands=N_BANDS, susceptibility=[1, 1])
@@ -0,0 +1,76 @@
+"""Backtest à origine glissante (backtest.py)"""
+
+import datetime
+
+import numpy as np
+import pytest
+
+import backtest
+from cities import load_cities
+from ensemble import simulate_batch
+from mobility import build_mobility_matrix
+from seir_engine import DEFAULT_PARAMS, START_DATE, MetapopulationSEIR
+
+
+@pytest.fixture(scope="module")
+def setting():
+    cities = load_cities()
+    mobility = build_mobility_matrix(cities, START_DATE)
+    model = MetapopulationSEIR(cities, mobility, seed=0)
+    history = model.run(40)
+    return cities, mobility, history
+
+
+def test_national_interval_from_run_totals(setting):
+    cities, mobility, history = setting
+    backtest._init_worker(cities, mobility, dict(DEFAULT_PARAMS), 0, 100)
+    observed = np.ones((len(backtest.HORIZONS), len(cities)), dtype=bool)
+    observed[:, ::3] = False
+    window = backtest.forecast_window((20, history[20], observed))
+
+    runs = simulate_batch(
+        np.random.default_rng([0, 20]), backtest._worker["mobility_t"],
+        backtest._worker["population"], backtest._worker["params"],
+        100, max(backtest.HORIZONS), backtest.HORIZONS, initial=history[20],
+    )
+    totals = np.where(observed[:, None, :], runs, 0).sum(axis=2)
+    expected = np.quantile(totals, backtest.WINDOW_QUANTILES, axis=1)
+    np.testing.assert_allclose(window["national"], expected)
+
+    # Plus étroit que la somme des quantiles par zone
+    zones = np.where(observed, window["zones"], 0).sum(axis=2)
+    assert np.all(window["national"][2] - window["national"][1] < zones[2] - zones[1])
+
+
+def test_national_coverage_uses_national_band(setting):
+    cities, mobility, history = setting
+    cases = history[:, 2, :].copy()
+    cases[30:, 0] = np.nan
+    windows = {
+        t: {"zones": np.zeros((3, 2, len(cities))),
+            "national": np.stack([np.full(2, 1.0), np.full(2, 0.0), np.full(2, 2.0)])}
+        for t in range(backtest.MIN_HISTORY, len(cases) - 7)
+    }
+    # Bande nationale [0, 2] quelle que soit la somme des bandes par zone
+    summary = backtest.summarize_backtest(cities, cases, windows)
+    assert summary["national"]["7"]["coverage"] == 0.0
+
+
+def test_run_key_depends_on_start_date(setting):
+    cities = setting[0]
+    keys = {backtest._run_key(cities, DEFAULT_PARAMS, 0, START_DATE + datetime.timedelta(days=d))
+            for d in range(3)}
+    assert len(keys) == 3
+
+
+def test_backtest_scores_and_cache(setting, tmp_path):
+    cities, _, history = setting
+    cases = history[:, 2, :]
+    summary = backtest.backtest(cities, cases, n_runs=50, n_workers=1, cache_dir=str(tmp_path))
+    for horizon in ("7", "14"):
+        scores = summary["national"][horizon]
+        assert scores["n_windows"] > 0
+        assert 0 <= scores["coverage"] <= 100
+
+    cached = backtest.backtest(cities, cases, n_runs=50, n_workers=1, cache_dir=str(tmp_path))
+    assert cached["national"] == summary["national"]
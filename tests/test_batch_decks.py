@@ -0,0 +1,30 @@
+"""Manifeste des decks en lot (batch_decks.py)"""
+
+import json
+
+import pytest
+
+from batch_decks import load_manifest
+from generate_presentation import REQUIRED_FIGURES
+
+FIGURES = {key: 10 for key in REQUIRED_FIGURES}
+
+
+def _manifest(tmp_path, decks):
+    path = tmp_path / "manifest.json"
+    path.write_text(json.dumps({"decks": decks}), encoding="utf-8")
+    return str(path)
+
+
+def test_valid_manifest_loads(tmp_path):
+    decks = [{"output": "a.pptx", "figures": FIGURES}]
+    assert load_manifest(_manifest(tmp_path, decks)) == decks
+
+
+@pytest.mark.parametrize("figures", [None, {"n_zones": 3}])
+def test_incomplete_figures_name_the_deck(tmp_path, figures):
+    decks = [{"output": "a.pptx", "figures": FIGURES}, {"output": "savanes.pptx"}]
+    if figures is not None:
+        decks[1]["figures"] = figures
+    with pytest.raises(ValueError, match="savanes.pptx"):
+        load_manifest(_manifest(tmp_path, decks))
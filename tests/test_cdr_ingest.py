@@ -0,0 +1,36 @@
+"""Détection des déplacements en flux (cdr_ingest.TripDetector)"""
+
+import numpy as np
+
+from cdr_ingest import TripDetector
+
+
+def _reference_trips(subscriber, time_ns, zone):
+    """Déplacements calculés sur tout le flux d'un coup (ordre abonné, instant)"""
+    order = np.lexsort((time_ns, subscriber))
+    subscriber, time_ns, zone = subscriber[order], time_ns[order], zone[order]
+    moved = (subscriber[1:] == subscriber[:-1]) & (zone[1:] != zone[:-1])
+    return set(zip(subscriber[1:][moved].tolist(), time_ns[1:][moved].tolist(),
+                   zone[:-1][moved].tolist(), zone[1:][moved].tolist()))
+
+
+def test_chunked_detection_matches_whole_stream():
+    rng = np.random.default_rng(0)
+    n_chunks, chunk = 40, 500
+    subscriber = rng.integers(0, 3000, n_chunks * chunk).astype(np.uint64) * np.uint64(7919)
+    # Blocs ordonnés dans le temps, désordonnés à l'intérieur
+    time_ns = (np.repeat(np.arange(n_chunks), chunk) * 10**9
+               + rng.integers(0, 10**9, n_chunks * chunk))
+    zone = rng.integers(0, 5, n_chunks * chunk).astype(np.int32)
+
+    detector, trips = TripDetector(), set()
+    for k in range(n_chunks):
+        part = slice(k * chunk, (k + 1) * chunk)
+        found = detector.detect(subscriber[part], time_ns[part], zone[part])
+        trips.update(zip(*(column.tolist() for column in found)))
+
+    assert trips == _reference_trips(subscriber, time_ns, zone)
+    # État en séries de tailles géométriques
+    sizes = [len(keys) for keys, _ in detector._runs]
+    assert all(big >= 2 * small for big, small in zip(sizes, sizes[1:]))
+    assert sum(sizes) == len(np.unique(subscriber))
@@ -0,0 +1,33 @@
+"""Graphiques natifs de la slide prototype (charts.py)"""
+
+import io
+
+import numpy as np
+from pptx import Presentation
+from pptx.enum.chart import XL_CHART_TYPE
+from pptx.util import Inches
+
+from charts import add_chart
+
+
+def test_charts_embed_editable_data():
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    series = {"Yopougon": np.array([1.0, 2.5, 4.0]), "Bouaké & co": np.array([3, 2, 1])}
+    add_chart(slide, "line", ["01/12", "02/12", "03/12"], series,
+              Inches(0), Inches(0), Inches(5), Inches(4), title="Cas actifs")
+    add_chart(slide, "bar", ["Plateau", "Cocody"], {"Prédiction J+7": [10, 20]},
+              Inches(5), Inches(0), Inches(4), Inches(4), legend=None)
+
+    buffer = io.BytesIO()
+    prs.save(buffer)
+    line, bar = (shape.chart for shape in Presentation(buffer).slides[0].shapes)
+
+    assert line.chart_type == XL_CHART_TYPE.LINE_MARKERS
+    assert [s.name for s in line.plots[0].series] == list(series)
+    assert line.plots[0].series[0].values == (1.0, 2.5, 4.0)
+    assert line.chart_title.text_frame.text == "Cas actifs"
+    assert bar.chart_type == XL_CHART_TYPE.COLUMN_CLUSTERED
+    assert not bar.has_legend
+    # Classeur embarqué: "Modifier les données" disponible dans PowerPoint
+    assert line.part.chart_workbook.xlsx_part is not None
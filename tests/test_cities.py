@@ -0,0 +1,28 @@
+"""Registre des zones (cities.py)"""
+
+import os
+
+import numpy as np
+
+import cities
+from cities import load_cities, synthetic_cities, zone_column
+
+
+def test_synthetic_zones_reuse_existing_rural_type():
+    first = synthetic_cities(20, seed=1)
+    again = synthetic_cities(15, seed=2, anchors=first)
+    assert again.urban_types.count("rural") == 1
+    assert set(zone_column(again, "urbanType")) == {"rural"}
+
+
+def test_registry_cache_keyed_by_dtype(tmp_path, monkeypatch):
+    registry = load_cities(cache_dir=str(tmp_path))
+    assert load_cities(cache_dir=str(tmp_path)).ids == registry.ids
+    assert len([f for f in os.listdir(tmp_path) if f.endswith(".npy")]) == 1
+
+    wider = np.dtype([(name, "<i8" if name == "centrality" else cities.ZONE_DTYPE[name])
+                      for name in cities.ZONE_DTYPE.names])
+    monkeypatch.setattr(cities, "ZONE_DTYPE", wider)
+    reloaded = load_cities(cache_dir=str(tmp_path))
+    assert reloaded.table.dtype == wider
+    assert len([f for f in os.listdir(tmp_path) if f.endswith(".npy")]) == 2
@@ -0,0 +1,46 @@
+"""Démon de présentations (deck_daemon.DeckDaemon)"""
+
+import asyncio
+import os
+
+import pytest
+
+from deck_daemon import DeckDaemon, QueueFull
+from seir_engine import deck_figures
+
+
+@pytest.fixture(scope="module")
+def figures():
+    return deck_figures()
+
+
+async def _with_daemon(coroutine, n_workers=1, queue_size=2):
+    daemon = DeckDaemon(n_workers, queue_size)
+    await daemon.start()
+    try:
+        return daemon, await coroutine(daemon)
+    finally:
+        daemon.close()
+
+
+def test_batch_larger_than_queue(figures, tmp_path):
+    decks = [{"output": f"decks/{k}.pptx", "figures": figures} for k in range(7)]
+    request = {"action": "batch", "decks": decks, "cwd": str(tmp_path)}
+
+    daemon, response = asyncio.run(_with_daemon(lambda d: d.handle(request)))
+    assert response["ok"], response
+    assert len(response["decks"]) == 7
+    assert all(os.path.exists(tmp_path / deck["output"]) for deck in decks)
+    assert daemon.stats["rejected"] == 0
+
+
+def test_single_build_rejected_when_queue_full(figures, tmp_path):
+    async def flood(daemon):
+        jobs = [asyncio.create_task(daemon.build(
+            {"figures": figures, "output": f"{k}.pptx", "cwd": str(tmp_path)}))
+            for k in range(6)]
+        return await asyncio.gather(*jobs, return_exceptions=True)
+
+    daemon, results = asyncio.run(_with_daemon(flood))
+    rejected = [r for r in results if isinstance(r, QueueFull)]
+    assert rejected and daemon.stats["rejected"] == len(rejected)
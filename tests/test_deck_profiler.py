@@ -0,0 +1,15 @@
+"""Comparaison de rapports de profilage (deck_profiler.compare_reports)"""
+
+from deck_profiler import compare_reports, format_change
+
+
+def test_compare_reports_missing_or_zero_baseline():
+    report = {"stages": {"zero": {"mean_ms": 10.0}, "slower": {"mean_ms": 20.0},
+                         "new": {"mean_ms": 50.0}, "partial": {}}}
+    baseline = {"stages": {"zero": {"mean_ms": 0.0}, "slower": {"mean_ms": 5.0},
+                           "partial": {"mean_ms": 1.0}}}
+    regressions = {r["stage"]: r for r in compare_reports(report, baseline)}
+
+    assert set(regressions) == {"zero", "slower"}
+    assert format_change(regressions["zero"]["change_pct"]) == "n/a"
+    assert format_change(regressions["slower"]["change_pct"]) == "+300.0%"
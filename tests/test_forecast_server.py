@@ -0,0 +1,107 @@
+"""Serveur de prévisions du dashboard (forecast_server.py)"""
+
+import asyncio
+import datetime
+import threading
+
+import numpy as np
+import pytest
+
+import forecast_server
+from cities import load_cities
+from forecast_server import ForecastService, TTLCache, encode_binary
+from seir_engine import COMPARTMENTS, START_DATE
+
+
+@pytest.fixture(scope="module")
+def service():
+    return ForecastService(load_cities(), {"default": None})
+
+
+def _day(offset):
+    return (START_DATE + datetime.timedelta(days=offset)).isoformat()
+
+
+def test_cache_entries_expire(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(forecast_server.time, "monotonic", lambda: now[0])
+    cache = TTLCache(maxsize=4, ttl=10)
+    cache.put("a", 1)
+    now[0] = 9.9
+    assert cache.get("a") == 1
+    now[0] = 10.1
+    assert cache.get("a") is None
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")                      # "b" devient le moins récent
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+
+
+def test_binary_encoding_shape_headers():
+    columns = {"date": ["2025-06-01", "2025-06-02"],
+               "I": np.arange(6.0).reshape(2, 3), "new_cases": np.ones((2, 3))}
+    content_type, body, headers = encode_binary(columns)
+    assert content_type == "application/octet-stream"
+    assert headers == {"X-Columns": "I,new_cases", "X-Shape": "2,2,3"}
+    decoded = np.frombuffer(body, dtype="<f4").reshape(2, 2, 3)
+    np.testing.assert_array_equal(decoded[0], columns["I"])
+
+    with pytest.raises(ValueError):
+        encode_binary({"date": ["2025-06-01"]})
+
+
+@pytest.mark.parametrize("day, days", [(5, 30), (40, 10)])
+def test_new_cases_are_entries_into_I(service, day, days):
+    """Cas du jour d = σ·E(d-1), vérifié par le bilan de I entre d-1 et d"""
+    columns = service.history({"day": _day(day), "days": str(days),
+                               "compartments": "I,new_cases"})
+    first = max(0, day - days + 1)
+    assert columns["date"][0] == _day(first) and columns["date"][-1] == _day(day)
+    assert len(columns["new_cases"]) == len(columns["I"]) == day - first + 1
+
+    cursor = service.cursors["default"]
+    history = cursor.history(day)
+    model = cursor.model
+    for k, d in enumerate(range(first, day + 1)):
+        if d == 0:
+            assert np.isnan(columns["new_cases"][k]).all()    # pas de veille simulée
+            continue
+        previous_I = history[d - 1, COMPARTMENTS.index("I")]
+        entries = (history[d, COMPARTMENTS.index("I")] - previous_I
+                   + model.params["gamma"] * previous_I - model.imported_cases(previous_I))
+        np.testing.assert_allclose(columns["new_cases"][k], entries, rtol=1e-9, atol=1e-6)
+
+
+def test_identical_requests_share_one_computation(monkeypatch):
+    service = ForecastService(load_cities(), {"default": None})
+    calls = []
+    release = threading.Event()
+
+    def encode(route, query):
+        calls.append((route, query))
+        release.wait(5)
+        return "application/json", b"{}", {}
+
+    monkeypatch.setattr(service, "encode", encode)
+
+    async def requests():
+        query = {"day": _day(3)}
+        first = asyncio.ensure_future(service.respond("metrics", dict(query)))
+        second = asyncio.ensure_future(service.respond("metrics", dict(query)))
+        await asyncio.sleep(0.05)
+        release.set()
+        responses = await asyncio.gather(first, second)
+        return responses + [await service.respond("metrics", dict(query))]
+
+    responses = asyncio.run(requests())
+    assert len(calls) == 1
+    assert responses[0] == responses[1] == responses[2]
+    assert service.cache.hits == 1
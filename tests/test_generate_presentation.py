@@ -0,0 +1,29 @@
+"""Construction du deck (generate_presentation.py)"""
+
+import os
+
+import pytest
+
+import generate_presentation as gp
+from seir_engine import deck_figures
+
+pytestmark = pytest.mark.skipif(
+    not os.path.exists(os.path.join(os.path.dirname(gp.__file__), gp.ARCHITECTURE_IMAGE)),
+    reason="images des slides absentes",
+)
+
+
+@pytest.fixture(autouse=True)
+def repo_root(monkeypatch):
+    """Images des slides lues depuis la racine du dépôt, cache vidé"""
+    monkeypatch.chdir(os.path.dirname(gp.__file__))
+    monkeypatch.setattr(gp, "_MEDIA_CACHE", {})
+
+
+def test_preload_covers_display_boxes():
+    gp.preload_media()
+    preloaded = set(gp._MEDIA_CACHE)
+    prs = gp.build_presentation(deck_figures())
+
+    assert set(gp._MEDIA_CACHE) == preloaded
+    assert gp.media_savings(prs)["saved_bytes"] > 0
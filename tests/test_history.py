@@ -0,0 +1,45 @@
+"""Historique de simulation (history.py)"""
+
+import numpy as np
+import pytest
+
+from history import HistoryStore
+
+COMPARTMENTS = ("S", "E", "I", "R")
+N_ZONES = 3
+WINDOW = 5
+
+
+def _state(day):
+    return np.arange(len(COMPARTMENTS) * N_ZONES).reshape(len(COMPARTMENTS), N_ZONES) + 100 * day
+
+
+def test_window_wraps_around(tmp_path):
+    path = str(tmp_path / "history.npy")
+    store = HistoryStore(N_ZONES, COMPARTMENTS, window=WINDOW, path=path)
+    appended = []
+    for day in range(3 * WINDOW + 2):                  # plus de deux tours de fenêtre
+        store.append(_state(day))
+        appended.append(_state(day))
+        expected = np.array(appended[-WINDOW:])
+        np.testing.assert_array_equal(store.last(), expected)
+        np.testing.assert_array_equal(store.last(2), expected[-2:])
+        np.testing.assert_array_equal(store.compartment("I"), expected[:, 2])
+        # Chaque jour est écrit deux fois: les deux moitiés restent identiques
+        filled = min(len(appended), WINDOW)
+        np.testing.assert_array_equal(store._data[:filled], store._data[WINDOW:WINDOW + filled])
+    assert len(store) == WINDOW and store.total_days == len(appended)
+
+    store.flush()
+    reopened = HistoryStore.open(path)
+    assert reopened.total_days == len(appended) and reopened.compartments == COMPARTMENTS
+    np.testing.assert_array_equal(reopened.last(), np.array(appended[-WINDOW:]))
+
+
+def test_fixed_capacity_fills_then_raises():
+    store = HistoryStore(N_ZONES, COMPARTMENTS, capacity=3)
+    for day in range(3):
+        store.append(_state(day))
+    np.testing.assert_array_equal(store.last(), np.array([_state(day) for day in range(3)]))
+    with pytest.raises(IndexError):
+        store.append(_state(3))
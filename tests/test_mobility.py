@@ -0,0 +1,31 @@
+"""Matrice de mobilité (mobility.py)"""
+
+import datetime
+
+import numpy as np
+
+from cities import load_cities
+from mobility import MobilityModel, build_mobility_matrix, mobility_model
+
+DATE = datetime.date(2025, 12, 3)
+
+
+def test_model_shared_per_city_table(tmp_path):
+    cities = load_cities()
+    model = mobility_model(cities, str(tmp_path))
+    assert mobility_model([dict(city) for city in cities], str(tmp_path)) is model
+
+    build_mobility_matrix(cities, DATE, cache_dir=str(tmp_path))
+    assert DATE.month in model._variants          # variante réutilisée ensuite
+    np.testing.assert_array_equal(model.inflow(DATE), model.matrix(DATE).sum(axis=0))
+
+    moved = [dict(city) for city in cities]
+    moved[0]["population"] *= 2
+    assert mobility_model(moved, str(tmp_path)) is not model
+
+
+def test_shared_model_matches_fresh_model(tmp_path):
+    cities = load_cities()
+    matrix = build_mobility_matrix(cities, DATE, cache_dir=str(tmp_path))
+    assert matrix.flags.writeable
+    np.testing.assert_array_equal(matrix, MobilityModel(cities, None).matrix(DATE))
@@ -0,0 +1,21 @@
+"""Balayage de la campagne d'information (multiplex.sweep)"""
+
+from cities import load_cities
+from multiplex import NO_CAMPAIGN, sweep
+
+
+def _averted(result):
+    return {(row["omega"], row["psi"], row["xi"]): row["cases_averted"]
+            for row in result["rows"]}
+
+
+def test_reference_row_independent_of_grid_order():
+    cities = load_cities()
+    ordered = sweep(cities, [NO_CAMPAIGN, (0.1, 0.0, 0.0), (0.3, 0.3, 0.5)],
+                    days=30, n_workers=1)
+    shuffled = sweep(cities, [(0.3, 0.3, 0.5), (0, 0, 0), (0.1, 0, 0)], days=30, n_workers=1)
+    missing = sweep(cities, [[0.3, 0.3, 0.5], [0.1, 0, 0]], days=30, n_workers=1)
+
+    assert _averted(ordered) == _averted(shuffled) == _averted(missing)
+    assert _averted(ordered)[NO_CAMPAIGN] == 0
+    assert len(missing["rows"]) == 3
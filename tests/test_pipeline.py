@@ -0,0 +1,43 @@
+"""Pipeline quotidien (pipeline.DailyPipeline)"""
+
+import datetime
+
+import numpy as np
+import pytest
+
+from pipeline import DailyPipeline
+from seir_engine import COMPARTMENTS, START_DATE, MetapopulationSEIR
+
+
+def _pipeline(tmp_path):
+    return DailyPipeline(workdir=str(tmp_path / "pipeline"), od_dir=str(tmp_path / "od"),
+                         cases_dir=str(tmp_path / "cases"), n_runs=20)
+
+
+def test_bootstrap_at_start_date(tmp_path):
+    pipeline = _pipeline(tmp_path)
+    _, recomputed = pipeline.advance(START_DATE)
+    assert recomputed == [START_DATE]
+
+    # Premier jour = état initial du modèle (aucun cas observé à recaler)
+    history = pipeline.history(START_DATE)
+    model = MetapopulationSEIR(pipeline.cities, np.zeros((len(pipeline.cities),) * 2),
+                               params=pipeline.params, seed=pipeline.seed)
+    assert history.shape == (1, len(COMPARTMENTS), len(pipeline.cities))
+    np.testing.assert_allclose(history[0], model.state)
+
+    next_day = START_DATE + datetime.timedelta(days=1)
+    _, recomputed = pipeline.advance(next_day)
+    assert recomputed == [next_day]
+    assert len(pipeline.history(next_day)) == 2
+
+
+def test_run_at_start_date(tmp_path):
+    report = _pipeline(tmp_path).run(START_DATE, n_workers=1)
+    assert report["recomputed_days"] == [START_DATE.isoformat()]
+    assert "national" in report["rebuilt"]
+
+
+def test_bootstrap_before_start_date_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        _pipeline(tmp_path).advance(START_DATE - datetime.timedelta(days=1))
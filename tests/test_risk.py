@@ -0,0 +1,57 @@
+"""Métriques de risque (risk.py) contre des valeurs calculées à la main (getMetrics)"""
+
+import numpy as np
+import pytest
+
+from risk import TREND_DAYS, js_round, risk_summary, zone_risk
+
+CITIES = [
+    {"population": 10000, "centrality": 100},
+    {"population": 20000, "centrality": 50},
+    {"population": 5000, "centrality": 20},
+]
+MOBILITY = np.array([
+    [0, 2000, 1000],
+    [4000, 0, 500],
+    [0, 3000, 0],
+], dtype=float)                                 # Flux entrants: 4000, 5000, 1500
+
+
+@pytest.fixture
+def infected():
+    """Cas actifs sur la fenêtre de tendance (linéaires du premier au dernier jour)"""
+    return np.linspace([20, 200, 9.65], [30, 200, 10], TREND_DAYS)
+
+
+def test_js_round_rounds_half_up():
+    np.testing.assert_array_equal(js_round([48.5, 62.5, -0.5, 1.4]), [49, 63, 0, 1])
+
+
+def test_zone_risk_matches_js_formulas(infected):
+    risk = zone_risk(CITIES, infected, MOBILITY)
+
+    # prévalence (≤40) + mobilité (≤30) + capacité (≤30): 30+12+0, 40+15+15, 20+4.5+24
+    np.testing.assert_array_equal(risk["risk_score"], [42, 70, 49])
+    assert list(risk["quarantine_status"]) == ["moderate", "severe", "moderate"]
+    np.testing.assert_array_equal(risk["target_threshold"], [60, 85, 60])
+
+    np.testing.assert_array_equal(risk["trend"], [100, 0, 50])
+    np.testing.assert_array_equal(risk["affluence"], [100, 0, 33])   # zone 1 rouge
+    np.testing.assert_array_equal(risk["risk"], [10, 25, 45])
+    np.testing.assert_array_equal(risk["capacity"], [0, 50, 80])
+    # 35%·tendance + 25%·affluence + 25%·seuil + 15%·capacité
+    np.testing.assert_array_equal(risk["probability"], [63, 14, 49])
+
+
+def test_precomputed_inflow_gives_same_metrics(infected):
+    recomputed = zone_risk(CITIES, infected, MOBILITY)
+    given = zone_risk(CITIES, infected, MOBILITY, MOBILITY.sum(axis=0))
+    for name, values in recomputed.items():
+        np.testing.assert_array_equal(given[name], values)
+
+
+def test_short_history_has_no_transition(infected):
+    risk = zone_risk(CITIES, infected[-3:], MOBILITY)
+    np.testing.assert_array_equal(risk["probability"], [0, 0, 0])
+    assert risk_summary(risk) == {"high_risk_zones": 0, "zones_moderate": 2,
+                                  "zones_severe": 1, "zones_strict": 0}
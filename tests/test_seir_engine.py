@@ -0,0 +1,59 @@
+"""Moteur SEIR métapopulationnel (seir_engine.py) et ensemble Monte Carlo"""
+
+import numpy as np
+import pytest
+
+from cities import load_cities
+from ensemble import simulate_batch
+from mobility import build_mobility_matrix
+from seir_engine import COMPARTMENTS, START_DATE, MetapopulationSEIR
+
+
+@pytest.fixture(scope="module")
+def state():
+    """Modèle déterministe après 60 jours, effectifs arrondis"""
+    cities = load_cities()
+    model = MetapopulationSEIR(cities, build_mobility_matrix(cities, START_DATE), seed=0)
+    model.run(60)
+    model.state = np.round(model.state)
+    return model
+
+
+def test_stochastic_engine_and_ensemble_share_kernel(state):
+    engine = MetapopulationSEIR(state.cities, state.mobility, seed=7, stochastic=True,
+                                threshold=np.inf)
+    engine.state = state.state
+    engine.rng = np.random.default_rng(7)      # reset() a consommé des tirages
+    engine.step()
+
+    runs = simulate_batch(np.random.default_rng(7), state.mobility_t, state.population,
+                          state.params, 1, 1, (1,), initial=state.state)
+    np.testing.assert_array_equal(runs[0, 0], engine.I)
+
+
+def test_ensemble_mean_matches_deterministic_step(state):
+    runs = simulate_batch(np.random.default_rng(0), state.mobility_t, state.population,
+                          state.params, 4000, 1, (1,), initial=state.state)
+    deterministic = MetapopulationSEIR(state.cities, state.mobility, seed=0)
+    deterministic.state = state.state
+    deterministic.step()
+
+    assert state.state[COMPARTMENTS.index("I")].sum() > 0
+    np.testing.assert_allclose(runs[0].mean(axis=0).sum(), deterministic.I.sum(), rtol=1e-3)
+
+
+def test_stochastic_switch_keeps_mean_dynamics(state):
+    def mean_step(threshold, runs):
+        engine = MetapopulationSEIR(state.cities, state.mobility, seed=11, stochastic=True,
+                                    threshold=threshold)
+        total = np.zeros(len(COMPARTMENTS))
+        for _ in range(runs):
+            engine.state = state.state
+            engine.step()
+            np.testing.assert_allclose(engine.state.sum(axis=0), state.state.sum(axis=0))
+            total += engine.state.sum(axis=1)
+        return total / runs
+
+    euler = mean_step(0, 1)                   # aucune zone tirée
+    drawn = mean_step(np.inf, 2000)           # toutes les zones tirées
+    np.testing.assert_allclose(drawn, euler, rtol=1e-3)
@@ -0,0 +1,62 @@
+"""Rendu des slides décrites en JSON (slides/*.json)"""
+
+import pytest
+
+from generate_presentation import THEME, build_presentation, interval_claims
+from seir_engine import deck_figures
+from slide_spec import compile_slide, load_spec, render_text
+
+SPECS = ("methodologie.json", "risques.json")
+
+
+@pytest.fixture(scope="module")
+def figures():
+    """Chiffres du moteur déterministe seul (sans ensemble ni backtest)"""
+    return deck_figures()
+
+
+def _texts(spec_name, figures):
+    plan = compile_slide(load_spec(spec_name), THEME)
+    return [render_text(op["text"], figures) for op in plan["ops"] if op["text"]]
+
+
+@pytest.mark.parametrize("spec_name", SPECS)
+def test_specs_render_from_deck_figures(spec_name, figures):
+    texts = _texts(spec_name, figures)
+    assert texts
+    assert not any("{" in text for text in texts)
+
+
+def test_missing_ensemble_keeps_original_wording(figures):
+    method = "\n".join(_texts("methodologie.json", figures))
+    risks = "\n".join(_texts("risques.json", figures))
+    assert f"{figures['n_zones']} zones" in method
+    assert "IC " not in method
+    assert "Précision visée >75%" in method
+    assert "• Intervalle de confiance ±15%\n" in risks
+    assert "simulations" not in risks
+
+
+def test_ensemble_figures_fill_interval_lines(figures):
+    ensemble = {"ci_level": 90, "ci_7d_pct": 12, "ci_14d_pct": 21, "n_runs": 500}
+    figures = {**figures, **ensemble}
+    figures.update(interval_claims(figures))
+    method = "\n".join(_texts("methodologie.json", figures))
+    risks = "\n".join(_texts("risques.json", figures))
+    assert "• IC 90%: ±12% (J+7), ±21% (J+14)\n" in method
+    assert "Intervalle de confiance ±12% (500 simulations)" in risks
+
+
+@pytest.mark.parametrize("spec_name", SPECS)
+def test_specs_render_without_figures(spec_name):
+    texts = _texts(spec_name, None)
+    assert not any("{" in text for text in texts)
+
+
+def test_unknown_key_raises():
+    with pytest.raises(KeyError):
+        render_text("{n_zone} zones", {"n_zones": 30})
+
+
+def test_deck_builds_from_deck_figures(figures):
+    assert len(build_presentation(figures).slides) == 7